@@ -0,0 +1,72 @@
+"""Micro-benchmark of the per-line matching cost, before and after :class:`sentenceProcess.SearchQuery`.
+
+Run it from the repository root::
+
+    python benchmarks/searchQueryBenchmark.py
+"""
+import os
+import re
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from wordFinder.utils.sentenceProcess import SearchQuery
+
+
+LINE_COUNT = 1000000
+WORD = 'getConfigValueByName'
+
+TEMPLATES = (
+    "    def {name}(self, value: int) -> None:\n",
+    "        self.{name} = {name}.get('{name}', None)\n",
+    "    # Gets the {name} from the provided config.\n",
+    "        return [{name} for {name} in self.items if {name}]\n",
+    "\n",
+)
+
+
+def wordInLine(word: str, line: str, isLiteral: bool) -> bool:
+    """The matcher used before :class:`SearchQuery`, the pattern was rebuilt for every line."""
+    if isLiteral:
+        if word in line:
+            return True
+
+    else:
+        pattern = r"\b" + re.escape(word) + r"\b"
+
+        if re.search(pattern, line):
+            return True
+
+    return False
+
+
+def makeCorpus() -> list:
+    names = ('config', 'value', 'module', 'checkBox', 'searchPath', WORD)
+    randomizer = random.Random(0)
+
+    return [randomizer.choice(TEMPLATES).format(name=randomizer.choice(names)) for _ in range(LINE_COUNT)]
+
+
+def measure(label: str, matchLine, lines: list) -> None:
+    start = time.perf_counter()
+    count = sum(1 for line in lines if matchLine(line))
+    elapsed = time.perf_counter() - start
+
+    print("{:<40} {:>8.1f} ns/line  {:>7} matches".format(label, elapsed / len(lines) * 1e9, count))
+
+
+def main() -> None:
+    lines = makeCorpus()
+
+    measure("before: literal", lambda line: wordInLine(WORD, line, True), lines)
+    measure("after:  literal", SearchQuery(WORD).matchLine, lines)
+    measure("after:  literal, ignore case", SearchQuery(WORD, ignoreCase=True).matchLine, lines)
+    measure("before: whole word", lambda line: wordInLine(WORD, line, False), lines)
+    measure("after:  whole word", SearchQuery(WORD, SearchQuery.WHOLE_WORD).matchLine, lines)
+    measure("after:  regex", SearchQuery(r"get\w+ByName", SearchQuery.REGEX).matchLine, lines)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,277 @@
+"""The command line of Word Finder, it searches the local modules without the user interface::
+
+    python -m wordFinder search <word> [paths...] [options]
+
+Without paths, the packages of the search path stored in the config.json are searched. Qt is never imported, the
+results are written to stdout as soon as a module is scanned.
+
+The trigram index of the search path, if any, only narrows the modules to scan, it's not updated by the command line.
+The modules that changed since they were indexed are always scanned, so a stale index never hides a match.
+
+The exit status is 0 if a line matched, 1 if none matched and 2 on error, like grep.
+"""
+import os
+import re
+import sys
+import json
+import argparse
+from typing import List, Iterator, Optional
+
+from wordFinder import core
+from wordFinder import engine
+from wordFinder import constants
+from wordFinder.utils import moduleSearch
+from wordFinder.utils import moduleWalker
+from wordFinder.utils import sentenceProcess
+
+
+GREP_FORMAT = 'grep'
+JSON_FORMAT = 'json'
+COUNT_FORMAT = 'count'
+FILES_FORMAT = 'files'
+
+
+def buildParser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m wordFinder', description="Search a word in Python modules.")
+    commands = parser.add_subparsers(dest='command')
+    commands.required = True
+
+    search = commands.add_parser('search', help="Search a word, a sentence or a regular expression.")
+    search.add_argument('word', help="The word, sentence or regular expression to search.")
+    search.add_argument(
+        'paths',
+        nargs='*',
+        help="The modules or folders to search, the packages of the stored search path by default."
+    )
+    search.add_argument('--search-path', help="The folder that contains the packages, instead of the stored one.")
+    search.add_argument(
+        '-p', '--package',
+        action='append',
+        dest='packages',
+        help="Only search this package of the search path, can be repeated."
+    )
+
+    mode = search.add_mutually_exclusive_group()
+    mode.add_argument('-w', '--whole-word', action='store_true', help="Match the word between non-word characters.")
+    mode.add_argument('-E', '--regex', action='store_true', help="The word is a regular expression.")
+    search.add_argument('-i', '--ignore-case', action='store_true', help="Ignore the case.")
+    search.add_argument('-U', '--multiline', action='store_true', help="A regular expression can span several lines.")
+
+    search.add_argument('-C', '--context', type=int, default=0, help="The number of lines to show around a match.")
+    search.add_argument(
+        '-f', '--format',
+        choices=(GREP_FORMAT, JSON_FORMAT, COUNT_FORMAT),
+        default=GREP_FORMAT,
+        help="grep-style lines, one JSON object per line, or the number of matching lines per module."
+    )
+    search.add_argument(
+        '-l', '--files-with-matches',
+        action='store_true',
+        help="Only write the path of each matching module, its scan stops at the first match."
+    )
+    search.add_argument(
+        '-m', '--max-count',
+        type=int,
+        default=0,
+        help="Stop reading a module after this number of matching lines."
+    )
+    search.add_argument('--max-matches', type=int, default=0, help="Stop the search after this number of matching lines.")
+    search.add_argument('--timeout', type=float, default=0, help="Stop the search after this number of seconds.")
+    search.add_argument(
+        '--max-filesize',
+        type=float,
+        help="Skip the modules bigger than this number of megabytes, 0 for no limit. Defaults to the config.json value."
+    )
+    search.add_argument(
+        '-j', '--workers',
+        type=int,
+        help="The number of processes, 1 searches in this process. Defaults to the config.json value."
+    )
+    search.add_argument('--no-index', action='store_true', help="Scan every module even if the trigram index exists.")
+
+    return parser
+
+
+def modulePaths(paths: List[str]) -> Iterator[str]:
+    """Yields the provided modules and the modules within the provided folders."""
+    for path in paths:
+        if os.path.isdir(path):
+            for _, modulePath in sorted(moduleWalker.walkModules(path), key=lambda module: module[1]):
+                yield modulePath
+
+        else:
+            yield path
+
+
+def searchPathModulePaths(searchPath: str, packages: Optional[List[str]]) -> List[str]:
+    """Gets the modules of the provided packages of the search path, every package if None."""
+    if packages is None:
+        packages = moduleWalker.packages(searchPath)
+
+    return sorted(
+        modulePath
+        for package in packages
+        for _, modulePath in moduleWalker.walkModules(os.path.join(searchPath, package))
+    )
+
+
+def writeMatches(matches: Iterator[engine.Match], outputFormat: str, showContext: bool) -> int:
+    """Writes the matches to stdout, the output is flushed once each module is written.
+
+    Parameters:
+        matches: The matches, module after module.
+        outputFormat: :const:`GREP_FORMAT`, :const:`JSON_FORMAT`, :const:`COUNT_FORMAT` or :const:`FILES_FORMAT`.
+        showContext: If true, the grep-style blocks are separated by a "--" line.
+
+    Returns:
+        The number of matching lines.
+    """
+    matchCount = 0
+    moduleMatchCount = 0
+    previous = None
+
+    for match in matches:
+        if previous is not None and match.path != previous.path:
+            if outputFormat == COUNT_FORMAT:
+                sys.stdout.write("{}:{}\n".format(previous.path, moduleMatchCount))
+            sys.stdout.flush()
+            moduleMatchCount = 0
+
+        matchCount += 1
+        moduleMatchCount += 1
+
+        if outputFormat == FILES_FORMAT:
+            if moduleMatchCount == 1:
+                sys.stdout.write(match.path + '\n')
+
+        elif outputFormat == JSON_FORMAT:
+            record = {
+                'path': match.path,
+                'lineNumber': match.lineNumber,
+                'span': match.span,
+                'line': match.line,
+                'before': match.before,
+                'after': match.after,
+            }
+            sys.stdout.write(json.dumps(record) + '\n')
+
+        elif outputFormat == GREP_FORMAT:
+            isNewBlock = previous is not None \
+                and (match.path != previous.path or match.firstLineNumber != previous.lastLineNumber + 1)
+            if showContext and isNewBlock:
+                sys.stdout.write("--\n")
+
+            # Like grep, a matching line is "path:number:line", a context line "path-number-line".
+            for lineNumber, line in match.before:
+                sys.stdout.write("{}-{}-{}\n".format(match.path, lineNumber, line))
+            sys.stdout.write("{}:{}:{}\n".format(match.path, match.lineNumber, match.line))
+            for lineNumber, line in match.after:
+                sys.stdout.write("{}-{}-{}\n".format(match.path, lineNumber, line))
+
+        previous = match
+
+    if previous is not None and outputFormat == COUNT_FORMAT:
+        sys.stdout.write("{}:{}\n".format(previous.path, moduleMatchCount))
+
+    sys.stdout.flush()
+
+    return matchCount
+
+
+def search(arguments: argparse.Namespace) -> int:
+    """Runs the search command.
+
+    Returns:
+        The exit status.
+    """
+    if arguments.regex:
+        mode = sentenceProcess.SearchQuery.REGEX
+    elif arguments.whole_word:
+        mode = sentenceProcess.SearchQuery.WHOLE_WORD
+    else:
+        mode = sentenceProcess.SearchQuery.LITERAL
+
+    try:
+        query = sentenceProcess.SearchQuery(arguments.word, mode, arguments.ignore_case, arguments.multiline)
+    except re.error as error:
+        sys.stderr.write("Invalid regular expression: {}\n".format(error))
+        return 2
+
+    searchPath = None
+
+    if arguments.paths:
+        paths = list(modulePaths(arguments.paths))
+
+    else:
+        searchPath = arguments.search_path or core.getConfigValueByName(constants.SEARCH_PATH)
+
+        if not searchPath or not os.path.isdir(searchPath):
+            sys.stderr.write("No search path, set it in the user interface or pass --search-path.\n")
+            return 2
+
+        for package in arguments.packages or ():
+            if not os.path.isdir(os.path.join(searchPath, package)):
+                sys.stderr.write("No package {} in {}\n".format(package, searchPath))
+                return 2
+
+        paths = searchPathModulePaths(searchPath, arguments.packages)
+
+    workers = arguments.workers
+    if workers is None:
+        workers = core.getConfigValueByName(constants.SEARCH_WORKERS)
+
+    maxFileSize = arguments.max_filesize
+    if maxFileSize is None:
+        maxFileSize = core.getConfigValueByName(constants.MAX_FILE_SIZE)
+    if maxFileSize is None:
+        maxFileSize = constants.DEFAULT_CONFIG[constants.MAX_FILE_SIZE]
+
+    cancellationToken = engine.CancellationToken(arguments.timeout)
+    skipped = []
+
+    options = engine.SearchOptions(
+        numberOfExtraLine=0 if arguments.files_with_matches else max(arguments.context, 0),
+        workers=moduleSearch.workerCount(workers),
+        searchPath=None if arguments.no_index else searchPath,
+        isCancelled=cancellationToken,
+        maxMatches=max(arguments.max_matches, 0),
+        maxMatchesPerFile=max(arguments.max_count, 0),
+        filesWithMatches=arguments.files_with_matches,
+        maxFileSize=max(int(maxFileSize * 1024 * 1024), 0),
+        skipped=lambda modulePath, reason: skipped.append((modulePath, reason))
+    )
+    matches = engine.search(query, paths, options)
+    outputFormat = FILES_FORMAT if arguments.files_with_matches else arguments.format
+
+    try:
+        matchCount = writeMatches(matches, outputFormat, options.numberOfExtraLine > 0)
+
+    except BrokenPipeError:
+        # The reader has stopped, like "| head", the remaining shards are cancelled when the matches are closed.
+        matches.close()
+
+        # Python would fail again flushing stdout at exit.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+
+    if skipped:
+        sys.stderr.write(moduleSearch.skipSummary(skipped) + '\n')
+
+    if cancellationToken.isExpired:
+        sys.stderr.write("The search stopped after {:g} seconds, the results are partial.\n".format(arguments.timeout))
+
+    return 0 if matchCount else 1
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    arguments = buildParser().parse_args(argv)
+
+    if arguments.command == 'search':
+        return search(arguments)
+
+    return 2
+
+
+# The search worker processes re-import this module, they must not run the command.
+if __name__ == '__main__':
+    sys.exit(main())
@@ -5,6 +5,17 @@ MODULES_PATH = r'C:\Users\tomtom\Documents\travail_dev\local_lhorda_tools'
 
 CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'utils/config.json')
 
+INDEX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'utils/trigramIndex.pickle')
+
+BLOB_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'utils/blobCache')
+
+GIT_HUB_RESPONSES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'utils/gitHubResponses')
+
+GIT_HUB_MIRRORS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'utils/gitHubMirrors')
+
+# The root of the GitHub REST API, it can point to a local server that replays recorded responses.
+GIT_HUB_API_URL = os.environ.get('WORD_FINDER_GIT_HUB_API_URL', 'https://api.github.com')
+
 EXCLUDED_DIRECTORIES = ('__pycache__', '.idea', '.git', 'docs', '.gitignore')
 
 EXCLUDED_MODULES = ('__init__.py',)
@@ -17,6 +28,17 @@ COLUMN_COUNT = '__column_layout__'
 LOCAL_CHECKED_MODULES = '__local_checked_modules__'
 GIT_HUB_CHECKED_MODULES = '__gitHub_checked_modules__'
 GIT_HUB_HEY = '__git_hub_key__'
+SEARCH_WORKERS = '__search_workers__'
+BLOB_CACHE_SIZE = '__blob_cache_size__'
+GIT_HUB_DOWNLOADS = '__git_hub_downloads__'
+GIT_HUB_MIRROR = '__git_hub_mirror__'
+MAX_MATCHES = '__max_matches__'
+SEARCH_TIME_LIMIT = '__search_time_limit__'
+RESULT_CACHE_SIZE = '__result_cache_size__'
+MAX_FILE_SIZE = '__max_file_size__'
+MODULE_EXTENSIONS = '__module_extensions__'
+INCLUDE_GLOBS = '__include_globs__'
+EXCLUDE_GLOBS = '__exclude_globs__'
 
 DEFAULT_CONFIG = {
     SEARCH_PATH: "",
@@ -25,5 +47,24 @@ DEFAULT_CONFIG = {
     LOCAL_CHECKED_MODULES: [],
     GIT_HUB_CHECKED_MODULES: [],
     GIT_HUB_HEY: '',
+    SEARCH_WORKERS: 0,
+    # In megabytes.
+    BLOB_CACHE_SIZE: 256,
+    # The number of blobs downloaded at the same time.
+    GIT_HUB_DOWNLOADS: 8,
+    # If true, the GitHub repositories are cloned and searched on disk.
+    GIT_HUB_MIRROR: False,
+    # A search stops after this number of matches or seconds, 0 for no limit.
+    MAX_MATCHES: 50000,
+    SEARCH_TIME_LIMIT: 30,
+    # The matches of the last searches kept in memory, in megabytes.
+    RESULT_CACHE_SIZE: 64,
+    # The local modules bigger than this number of megabytes are skipped, 0 for no limit.
+    MAX_FILE_SIZE: 10,
+    # The extensions of the searched files.
+    MODULE_EXTENSIONS: ['.py'],
+    # In the syntax of a .gitignore, if there are include globs, only the files that match one of them are searched.
+    INCLUDE_GLOBS: [],
+    EXCLUDE_GLOBS: ['node_modules/', '.venv/', 'venv/', '.tox/'],
 }
 
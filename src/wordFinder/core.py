@@ -1,39 +1,152 @@
-import sys
+import os
 import json
-from typing import Optional, Mapping, Union
-import re
+import atexit
+import tempfile
+import threading
+from typing import Optional, Mapping, Union, Any, Dict
 
-import constants
-from utils import syntaxColors
+from wordFinder import constants
 
 
-def isPathAppended(moduleName) -> bool:
-    """Check if the provided module is present in the PYTHONPATH"""
-    for modulePath in sys.path:
-        if modulePath == moduleName:
-            return True
-    return False
+class ConfigStore:
+    """The config.json, read once then kept in memory for the whole process.
+
+    The writes are batched: each change restarts a short timer, the file is written once the changes stop, or when
+    :meth:`flush` is called. The file is written to a temporary file then renamed over the config.json, so it's never
+    left half written.
+    """
+
+    # The delay without change before the pending changes are written, in seconds.
+    WRITE_DELAY = 0.5
+
+    def __init__(self, path: str) -> None:
+        """Initialisation of ConfigStore.
+
+        Parameters:
+            path: The path of the config.json.
+        """
+        self.path = path
+
+        self._config = None
+        self._valueSets = {}
+        self._isDirty = False
+        self._timer = None
+        self._lock = threading.RLock()
+
+    def _loaded(self) -> Optional[Dict[str, Any]]:
+        """Gets the configuration, the config.json is only read the first time."""
+        if self._config is None:
+            try:
+                with open(self.path, 'r') as readFile:
+                    self._config = json.load(readFile)
+
+            except FileNotFoundError:
+                return None
+
+        return self._config
+
+    def exists(self) -> bool:
+        """Gets if a configuration has been stored."""
+        with self._lock:
+            return self._loaded() is not None
+
+    def asDict(self) -> Optional[Dict[str, Any]]:
+        """Gets a copy of the whole configuration, None if it has never been stored."""
+        with self._lock:
+            config = self._loaded()
+            return dict(config) if config is not None else None
+
+    def get(self, configName: str, default: Any = None) -> Any:
+        """Gets the value stored under the provided key, the config.json is never read again."""
+        with self._lock:
+            return (self._loaded() or {}).get(configName, default)
+
+    def contains(self, configName: str, value: Any) -> bool:
+        """Gets if the provided value is in the list stored under the provided key, the list is looked up as a set."""
+        with self._lock:
+            values = self._valueSets.get(configName)
+
+            if values is None:
+                values = self._valueSets[configName] = frozenset(self.get(configName) or ())
+
+            return value in values
+
+    def set(self, configName: str, value: Any) -> None:
+        """Changes a value in memory, the config.json is written once the changes stop."""
+        with self._lock:
+            config = self._loaded()
+            if config is None:
+                config = self._config = dict(constants.DEFAULT_CONFIG)
+
+            config[configName] = value
+            self._valueSets.pop(configName, None)
+            self._isDirty = True
+
+            if self._timer is not None:
+                self._timer.cancel()
+
+            self._timer = threading.Timer(self.WRITE_DELAY, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def reset(self, config: Mapping[str, Any]) -> None:
+        """Replaces the whole configuration and writes it immediately."""
+        with self._lock:
+            self._config = dict(config)
+            self._valueSets.clear()
+            self._isDirty = True
+            self.flush()
+
+    def flush(self) -> None:
+        """Writes the pending changes to the config.json."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+            if not self._isDirty:
+                return
+
+            directory = os.path.dirname(self.path)
+            fileDescriptor, temporaryPath = tempfile.mkstemp(dir=directory, prefix='.config', suffix='.json')
+
+            try:
+                with os.fdopen(fileDescriptor, 'w') as writeFile:
+                    json.dump(self._config, writeFile, indent=4)
+
+                os.replace(temporaryPath, self.path)
+
+            except BaseException:
+                os.remove(temporaryPath)
+                raise
+
+            self._isDirty = False
+
+
+CONFIG = ConfigStore(constants.CONFIG_PATH)
+
+# Write what's left when the process exits without closing the window.
+atexit.register(CONFIG.flush)
 
 
 def makeDefaultConfig() -> None:
     """Creates a default config.json."""
-    with open(constants.CONFIG_PATH, 'w') as writeFile:
-        json.dump(constants.DEFAULT_CONFIG, writeFile, indent=4)
+    CONFIG.reset(constants.DEFAULT_CONFIG)
 
 
 def storeConfig(configName: str, value: Optional[str]) -> None:
-    """Dumps the provided configName and value within the config.json.
+    """Sets the provided configName and value in the configuration, the config.json is written shortly after.
 
     Parameters:
         configName: The key to set in the config.json.
         value: The value to set in the config.json.
     """
-    with open(constants.CONFIG_PATH, 'r') as readFile:
-        config = json.load(readFile)
-        config[configName] = value
+    CONFIG.set(configName, value)
 
-    with open(constants.CONFIG_PATH, 'w') as writeFile:
-        json.dump(config, writeFile, indent=4)
+
+def flushConfig() -> None:
+    """Writes the pending configuration changes to the config.json."""
+    CONFIG.flush()
 
 
 def getConfig() -> Union[Mapping[str, Union[str, int, bool]], None]:
@@ -42,12 +155,7 @@ def getConfig() -> Union[Mapping[str, Union[str, int, bool]], None]:
     Returns:
         The config.json if is found, else None.
     """
-    try:
-        with open(constants.CONFIG_PATH, 'r') as readFile:
-            return json.load(readFile)
-
-    except FileNotFoundError:
-        return None
+    return CONFIG.asDict()
 
 
 def getConfigValueByName(configName: str) -> Union[str, None]:
@@ -59,9 +167,14 @@ def getConfigValueByName(configName: str) -> Union[str, None]:
     Returns:
         The value of the provided key if it's present, else, None.
     """
-    with open(constants.CONFIG_PATH, 'r') as readFile:
-        config = json.load(readFile)
-        return config.get(configName, None)
+    return CONFIG.get(configName)
 
 
+def isInConfigList(configName: str, value: str) -> bool:
+    """Gets if the provided value is in the list stored under the provided key.
 
+    Parameters:
+        configName: The configuration key of a list, like :const:`constants.LOCAL_CHECKED_MODULES`.
+        value: The value to search.
+    """
+    return CONFIG.contains(configName, value)
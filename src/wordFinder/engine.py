@@ -0,0 +1,562 @@
+"""The search engine of Word Finder, free of Qt.
+
+:func:`search` yields a :class:`Match` for each matching line as soon as its module is scanned, the user interface,
+the command line and the benchmarks all consume it::
+
+    from wordFinder import engine
+    from wordFinder.utils.sentenceProcess import SearchQuery
+
+    for match in engine.search(SearchQuery('storeConfig'), ['core.py'], engine.SearchOptions(numberOfExtraLine=2)):
+        print(match.path, match.lineNumber, match.line)
+
+The consumer can stop early, closing the generator cancels the modules that are not scanned yet. A search can also
+be bounded by a number of matches or, through a :class:`CancellationToken`, by a time budget. The matches of a
+search run again can come from a :class:`resultCache.ResultCache`, see :attr:`SearchOptions.resultCache`.
+"""
+import time
+import itertools
+import threading
+from functools import partial
+from typing import List, Tuple, Optional, Iterator, Iterable, Union, Callable, NamedTuple
+
+from wordFinder.utils import moduleSearch
+from wordFinder.utils import resultCache
+from wordFinder.utils import sentenceProcess
+from wordFinder.utils import trigramIndex
+
+
+ContextLines = Tuple[Tuple[int, str], ...]
+
+
+class Match:
+    """A matching line and, if asked, the context lines around it.
+
+    The context lines shared by two close matches are only attached once: the lines that follow a match up to the
+    number of context lines are its :attr:`after` lines, the next ones are the :attr:`before` lines of the next match.
+    Chaining the before lines, the line and the after lines of the matches of a module rebuilds the displayed blocks.
+    """
+
+    __slots__ = ('path', 'lineNumber', 'span', 'line', 'before', 'after')
+
+    def __init__(
+            self,
+            path: str,
+            lineNumber: int,
+            span: Tuple[int, int],
+            line: str,
+            before: ContextLines = (),
+            after: ContextLines = ()
+    ) -> None:
+        """Initialisation of Match.
+
+        Parameters:
+            path: The path of the module.
+            lineNumber: The number of the matching line, starting at 1.
+            span: The start and end columns of the first match in the line.
+            line: The matching line, without its line ending.
+            before: The (lineNumber, line) of the context lines before the match.
+            after: The (lineNumber, line) of the context lines after the match.
+        """
+        self.path = path
+        self.lineNumber = lineNumber
+        self.span = span
+        self.line = line
+        self.before = before
+        self.after = after
+
+    def __repr__(self) -> str:
+        return "Match({!r}, {}, {}, {!r})".format(self.path, self.lineNumber, self.span, self.line)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Match):
+            return NotImplemented
+
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    @property
+    def firstLineNumber(self) -> int:
+        """The number of the first displayed line, a context line or the matching line."""
+        return self.before[0][0] if self.before else self.lineNumber
+
+    @property
+    def lastLineNumber(self) -> int:
+        """The number of the last displayed line, a context line or the matching line."""
+        return self.after[-1][0] if self.after else self.lineNumber
+
+
+class CancellationToken:
+    """Stops a search from another thread, or once its time budget is spent.
+
+    The token is polled between the modules and within the lines of a module, a worker process can't poll it so it
+    only stops at the :attr:`deadline`.
+    """
+
+    def __init__(self, timeLimit: float = 0.0) -> None:
+        """Initialisation of CancellationToken.
+
+        Parameters:
+            timeLimit: The time budget of the search in seconds, from now, no budget if 0.
+        """
+        self.deadline = time.time() + timeLimit if timeLimit > 0 else None
+        self._cancelled = threading.Event()
+
+    def __call__(self) -> bool:
+        return self.isCancelled
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+
+    @property
+    def isExpired(self) -> bool:
+        """True once the time budget is spent."""
+        return self.deadline is not None and time.time() >= self.deadline
+
+    @property
+    def isCancelled(self) -> bool:
+        return self._cancelled.is_set() or self.isExpired
+
+
+class TextSource(NamedTuple):
+    """A module already in memory, like the content of a GitHub repository."""
+    path: str
+    text: str
+
+
+class SearchOptions(NamedTuple):
+    """How to run a search.
+
+    Attributes:
+        numberOfExtraLine: The number of context lines to attach before and after each match.
+        workers: The number of processes, the modules are scanned in the calling thread if it's 1 or if there is not
+            enough modules to make the worker processes worth it.
+        searchPath: The search path of the modules, if its trigram index has been built, only the modules that may
+            contain the query are scanned.
+        progress: If provided, called with the number of scanned sources and the total, the total is 0 when the
+            sources are streamed.
+        isCancelled: If provided, polled between two sources and within the lines of a source, the search stops once
+            it returns True. The worker processes only stop at the deadline of a :class:`CancellationToken`.
+        maxMatches: If not 0, the search stops once this number of matches is yielded.
+        maxMatchesPerFile: If not 0, the scan of a source stops once this number of matches is found in it.
+        filesWithMatches: If true, the scan of a source stops at its first match, like ``grep -l``.
+        resultCache: If provided, the matches of a list of module paths are looked up in this cache, or stored in it
+            once the search is complete.
+        maxFileSize: If not 0, the modules bigger than this number of bytes are skipped.
+        skipped: If provided, called with the path and the reason of each module that is not searched, a binary, too
+            large or unreadable module, see :class:`moduleSearch.SkippedModule`.
+    """
+    numberOfExtraLine: int = 0
+    workers: int = 1
+    searchPath: Optional[str] = None
+    progress: Optional[Callable[[int, int], None]] = None
+    isCancelled: Optional[Callable[[], bool]] = None
+    maxMatches: int = 0
+    maxMatchesPerFile: int = 0
+    filesWithMatches: bool = False
+    resultCache: Optional['resultCache.ResultCache'] = None
+    maxFileSize: int = 0
+    skipped: Optional[Callable[[str, str], None]] = None
+
+    @property
+    def matchesPerFile(self) -> int:
+        """The number of matches after which the scan of a source stops, 0 if it's scanned to the end."""
+        return 1 if self.filesWithMatches else self.maxMatchesPerFile
+
+
+Source = Union[str, TextSource]
+
+
+def matchSpan(query: sentenceProcess.SearchQuery, line: str) -> Tuple[int, int]:
+    """Gets the columns of the first match of the query in the provided line.
+
+    A line covered by a multiline match may not match on its own, the whole line is its span then.
+    """
+    found = query.pattern.search(line)
+
+    return found.span() if found is not None else (0, len(line))
+
+
+def blockMatches(
+        path: str,
+        blocks: List[moduleSearch.Block],
+        query: sentenceProcess.SearchQuery,
+        numberOfExtraLine: int
+) -> Iterator[Match]:
+    """Splits the blocks of a module into its matches, see :class:`Match` for the way the context is shared.
+
+    Parameters:
+        path: The path of the module.
+        blocks: The blocks of the module, see :func:`sentenceProcess.contextBlocks`.
+        query: The query that found the blocks.
+        numberOfExtraLine: The number of context lines of the blocks.
+    """
+    for block in blocks:
+        block = [(lineNumber, line.rstrip('\r\n'), isMatch) for lineNumber, line, isMatch in block]
+        matchIndexes = [index for index, (_, _, isMatch) in enumerate(block) if isMatch]
+
+        start = 0
+        for position, index in enumerate(matchIndexes):
+            if position + 1 < len(matchIndexes):
+                # The previous match takes its after lines first, the rest goes to the next one.
+                end = min(index + 1 + numberOfExtraLine, matchIndexes[position + 1])
+            else:
+                end = len(block)
+
+            lineNumber, line, _ = block[index]
+
+            yield Match(
+                path,
+                lineNumber,
+                matchSpan(query, line),
+                line,
+                tuple((number, text) for number, text, _ in block[start:index]),
+                tuple((number, text) for number, text, _ in block[index + 1:end])
+            )
+
+            start = end
+
+
+def searchSource(
+        source: Source,
+        query: sentenceProcess.SearchQuery,
+        numberOfExtraLine: int = 0,
+        maxMatches: int = 0,
+        isCancelled: Optional[Callable[[], bool]] = None,
+        maxFileSize: int = 0
+) -> List[Match]:
+    """Gets the matches of a single module, read from the disk or in memory.
+
+    Parameters:
+        source: The path of the module or its text.
+        query: The compiled query to search.
+        numberOfExtraLine: The number of context lines to attach before and after each match.
+        maxMatches: If not 0, the scan stops once this number of matches is found.
+        isCancelled: If provided, polled within the lines of the module.
+        maxFileSize: If not 0, a module on disk bigger than this number of bytes is skipped.
+
+    Raises:
+        moduleSearch.SkippedModule: If the module on disk is binary, too large or can't be read.
+    """
+    if isinstance(source, TextSource):
+        lines = source.text.splitlines(keepends=True)
+        lineNumbers = query.matchingLineNumbers(lines, maxMatches, isCancelled)
+        blocks = sentenceProcess.contextBlocks(lines, lineNumbers, numberOfExtraLine)
+
+        return list(blockMatches(source.path, blocks, query, numberOfExtraLine))
+
+    blocks = moduleSearch.searchModule(source, query, numberOfExtraLine, maxMatches, isCancelled, maxFileSize)
+
+    return list(blockMatches(source, blocks, query, numberOfExtraLine))
+
+
+def withContext(
+        matches: List[Match],
+        query: sentenceProcess.SearchQuery,
+        numberOfExtraLine: int
+) -> List[Match]:
+    """Splits the matches of a module again with fewer context lines, the module is not read.
+
+    Parameters:
+        matches: The matches of a single module, found with at least the provided number of context lines.
+        query: The query that found the matches.
+        numberOfExtraLine: The number of context lines to attach before and after each match.
+    """
+    if not matches:
+        return matches
+
+    lines = {}
+    for match in matches:
+        lines.update(match.before)
+        lines.update(match.after)
+        lines[match.lineNumber] = match.line
+
+    matchLineNumbers = [match.lineNumber for match in matches]
+    matchSet = set(matchLineNumbers)
+
+    # The stored context always reaches the end of the module or goes beyond the new one, the last stored line is
+    # as good as the line count of the module.
+    blocks = [
+        [(lineNumber, lines[lineNumber], lineNumber in matchSet) for lineNumber in range(start, end + 1)]
+        for start, end in sentenceProcess.contextWindows(matchLineNumbers, max(lines), numberOfExtraLine)
+    ]
+
+    return list(blockMatches(matches[0].path, blocks, query, numberOfExtraLine))
+
+
+def search(
+        query: sentenceProcess.SearchQuery,
+        sources: Iterable[Source],
+        options: Optional[SearchOptions] = None
+) -> Iterator[Match]:
+    """Searches the query in the provided sources and yields the matches in the order of the sources.
+
+    A list of module paths may be filtered by the trigram index and sharded across worker processes, any other
+    iterable is consumed lazily, one source after the other. The search ends early once
+    :attr:`SearchOptions.maxMatches` is reached or :attr:`SearchOptions.isCancelled` returns True.
+
+    Parameters:
+        query: The compiled query to search.
+        sources: The paths of the modules, or :class:`TextSource`.
+        options: How to run the search, the defaults of :class:`SearchOptions` if None.
+
+    Yields:
+        The matches, module after module.
+    """
+    options = options or SearchOptions()
+
+    if options.resultCache is not None and _isModulePaths(sources):
+        # Capped by itself, so the capped matches are cached too.
+        yield from _cachedSearch(query, list(sources), options)
+        return
+
+    matches = _search(query, sources, options)
+
+    if options.maxMatches:
+        yield from _limited(matches, options.maxMatches)
+        return
+
+    yield from matches
+
+
+def _isModulePaths(sources: Iterable[Source]) -> bool:
+    """Gets if the sources are a list of module paths, rather than in memory or streamed sources."""
+    return isinstance(sources, (list, tuple)) and all(isinstance(source, str) for source in sources)
+
+
+def _limited(matches: Iterator[Match], maxMatches: int) -> Iterator[Match]:
+    """Yields the first matches, the remaining sources are cancelled once the last one is yielded."""
+    try:
+        for matchCount, match in enumerate(matches, start=1):
+            yield match
+
+            if matchCount == maxMatches:
+                return
+
+    finally:
+        matches.close()
+
+
+def _search(
+        query: sentenceProcess.SearchQuery,
+        sources: Iterable[Source],
+        options: SearchOptions
+) -> Iterator[Match]:
+    """See :func:`search`, closing the generator closes :func:`_searchSources` so the remaining shards are cancelled."""
+    moduleMatches = _searchSources(query, sources, options)
+
+    try:
+        for matches in moduleMatches:
+            yield from matches
+
+    finally:
+        moduleMatches.close()
+
+
+def _cachedSearch(
+        query: sentenceProcess.SearchQuery,
+        modulePaths: List[str],
+        options: SearchOptions
+) -> Iterator[Match]:
+    """See :func:`search`, the matches come from the :attr:`SearchOptions.resultCache` if the modules have not changed.
+
+    The matches are stored with their context lines, so the search can be run again with a smaller context from the
+    cache. If the query is the same with a larger context, or narrows a cached search, only the modules that may match
+    it are scanned, see :meth:`resultCache.ResultCache.narrowedPaths`. A search stopped at its maximum number of matches
+    is stored before its last matches are yielded, the consumer may close the generator once it has them. A cancelled
+    search is not stored.
+    """
+    cache = options.resultCache
+    key = cache.key(query, modulePaths, options.maxMatches, options.matchesPerFile, options.maxFileSize)
+    entry = cache.get(key, options.numberOfExtraLine)
+
+    if entry is not None:
+        if options.skipped is not None:
+            for modulePath, reason in entry.skipped:
+                options.skipped(modulePath, reason)
+
+        if entry.numberOfExtraLine == options.numberOfExtraLine:
+            yield from entry.matches
+        else:
+            for _, moduleMatches in itertools.groupby(entry.matches, key=lambda match: match.path):
+                yield from withContext(list(moduleMatches), query, options.numberOfExtraLine)
+
+        if options.progress is not None:
+            options.progress(len(modulePaths), len(modulePaths))
+        return
+
+    moduleFingerprints = resultCache.fingerprints(modulePaths)
+    scannedPaths = cache.narrowedPaths(query, modulePaths, options.maxFileSize, moduleFingerprints)
+    if scannedPaths is None:
+        scannedPaths = modulePaths
+
+    skipped = []
+
+    def onSkipped(modulePath: str, reason: str) -> None:
+        skipped.append((modulePath, reason))
+
+        if options.skipped is not None:
+            options.skipped(modulePath, reason)
+
+    def isCancelled() -> bool:
+        return options.isCancelled is not None and options.isCancelled()
+
+    matches = []
+    moduleScans = _searchSources(query, scannedPaths, options._replace(skipped=onSkipped))
+
+    try:
+        for moduleMatches in moduleScans:
+            if options.maxMatches:
+                moduleMatches = moduleMatches[:options.maxMatches - len(matches)]
+            matches.extend(moduleMatches)
+
+            if options.maxMatches and len(matches) == options.maxMatches:
+                if not isCancelled():
+                    cache.put(key, query, moduleFingerprints, options.numberOfExtraLine, matches, skipped, False)
+
+                # The remaining sources are cancelled by the finally clause.
+                yield from moduleMatches
+                return
+
+            yield from moduleMatches
+
+    finally:
+        moduleScans.close()
+
+    if not isCancelled():
+        cache.put(key, query, moduleFingerprints, options.numberOfExtraLine, matches, skipped)
+
+
+def _searchSources(
+        query: sentenceProcess.SearchQuery,
+        sources: Iterable[Source],
+        options: SearchOptions
+) -> Iterator[List[Match]]:
+    """See :func:`search`, yields the matches of each source that contains a match.
+
+    If the search path is indexed, only the candidate modules are scanned, then the other indexed modules are stat'ed
+    and the ones edited since they were indexed are scanned last. The index doesn't have to be up to date, and a search
+    that stops among the candidates stats no other module.
+    """
+    if not _isModulePaths(sources):
+        yield from _scanSources(query, sources, options)
+        return
+
+    modulePaths = list(sources)
+    index = trigramIndex.getIndex(options.searchPath) if options.searchPath else None
+
+    if index is None:
+        yield from _searchModulePaths(query, modulePaths, options)
+        return
+
+    candidates = index.candidatePaths(query, modulePaths)
+    yield from _searchModulePaths(query, candidates, options)
+
+    if len(candidates) == len(modulePaths) or options.isCancelled is not None and options.isCancelled():
+        return
+
+    candidateSet = set(candidates)
+    changedPaths = index.changedPaths([modulePath for modulePath in modulePaths if modulePath not in candidateSet])
+
+    if not changedPaths:
+        return
+
+    if options.progress is not None:
+        # Counted after the candidates.
+        options = options._replace(progress=partial(_offsetProgress, options.progress, len(candidates)))
+
+    yield from _searchModulePaths(query, changedPaths, options)
+
+
+def _offsetProgress(progress: Callable[[int, int], None], offset: int, scannedCount: int, total: int) -> None:
+    progress(offset + scannedCount, offset + total)
+
+
+def _searchModulePaths(
+        query: sentenceProcess.SearchQuery,
+        modulePaths: List[str],
+        options: SearchOptions
+) -> Iterator[List[Match]]:
+    """Scans the provided modules in this process or, if there are enough of them, across the worker processes."""
+    if moduleSearch.isParallelSearch(len(modulePaths), options.workers):
+        yield from _searchParallel(query, modulePaths, options)
+    else:
+        yield from _scanSources(query, modulePaths, options)
+
+
+def _scanSources(
+        query: sentenceProcess.SearchQuery,
+        sources: Iterable[Source],
+        options: SearchOptions
+) -> Iterator[List[Match]]:
+    """Scans the sources one after the other in this process, yields the matches of each source that contains a
+    match.
+    """
+    total = len(sources) if isinstance(sources, (list, tuple)) else 0
+    scannedCount = 0
+
+    for source in sources:
+        if options.isCancelled is not None and options.isCancelled():
+            return
+
+        try:
+            matches = searchSource(
+                source,
+                query,
+                options.numberOfExtraLine,
+                options.matchesPerFile,
+                options.isCancelled,
+                options.maxFileSize
+            )
+
+        except moduleSearch.SkippedModule as error:
+            matches = []
+
+            if options.skipped is not None:
+                options.skipped(error.modulePath, error.reason)
+
+        if matches:
+            yield matches
+
+        scannedCount += 1
+        if options.progress is not None:
+            options.progress(scannedCount, total)
+
+
+def _searchParallel(
+        query: sentenceProcess.SearchQuery,
+        modulePaths: List[str],
+        options: SearchOptions
+) -> Iterator[List[Match]]:
+    """Shards the modules across the worker processes, see :func:`moduleSearch.parallelSearch`, yields the matches of
+    each module that contains a match.
+    """
+    scannedCount = 0
+    shardResults = moduleSearch.parallelSearch(
+        modulePaths,
+        query,
+        options.numberOfExtraLine,
+        options.workers,
+        options.matchesPerFile,
+        getattr(options.isCancelled, 'deadline', None),
+        options.maxFileSize
+    )
+
+    try:
+        for shard, results, skipped in shardResults:
+            if options.skipped is not None:
+                for modulePath, reason in skipped:
+                    options.skipped(modulePath, reason)
+
+            # The shard is already scanned, its matches are kept even if the search is cancelled meanwhile.
+            for modulePath, blocks in results:
+                yield list(blockMatches(modulePath, blocks, query, options.numberOfExtraLine))
+
+            scannedCount += len(shard)
+            if options.progress is not None:
+                options.progress(scannedCount, len(modulePaths))
+
+            if options.isCancelled is not None and options.isCancelled():
+                return
+
+    finally:
+        # Cancels the shards that are not started yet.
+        shardResults.close()
@@ -1,63 +1,564 @@
+import time
+import atexit
+import base64
+import logging
+import itertools
+import posixpath
+import threading
+import contextlib
+import collections
+import urllib.parse
+from concurrent import futures
+from functools import partial
+from typing import Iterator, List, Tuple, Optional, Callable, Any
+
+import requests
+from requests.adapters import HTTPAdapter
 from github import Github
-from github import Auth
+from github.Repository import Repository
+from github.AuthenticatedUser import AuthenticatedUser
+from github.GithubException import GithubException, RateLimitExceededException
 
 from wordFinder import constants
 from wordFinder import core
+from wordFinder.gitHub import blobCache
+from wordFinder.gitHub import responseStore
+from wordFinder.utils import ignoreRules
+
+
+LOGGER = logging.getLogger(__name__)
+LOGGER.setLevel(20)
+
+# The requests kept for the rest of the user interface when the downloads hold back.
+RATE_LIMIT_RESERVE = 20
+
+# The number of times a blob download is retried once GitHub refuses it for going too fast.
+DOWNLOAD_ATTEMPTS = 5
+
+# The seconds to wait for GitHub to connect or to send the next bytes of a response.
+REQUEST_TIMEOUT = 30
+
+# The errors of a request that GitHub refuses or that can't reach it, a search goes on with the next repository.
+REQUEST_ERRORS = (GithubException, requests.RequestException)
+
+
+class ApiCallCounter:
+    """Counts the requests sent to the GitHub API, to check how many calls a user action costs.
+
+    The HTTP session of a :class:`GitHubSession` counts each response it receives, a 304 Not Modified as well.
+    """
 
+    def __init__(self) -> None:
+        self.count = 0
+        self._lock = threading.Lock()
 
-class GitHubGateway:
-    """This is a context manager that allows to run the gitHub API functions."""
-    def __init__(self, gitHubToken: str) -> None:
-        """Initialisation of GitHubGateway.
+    def add(self) -> None:
+        with self._lock:
+            self.count += 1
+
+    @contextlib.contextmanager
+    def measure(self, action: str) -> Iterator[None]:
+        """Logs the number of calls sent while the context runs, the calls of other threads are counted as well.
+
+        Parameters:
+            action: The name of the user action, for the log.
+        """
+        first = self.count
+
+        try:
+            yield
+        finally:
+            LOGGER.info("{}: {} GitHub API calls".format(action, self.count - first))
+
+
+API_CALLS = ApiCallCounter()
+
+
+class GitHubSession:
+    """The authenticated GitHub client of the process.
+
+    Every request goes through an HTTP session that keeps its connections open from one request to the other, counts
+    the requests in :data:`API_CALLS` and keeps the rate limit of the last response. PyGithub only builds its objects
+    from the decoded responses. The authenticated user and the repositories already fetched are kept as well. The
+    repositories and the trees are requested with the ETag of the last response, see :mod:`responseStore`.
+    """
+
+    # The number of repositories per page of the listing, the most GitHub allows.
+    PAGE_SIZE = 100
+
+    def __init__(self, gitHubToken: str, baseUrl: str = constants.GIT_HUB_API_URL, poolSize: int = 1) -> None:
+        """Initialisation of GitHubSession.
 
         Parameters:
             gitHubToken: The GitHub personal access token to use to authenticate the user.
+            baseUrl: The root of the REST API, a local server that replays recorded responses can stand in for it.
+            poolSize: The number of connections kept open, as many threads can send requests at the same time.
+                The requests are not spaced out, a :class:`RateLimiter` paces the downloads instead.
         """
         self.gitHubToken = gitHubToken
-        self.gitHub = None
+        self.baseUrl = baseUrl.rstrip('/')
+
+        self.http = requests.Session()
+        self.http.headers.update({
+            'Authorization': 'token {}'.format(gitHubToken),
+            'Accept': 'application/vnd.github+json',
+            'User-Agent': 'WordFinder'
+        })
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(poolSize, 1))
+        self.http.mount('https://', adapter)
+        self.http.mount('http://', adapter)
+        self.http.hooks['response'].append(self._onResponse)
+
+        # Only builds the PyGithub objects, see :meth:`repository`.
+        self.gitHub = Github(base_url=self.baseUrl)
+
+        self.responses = responseStore.tokenStore(gitHubToken)
+
+        # The (remaining requests, reset time) of the last response, None until a response carries them.
+        self.rateLimit = None
+
+        self._user = None
+        self._repositories = {}
+        self._lock = threading.Lock()
+
+    def _onResponse(self, response: requests.Response, *args, **kwargs) -> None:
+        """Called by the HTTP session for each response, the redirections included."""
+        API_CALLS.add()
+
+        remaining = response.headers.get('x-ratelimit-remaining')
+        resetTime = response.headers.get('x-ratelimit-reset')
+
+        if remaining is not None and resetTime is not None:
+            with self._lock:
+                self.rateLimit = (int(remaining), float(resetTime))
+
+    def requestJson(self, url: str, parameters: Optional[dict] = None, headers: Optional[dict] = None) -> tuple:
+        """Sends a GET request, the response is not stored.
+
+        Parameters:
+            url: The url of the request, absolute or relative to the root of the API.
+            parameters: The query parameters of the request.
+            headers: The headers added to the ones of the session.
+
+        Returns:
+            The status, the headers and the decoded JSON of the response, None if it has no body.
+
+        Raises:
+            RateLimitExceededException: If GitHub refuses the request for going too fast.
+            GithubException: If GitHub answers another error.
+        """
+        if not url.startswith(('http://', 'https://')):
+            url = self.baseUrl + url
+
+        response = self.http.get(url, params=parameters, headers=headers, timeout=REQUEST_TIMEOUT)
+
+        try:
+            data = response.json() if response.content else None
+        except ValueError:
+            data = None
+
+        if response.status_code >= 400:
+            raise gitHubException(response.status_code, dict(response.headers), data)
+
+        return response.status_code, response.headers, data
+
+    def getJson(self, url: str, parameters: Optional[dict] = None, isImmutable: bool = False) -> Any:
+        """Sends a conditional GET request, the stored response is used if GitHub answers 304 Not Modified.
+
+        Parameters:
+            url: The url of the request, absolute or relative to the root of the API.
+            parameters: The query parameters of the request.
+            isImmutable: If true, the resource never changes, like a tree fetched by its sha, a stored response is
+                used without any request.
+
+        Returns:
+            The decoded JSON of the response.
+
+        Raises:
+            GithubException: If GitHub answers an error, see :meth:`requestJson`.
+        """
+        key = url + ('?' + urllib.parse.urlencode(sorted(parameters.items())) if parameters else '')
+        entry = self.responses.get(key)
+
+        if entry is not None and isImmutable:
+            return entry['data']
+
+        headers = {}
+        if entry is not None and entry['etag']:
+            headers['If-None-Match'] = entry['etag']
+        if entry is not None and entry['lastModified']:
+            headers['If-Modified-Since'] = entry['lastModified']
+
+        status, responseHeaders, data = self.requestJson(url, parameters, headers)
+
+        if status == 304 and entry is not None:
+            self.responses.countNotModified()
+            return entry['data']
+
+        self.responses.put(key, responseHeaders.get('etag'), responseHeaders.get('last-modified'), data)
+
+        return data
+
+    @property
+    def user(self) -> AuthenticatedUser:
+        """The authenticated user, fetched once."""
+        if self._user is None:
+            self._user = self.gitHub.create_from_raw_data(AuthenticatedUser, self.getJson('/user'))
+
+        return self._user
+
+    def repositories(self) -> list:
+        """Lists the repositories of the authenticated user, they are kept for :meth:`repository`."""
+        repositories = []
+
+        for page in itertools.count(1):
+            data = self.getJson('/user/repos', {'per_page': self.PAGE_SIZE, 'page': page})
+            repositories.extend(self.gitHub.create_from_raw_data(Repository, rawData) for rawData in data)
+
+            if len(data) < self.PAGE_SIZE:
+                break
+
+        with self._lock:
+            self._repositories = {repo.full_name: repo for repo in repositories}
+
+        return repositories
+
+    def repository(self, repoName: str):
+        """Gets a repository by its full name, a single request if it's not listed by :meth:`repositories` yet.
+
+        Parameters:
+            repoName: The full name of the repository, "owner/name".
+        """
+        with self._lock:
+            repo = self._repositories.get(repoName)
+
+        if repo is None:
+            repo = self.gitHub.create_from_raw_data(Repository, self.getJson('/repos/{}'.format(repoName)))
+
+            with self._lock:
+                self._repositories[repoName] = repo
+
+        return repo
+
+    def close(self) -> None:
+        self.http.close()
+
+
+def gitHubException(status: int, headers: dict, data: Any) -> GithubException:
+    """Gets the PyGithub exception of an error response, the way PyGithub tells a rate limit from the other errors.
+
+    Parameters:
+        status: The status of the response.
+        headers: The headers of the response.
+        data: The decoded JSON of the response, None if it's not JSON.
+    """
+    message = data.get('message', '') if isinstance(data, dict) else ''
+    headers = {name.lower(): value for name, value in headers.items()}
+
+    if status == 429 or status == 403 and (
+            headers.get('x-ratelimit-remaining') == '0' or 'retry-after' in headers or 'rate limit' in message.lower()
+    ):
+        return RateLimitExceededException(status, data, headers)
+
+    return GithubException(status, data, headers)
+
+
+_session = None
+_sessionLock = threading.Lock()
+
+
+def getSession() -> GitHubSession:
+    """Gets the session of the token stored in the config.json, a new one is opened once the token changes."""
+    global _session
+
+    gitHubToken = core.getConfigValueByName(constants.GIT_HUB_HEY)
 
-    def __enter__(self):
-        """Authenticate the user and get his userName"""
-        auth = Auth.Token(self.gitHubToken)
-        self.gitHub = Github(auth=auth)
-        self.gitUser = self.gitHub.get_user()
+    with _sessionLock:
+        if _session is None or _session.gitHubToken != gitHubToken:
+            if _session is not None:
+                _session.close()
 
-        return self
+            _session = GitHubSession(gitHubToken, poolSize=downloadCount())
 
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        """Close the GitHub session"""
-        self.gitHub.close()
+        return _session
+
+
+def closeSession() -> None:
+    """Closes the connections of the session, if any."""
+    global _session
+
+    with _sessionLock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+atexit.register(closeSession)
+
+
+def downloadCount() -> int:
+    """Gets the number of blobs downloaded at the same time, from the config.json."""
+    workers = core.getConfigValueByName(constants.GIT_HUB_DOWNLOADS)
+
+    if workers is None:
+        workers = constants.DEFAULT_CONFIG[constants.GIT_HUB_DOWNLOADS]
+
+    return max(int(workers), 1)
 
 
 def gitHubRepositories():
-    with GitHubGateway(core.getConfigValueByName(constants.GIT_HUB_HEY)) as gitHubGateway:
-        return gitHubGateway.gitUser.get_repos()
+    return getSession().repositories()
 
 
 def getRepoByName(repoName):
-    with GitHubGateway(core.getConfigValueByName(constants.GIT_HUB_HEY)) as gitHubGateway:
-        return gitHubGateway.gitUser.get_repos(repoName)
+    return getSession().repository(repoName)
 
 
 def branches(repoName):
-    with GitHubGateway(core.getConfigValueByName(constants.GIT_HUB_HEY)) as gitHubGateway:
-        repo = gitHubGateway.gitUser.get_repos(repoName)
-        print(repo.get_branches())
-
-
-def getContent(repoName, content):
-    contentList = []
-    with GitHubGateway(core.getConfigValueByName(constants.GIT_HUB_HEY)) as gitHubGateway:
-        repo = gitHubGateway.gitUser.get_repos(repoName)
-        for r in repo:
-            if r.full_name == repoName:
-                contents = r.get_contents("")
-                while contents:
-                    file_content = contents.pop(0)
-                    if file_content.type == "dir":
-                        contents.extend(r.get_contents(file_content.path))
-                    else:
-                        contentList.append(file_content)
-
-    return contentList
+    session = getSession()
+    print([branch['name'] for branch in session.getJson('{}/branches'.format(session.repository(repoName).url))])
+
+
+def isSearchedPath(path: str) -> bool:
+    """Gets if a file of a repository is searched, with the extensions and the globs of the local modules.
+
+    The ignore files don't apply, a repository only holds the files they don't ignore.
+
+    Parameters:
+        path: The path of the file within the repository, "/" separated.
+    """
+    return ignoreRules.walkRules().isSearchedPath(path)
+
+
+def repositoryTree(session: GitHubSession, repo, treeSha: str) -> List[Tuple[str, str]]:
+    """Lists every file of a repository with the recursive Git Trees API, a single request for most repositories.
+
+    GitHub truncates the recursive listing of the very large trees, the sub trees are then listed one by one. A sub
+    tree is fetched by its sha, it's only requested the first time.
+
+    Parameters:
+        session: The session that sends the conditional requests.
+        repo: The PyGithub repository.
+        treeSha: The sha or the branch of the tree to list.
+
+    Returns:
+        The path, relative to the root of the repository, and the sha of each file.
+    """
+    treesUrl = '{}/git/trees/'.format(repo.url)
+    tree = session.getJson(treesUrl + urllib.parse.quote(treeSha), {'recursive': 1})
+
+    if not tree.get('truncated'):
+        return [(element['path'], element['sha']) for element in tree['tree'] if element['type'] == 'blob']
+
+    blobs = []
+    pendingTrees = [('', treeSha)]
+
+    while pendingTrees:
+        prefix, sha = pendingTrees.pop()
+
+        for element in session.getJson(treesUrl + urllib.parse.quote(sha), isImmutable=bool(prefix))['tree']:
+            path = posixpath.join(prefix, element['path'])
+
+            if element['type'] == 'tree' and element['path'] not in constants.EXCLUDED_DIRECTORIES:
+                pendingTrees.append((path, element['sha']))
+
+            elif element['type'] == 'blob':
+                blobs.append((path, element['sha']))
+
+    return blobs
+
+
+class RateLimiter:
+    """Holds the downloads back before the rate limit of the token runs out, rather than failing halfway through a
+    search.
+
+    The remaining requests and the reset time come from the X-RateLimit headers of the last response, see
+    :attr:`GitHubSession.rateLimit`. Once only :data:`RATE_LIMIT_RESERVE` requests remain, every download waits for
+    the reset. A server without rate limit, like some GitHub Enterprise, doesn't send the headers, nothing waits then.
+    """
+
+    def __init__(self, session: GitHubSession, isCancelled: Optional[Callable[[], bool]] = None) -> None:
+        """Initialisation of RateLimiter.
+
+        Parameters:
+            session: The session that sends the downloads.
+            isCancelled: If provided, polled while waiting, the wait stops once it returns True.
+        """
+        self.session = session
+        self.isCancelled = isCancelled
+
+        # Only one thread waits for the reset, the others wait for it.
+        self._lock = threading.Lock()
+
+    def _sleepUntil(self, resetTime: float) -> None:
+        while True:
+            if self.isCancelled is not None and self.isCancelled():
+                return
+
+            # Read once, the reset time can pass between the check and the sleep.
+            remaining = resetTime - time.time()
+            if remaining <= 0:
+                break
+
+            time.sleep(min(1.0, remaining))
+
+    def wait(self) -> None:
+        """Waits for the reset of the rate limit if the remaining requests are down to the reserve."""
+        with self._lock:
+            rateLimit = self.session.rateLimit
+
+            if rateLimit is None or rateLimit[0] > RATE_LIMIT_RESERVE:
+                return
+
+            remaining, resetTime = rateLimit
+            resetTime += 1
+            LOGGER.info("{} GitHub requests left, waiting {:.0f}s for the reset".format(remaining, resetTime - time.time()))
+            self._sleepUntil(resetTime)
+
+    def backOff(self, error: GithubException, attempt: int) -> None:
+        """Waits after GitHub refused a request for going too fast, as long as it asks or twice longer on each attempt.
+
+        Parameters:
+            error: The refusal, a primary or a secondary rate limit.
+            attempt: The number of refused attempts of the request so far, starting at 1.
+        """
+        headers = error.headers or {}
+        headers = {name.lower(): value for name, value in headers.items()}
+
+        if 'retry-after' in headers:
+            resetTime = time.time() + float(headers['retry-after'])
+        elif headers.get('x-ratelimit-remaining') == '0' and 'x-ratelimit-reset' in headers:
+            resetTime = float(headers['x-ratelimit-reset']) + 1
+        else:
+            resetTime = time.time() + 2 ** attempt
+
+        with self._lock:
+            LOGGER.info("GitHub rate limit exceeded, retrying in {:.0f}s".format(resetTime - time.time()))
+            self._sleepUntil(resetTime)
+
+
+def downloadBlob(session: GitHubSession, repo, sha: str, rateLimiter: Optional[RateLimiter] = None) -> bytes:
+    """Downloads the content of a blob, the response is not stored, see :mod:`blobCache`.
+
+    Parameters:
+        session: The session that sends the request.
+        repo: The PyGithub repository.
+        sha: The sha of the blob.
+        rateLimiter: If provided, the download waits for it and is retried when GitHub refuses it for going too fast.
+
+    Raises:
+        futures.CancelledError: If the search is cancelled while the download waits, nothing is cached then.
+    """
+    url = '{}/git/blobs/{}'.format(repo.url, sha)
+
+    if rateLimiter is None:
+        return base64.b64decode(session.requestJson(url)[2]['content'])
+
+    for attempt in itertools.count(1):
+        rateLimiter.wait()
+
+        if rateLimiter.isCancelled is not None and rateLimiter.isCancelled():
+            raise futures.CancelledError(sha)
+
+        try:
+            return base64.b64decode(session.requestJson(url)[2]['content'])
+
+        except RateLimitExceededException as error:
+            if attempt == DOWNLOAD_ATTEMPTS:
+                raise
+
+            rateLimiter.backOff(error, attempt)
+
+
+def downloadBlobs(
+        session: GitHubSession,
+        repo,
+        blobs: Iterator[Tuple[str, str]],
+        workers: int,
+        rateLimiter: Optional[RateLimiter] = None,
+        isCancelled: Optional[Callable[[], bool]] = None
+) -> Iterator[Tuple[str, bytes]]:
+    """Downloads the blobs on a pool of threads and yields them in the provided order.
+
+    The cached blobs are read from the :mod:`blobCache` without any request. A few more downloads than threads are
+    queued ahead, so a slow blob holds the following ones back but never stops the pool. Once the search is cancelled
+    no more blob is yielded and the queued downloads are dropped, the running ones end with their request.
+
+    Parameters:
+        session: The session that sends the downloads.
+        repo: The PyGithub repository.
+        blobs: The path and the sha of each blob.
+        workers: The number of threads.
+        rateLimiter: Paces the downloads, see :class:`RateLimiter`.
+        isCancelled: If provided, polled before each blob is yielded.
+
+    Yields:
+        The path and the raw content of each blob.
+    """
+    cache = blobCache.getCache()
+    blobs = iter(blobs)
+
+    def submit(executor: futures.ThreadPoolExecutor, path: str, sha: str) -> None:
+        pending.append((path, executor.submit(cache.fetch, sha, partial(downloadBlob, session, repo, sha, rateLimiter))))
+
+    pending = collections.deque()
+
+    with futures.ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+        try:
+            for path, sha in itertools.islice(blobs, max(workers, 1) * 2):
+                submit(executor, path, sha)
+
+            while pending:
+                if isCancelled is not None and isCancelled():
+                    return
+
+                path, future = pending.popleft()
+
+                try:
+                    content = future.result()
+                except futures.CancelledError:
+                    return
+
+                for nextPath, nextSha in itertools.islice(blobs, 1):
+                    submit(executor, nextPath, nextSha)
+
+                yield path, content
+
+        finally:
+            # The consumer stopped early, the search is cancelled or a download failed, the queued downloads are
+            # dropped.
+            for _, future in pending:
+                future.cancel()
+
+
+def getContent(
+        repoName: str,
+        content: str = '',
+        isCancelled: Optional[Callable[[], bool]] = None
+) -> Iterator[Tuple[str, bytes]]:
+    """Yields the searched files of a repository, in the order of its tree, see :func:`isSearchedPath`.
+
+    The repository is fetched once per session and its whole tree is listed in one request, then the blobs of the searched files that are not in the
+    :mod:`blobCache` are downloaded by the number of threads set in the config.json, see :func:`downloadBlobs`.
+
+    Parameters:
+        repoName: The full name of the repository, "owner/name".
+        content: Only the files within this folder of the repository are yielded, the whole repository if empty.
+        isCancelled: If provided, polled while waiting for the reset of the rate limit and before each blob, the
+            downloads stop once it returns True.
+
+    Yields:
+        The path and the raw content of each file.
+    """
+    prefix = content.strip('/') + '/' if content.strip('/') else ''
+
+    session = getSession()
+    repo = session.repository(repoName)
+
+    blobs = [
+        (path, sha)
+        for path, sha in repositoryTree(session, repo, repo.default_branch)
+        if path.startswith(prefix) and isSearchedPath(path)
+    ]
 
+    yield from downloadBlobs(session, repo, blobs, downloadCount(), RateLimiter(session, isCancelled), isCancelled)
@@ -0,0 +1,215 @@
+"""An on-disk cache of the GitHub blobs, keyed by their sha.
+
+A blob sha is the hash of its content, a cached blob never has to be checked against GitHub again: a file that
+changes gets a new sha. The least recently used blobs are evicted once the cache outgrows its size cap.
+"""
+import os
+import time
+import logging
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Callable, NamedTuple
+
+from wordFinder import constants
+from wordFinder import core
+
+
+LOGGER = logging.getLogger(__name__)
+LOGGER.setLevel(20)
+
+_cache = None
+
+
+class CacheStats(NamedTuple):
+    """The counters of a :class:`BlobCache` since it was opened."""
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+
+    def __str__(self) -> str:
+        return "blob cache: {} hits, {} misses, {} evictions, {:.1f} MB".format(
+            self.hits, self.misses, self.evictions, self.size / 1024 / 1024
+        )
+
+
+class BlobCache:
+    """The blobs stored in a folder, one file per blob, under a sub folder named after the first two characters of
+    their sha.
+
+    The last use of a blob is its modification time, it's updated on each hit so the eviction order survives a restart.
+    The lock only guards the entries in memory, the blobs are read, written and removed outside of it so the
+    concurrent downloads don't wait for each other's disk.
+    """
+
+    def __init__(self, path: str, maxSize: int) -> None:
+        """Initialisation of BlobCache.
+
+        Parameters:
+            path: The folder of the cache, created on the first stored blob.
+            maxSize: The size cap of the cache, in bytes.
+        """
+        self.path = path
+        self.maxSize = maxSize
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        # The size of each cached blob, the least recently used first, read from the folder on first use.
+        self._entries = None
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def _blobPath(self, sha: str) -> str:
+        return os.path.join(self.path, sha[:2], sha)
+
+    def _loadedEntries(self) -> 'OrderedDict[str, int]':
+        """Gets the cached blobs, the folder is only scanned the first time, under the lock."""
+        if self._entries is None:
+            lastUses = []
+
+            if os.path.isdir(self.path):
+                for folder in os.scandir(self.path):
+                    if not folder.is_dir():
+                        continue
+
+                    for entry in os.scandir(folder.path):
+                        if entry.is_file() and not entry.name.startswith('.'):
+                            stat = entry.stat()
+                            lastUses.append((stat.st_mtime, entry.name, stat.st_size))
+
+            self._entries = OrderedDict((sha, size) for _, sha, size in sorted(lastUses))
+            self._size = sum(self._entries.values())
+
+        return self._entries
+
+    def get(self, sha: str) -> Optional[bytes]:
+        """Gets the content of a cached blob, None if it's not cached."""
+        with self._lock:
+            entries = self._loadedEntries()
+
+            if sha not in entries:
+                self.misses += 1
+                return None
+
+            entries.move_to_end(sha)
+
+        blobPath = self._blobPath(sha)
+
+        try:
+            with open(blobPath, 'rb') as reader:
+                content = reader.read()
+
+        except OSError:
+            # Evicted by another thread meanwhile, or removed by hand.
+            with self._lock:
+                self._forget(sha)
+                self.misses += 1
+            return None
+
+        try:
+            lastUse = time.time()
+            os.utime(blobPath, (lastUse, lastUse))
+        except OSError:
+            LOGGER.debug("Cannot touch the blob {}".format(sha))
+
+        with self._lock:
+            self.hits += 1
+
+        return content
+
+    def put(self, sha: str, content: bytes) -> None:
+        """Stores a blob, the least recently used blobs are evicted if the cache outgrows its size cap."""
+        with self._lock:
+            if sha in self._loadedEntries():
+                return
+
+        blobPath = self._blobPath(sha)
+        folder = os.path.dirname(blobPath)
+        os.makedirs(folder, exist_ok=True)
+
+        # Written aside then renamed, a blob is never read half written. Two threads storing the same blob write the
+        # same content.
+        fileDescriptor, temporaryPath = tempfile.mkstemp(dir=folder, prefix='.')
+        with os.fdopen(fileDescriptor, 'wb') as writer:
+            writer.write(content)
+        os.replace(temporaryPath, blobPath)
+
+        with self._lock:
+            entries = self._loadedEntries()
+
+            if sha in entries:
+                return
+
+            entries[sha] = len(content)
+            self._size += len(content)
+
+            evicted = self._evict()
+
+        for evictedSha in evicted:
+            try:
+                os.remove(self._blobPath(evictedSha))
+            except OSError:
+                LOGGER.debug("Cannot evict the blob {}".format(evictedSha))
+
+    def fetch(self, sha: str, download: Callable[[], bytes]) -> bytes:
+        """Gets a blob from the cache, or downloads then stores it.
+
+        Parameters:
+            sha: The sha of the blob.
+            download: Called to get the content of the blob if it's not cached.
+        """
+        content = self.get(sha)
+
+        if content is None:
+            content = download()
+            self.put(sha, content)
+
+        return content
+
+    def _forget(self, sha: str) -> None:
+        size = self._entries.pop(sha, None)
+
+        if size is not None:
+            self._size -= size
+
+    def _evict(self) -> List[str]:
+        """Forgets the least recently used blobs until the cache fits its size cap, under the lock.
+
+        Returns:
+            The sha of the forgotten blobs, their files are removed by the caller once the lock is released.
+        """
+        evicted = []
+
+        while self._size > self.maxSize and self._entries:
+            sha, size = self._entries.popitem(last=False)
+            self._size -= size
+            self.evictions += 1
+            evicted.append(sha)
+
+        return evicted
+
+    @property
+    def stats(self) -> CacheStats:
+        with self._lock:
+            self._loadedEntries()
+            return CacheStats(self.hits, self.misses, self.evictions, self._size)
+
+
+def getCache() -> BlobCache:
+    """Gets the blob cache of the process, its size cap is read from the config.json, in megabytes."""
+    global _cache
+
+    maxSize = core.getConfigValueByName(constants.BLOB_CACHE_SIZE)
+    if maxSize is None:
+        maxSize = constants.DEFAULT_CONFIG[constants.BLOB_CACHE_SIZE]
+    maxSize = int(maxSize) * 1024 * 1024
+
+    if _cache is None:
+        _cache = BlobCache(constants.BLOB_CACHE_PATH, maxSize)
+    else:
+        _cache.maxSize = maxSize
+
+    return _cache
@@ -0,0 +1,119 @@
+"""Local mirrors of the GitHub repositories, searched by the local engine instead of the REST API.
+
+A repository is cloned once with a depth of 1, the later syncs only fetch the last commit of its branch. The mirrors
+are plain folders of modules, the :class:`workers.LocalSearchWorker` scans them like the local packages. Only git is
+needed, any url it can clone works, like a ``file://`` url to a local bare repository.
+"""
+import os
+import base64
+import shutil
+import logging
+import subprocess
+from typing import List, Dict, Optional
+
+from wordFinder import constants
+from wordFinder.utils import moduleWalker
+
+
+LOGGER = logging.getLogger(__name__)
+LOGGER.setLevel(20)
+
+GIT = 'git'
+
+
+class MirrorError(Exception):
+    """Raised when git can't clone or fetch a repository."""
+
+
+def mirrorPath(repoName: str) -> str:
+    """Gets the folder of the mirror of a repository, "owner/name" is mirrored in owner/name."""
+    return os.path.join(constants.GIT_HUB_MIRRORS_PATH, *repoName.split('/'))
+
+
+def gitEnvironment(cloneUrl: str, gitHubToken: Optional[str] = None) -> Dict[str, str]:
+    """Gets the environment of the git commands, git never prompts for credentials.
+
+    The token is passed as an HTTP header through the environment, it never shows in the command line nor in the
+    config of the mirror.
+    """
+    environment = dict(os.environ, GIT_TERMINAL_PROMPT='0')
+
+    if gitHubToken and cloneUrl.startswith('https://'):
+        credentials = base64.b64encode('x-access-token:{}'.format(gitHubToken).encode('utf-8')).decode('ascii')
+
+        environment.update(
+            GIT_CONFIG_COUNT='1',
+            GIT_CONFIG_KEY_0='http.extraHeader',
+            GIT_CONFIG_VALUE_0='Authorization: Basic {}'.format(credentials)
+        )
+
+    return environment
+
+
+def runGit(arguments: List[str], environment: Dict[str, str], cwd: Optional[str] = None) -> None:
+    """Runs a git command.
+
+    Raises:
+        MirrorError: If git fails or is not installed.
+    """
+    try:
+        subprocess.run(
+            [GIT] + arguments,
+            cwd=cwd,
+            env=environment,
+            check=True,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE
+        )
+
+    except FileNotFoundError:
+        raise MirrorError("git is not installed")
+
+    except subprocess.CalledProcessError as error:
+        raise MirrorError(error.stderr.decode('utf-8', 'replace').strip())
+
+
+def syncMirror(repoName: str, cloneUrl: str, branch: str, gitHubToken: Optional[str] = None) -> str:
+    """Clones a repository, or updates its mirror with the last commit of the branch.
+
+    Parameters:
+        repoName: The full name of the repository, "owner/name".
+        cloneUrl: The url to clone, https or file.
+        branch: The branch to mirror, usually the default branch of the repository.
+        gitHubToken: The token of a private repository.
+
+    Returns:
+        The folder of the mirror.
+
+    Raises:
+        MirrorError: If git can't clone or fetch the repository.
+    """
+    path = mirrorPath(repoName)
+    environment = gitEnvironment(cloneUrl, gitHubToken)
+
+    if os.path.isdir(os.path.join(path, '.git')):
+        runGit(['fetch', '--quiet', '--depth', '1', '--no-tags', cloneUrl, branch], environment, path)
+        runGit(['reset', '--quiet', '--hard', 'FETCH_HEAD'], environment, path)
+
+        return path
+
+    # Cloned aside then renamed, a clone interrupted halfway is never taken for a mirror.
+    partialPath = path + '.partial'
+    shutil.rmtree(partialPath, ignore_errors=True)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    runGit(
+        ['clone', '--quiet', '--depth', '1', '--single-branch', '--no-tags', '--branch', branch, cloneUrl, partialPath],
+        environment
+    )
+
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(partialPath, path)
+
+    return path
+
+
+def mirrorModulePaths(path: str) -> List[str]:
+    """Gets the sorted paths of the searched modules of a mirror, with the same rules as the local modules."""
+    return sorted(modulePath for _, modulePath in moduleWalker.walkModules(path))
@@ -0,0 +1,91 @@
+"""The responses of the GitHub API stored on disk with their ETag and Last-Modified, so a refresh of the GitHub tab
+sends conditional requests.
+
+GitHub answers 304 Not Modified to a conditional request when nothing changed, without counting it against the rate
+limit, the stored response is used then. Each token has its own folder, the accounts never share a response.
+"""
+import os
+import json
+import hashlib
+import logging
+import tempfile
+import threading
+from typing import Optional, Any, Dict
+
+from wordFinder import constants
+
+
+LOGGER = logging.getLogger(__name__)
+LOGGER.setLevel(20)
+
+
+class ResponseStore:
+    """The stored responses of a token, one JSON file per request, named after the hash of the request."""
+
+    def __init__(self, path: str) -> None:
+        """Initialisation of ResponseStore.
+
+        Parameters:
+            path: The folder of the responses, created on the first stored response.
+        """
+        self.path = path
+
+        self.notModifiedCount = 0
+
+        self._lock = threading.Lock()
+
+    def _entryPath(self, key: str) -> str:
+        return os.path.join(self.path, hashlib.sha1(key.encode('utf-8')).hexdigest() + '.json')
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Gets the stored response of a request.
+
+        Parameters:
+            key: The url and the parameters of the request.
+
+        Returns:
+            The "etag", "lastModified" and "data" of the response, None if it's not stored.
+        """
+        try:
+            with open(self._entryPath(key), encoding='utf-8') as reader:
+                entry = json.load(reader)
+
+        except (OSError, ValueError):
+            return None
+
+        # Two requests can't share a file, unless their hashes collide.
+        return entry if entry.get('key') == key else None
+
+    def put(self, key: str, etag: Optional[str], lastModified: Optional[str], data: Any) -> None:
+        """Stores the response of a request, a response without validator can't be checked so it's not stored.
+
+        Parameters:
+            key: The url and the parameters of the request.
+            etag: The ETag header of the response.
+            lastModified: The Last-Modified header of the response.
+            data: The decoded JSON of the response.
+        """
+        if etag is None and lastModified is None:
+            return
+
+        entry = {'key': key, 'etag': etag, 'lastModified': lastModified, 'data': data}
+
+        with self._lock:
+            os.makedirs(self.path, exist_ok=True)
+
+            # Written aside then renamed, a response is never read half written.
+            fileDescriptor, temporaryPath = tempfile.mkstemp(dir=self.path, prefix='.')
+            with os.fdopen(fileDescriptor, 'w', encoding='utf-8') as writer:
+                json.dump(entry, writer)
+            os.replace(temporaryPath, self._entryPath(key))
+
+    def countNotModified(self) -> None:
+        with self._lock:
+            self.notModifiedCount += 1
+
+
+def tokenStore(gitHubToken: str) -> ResponseStore:
+    """Gets the store of the provided token, its folder is named after a hash of the token, never the token itself."""
+    tokenHash = hashlib.sha256(gitHubToken.encode('utf-8')).hexdigest()[:16]
+
+    return ResponseStore(os.path.join(constants.GIT_HUB_RESPONSES_PATH, tokenHash))
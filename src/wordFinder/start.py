@@ -1,47 +1,88 @@
+import time
+
+# Taken before any other import, the startup report measures the imports too.
+STARTED = time.perf_counter()
+
 import sys
 import os
+import logging
+import multiprocessing
+from functools import partial
 
 from PySide2 import QtWidgets
 from PySide2.QtGui import QPalette, QColor
 from PySide2.QtCore import Qt
 
-import core
-
 WORD_FINDER_PATH = os.path.dirname(os.path.abspath(os.path.dirname(__file__)))
 
 
-if not core.isPathAppended(WORD_FINDER_PATH):
+# The modules are imported through the wordFinder package, so each of them is loaded once whatever the working folder.
+if WORD_FINDER_PATH not in sys.path:
     sys.path.append(WORD_FINDER_PATH)
 
 
+from wordFinder import core
 from wordFinder import wordFinderUi
+from wordFinder import constants
+
+IMPORTED = time.perf_counter()
+
+LOGGER = logging.getLogger(__name__)
+LOGGER.setLevel(20)
+
+
+def reportStartup(shown: float) -> None:
+    """Logs how long the imports, the construction of the window and its first paint took since the start.
+
+    Parameters:
+        shown: The time at which the window has been shown.
+    """
+    painted = time.perf_counter()
+    report = "Startup: imports {:.0f} ms, window {:.0f} ms, first paint {:.0f} ms".format(
+        (IMPORTED - STARTED) * 1000,
+        (shown - IMPORTED) * 1000,
+        (painted - STARTED) * 1000
+    )
+
+    LOGGER.info(report)
+
+    if core.getConfigValueByName(constants.DEV_MODE):
+        print(report)
+
+
+def main() -> None:
+    qApp = QtWidgets.QApplication()
+    qApp.setStyle("Fusion")
+
+    palette = QPalette()
+    palette.setColor(QPalette.Window, QColor(53, 53, 53))
+    palette.setColor(QPalette.WindowText, Qt.white)
+    palette.setColor(QPalette.Base, QColor(25, 25, 25))
+    palette.setColor(QPalette.AlternateBase, QColor(255, 255, 255))
+    palette.setColor(QPalette.ToolTipBase, Qt.black)
+    palette.setColor(QPalette.ToolTipText, Qt.white)
+    palette.setColor(QPalette.Text, Qt.white)
+    palette.setColor(QPalette.Button, QColor(53, 53, 53))
+    palette.setColor(QPalette.ButtonText, Qt.white)
+    palette.setColor(QPalette.BrightText, Qt.red)
+    palette.setColor(QPalette.Link, QColor(42, 130, 218))
+    palette.setColor(QPalette.Highlight, QColor(42, 130, 218))
+    palette.setColor(QPalette.HighlightedText, Qt.black)
+    qApp.setPalette(palette)
+
+
+    # Set default configuration if previous configuration is not found.
+    if not core.getConfig():
+        print("Configuration not found. Base configuration is applied")
+        core.makeDefaultConfig()
+
+    wfUi = wordFinderUi.WordFinder()
+    wfUi.firstPainted.connect(partial(reportStartup, time.perf_counter()))
+    wfUi.show()
+    qApp.exec_()
 
 
-qApp = QtWidgets.QApplication()
-qApp.setStyle("Fusion")
-
-palette = QPalette()
-palette.setColor(QPalette.Window, QColor(53, 53, 53))
-palette.setColor(QPalette.WindowText, Qt.white)
-palette.setColor(QPalette.Base, QColor(25, 25, 25))
-palette.setColor(QPalette.AlternateBase, QColor(255, 255, 255))
-palette.setColor(QPalette.ToolTipBase, Qt.black)
-palette.setColor(QPalette.ToolTipText, Qt.white)
-palette.setColor(QPalette.Text, Qt.white)
-palette.setColor(QPalette.Button, QColor(53, 53, 53))
-palette.setColor(QPalette.ButtonText, Qt.white)
-palette.setColor(QPalette.BrightText, Qt.red)
-palette.setColor(QPalette.Link, QColor(42, 130, 218))
-palette.setColor(QPalette.Highlight, QColor(42, 130, 218))
-palette.setColor(QPalette.HighlightedText, Qt.black)
-qApp.setPalette(palette)
-
-
-# Set default configuration if previous configuration is not found.
-if not core.getConfig():
-    print("Configuration not found. Base configuration is applied")
-    core.makeDefaultConfig()
-
-wfUi = wordFinderUi.WordFinder()
-wfUi.show()
-qApp.exec_()
+# The search worker processes re-import this module, they must not start the application.
+if __name__ == '__main__':
+    multiprocessing.freeze_support()
+    main()
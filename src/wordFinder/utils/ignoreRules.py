@@ -0,0 +1,344 @@
+"""The rules that decide which folders and files the module walkers go through.
+
+The ``.gitignore`` and ``.ignore`` files of the walked folders, and of their parent folders up to the root of their git
+repository, are honoured like git does: the patterns of a deeper file win, the last matching pattern of a file wins and
+a ``!`` pattern includes again what a previous one excluded. The config.json adds its own exclude globs, in the same
+syntax and with the lowest precedence, include globs and the extensions of the searched files.
+
+The patterns are compiled once, an ignore file is only read again once it changes, and an ignored folder is pruned
+before it's listed.
+"""
+import os
+import re
+import logging
+import threading
+from typing import List, Tuple, Optional, Iterable, NamedTuple
+
+from wordFinder import constants
+from wordFinder import core
+
+
+LOGGER = logging.getLogger(__name__)
+LOGGER.setLevel(20)
+
+IGNORE_FILES = ('.gitignore', '.ignore')
+
+# Like git, the patterns ignore the case where the file system does.
+PATTERN_FLAGS = re.IGNORECASE if os.name == 'nt' else 0
+
+_ignoreFiles = {}
+_ignoreFilesLock = threading.Lock()
+
+_rules = None
+
+
+class IgnorePattern(NamedTuple):
+    """A compiled line of an ignore file."""
+    regex: 're.Pattern'
+    isNegated: bool
+    isDirectoryOnly: bool
+
+
+# The patterns of an ignore file, the path of its folder, and the path of the walked folder within it when the ignore
+# file is in a parent of the walked folder.
+Layer = Tuple[str, str, Tuple[IgnorePattern, ...]]
+
+
+def _translate(pattern: str) -> str:
+    """Translates the glob of a pattern to a regular expression, ``*`` and ``?`` never match a ``/``, ``**`` does."""
+    parts = []
+    index = 0
+
+    while index < len(pattern):
+        isFolderStart = index == 0 or pattern[index - 1] == '/'
+
+        if isFolderStart and pattern.startswith('**/', index):
+            parts.append('(?:.*/)?')
+            index += 3
+            continue
+
+        if isFolderStart and pattern.startswith('**', index) and index + 2 == len(pattern):
+            parts.append('.*')
+            index += 2
+            continue
+
+        character = pattern[index]
+
+        if character == '*':
+            parts.append('[^/]*')
+
+        elif character == '?':
+            parts.append('[^/]')
+
+        elif character == '[' and pattern.find(']', index + 2) != -1:
+            # A "]" right after the "[" is part of the set.
+            end = pattern.find(']', index + 2)
+            characterSet = pattern[index + 1:end]
+            if characterSet.startswith('!'):
+                characterSet = '^' + characterSet[1:]
+
+            parts.append('[{}]'.format(characterSet))
+            index = end + 1
+            continue
+
+        elif character == '\\' and index + 1 < len(pattern):
+            parts.append(re.escape(pattern[index + 1]))
+            index += 2
+            continue
+
+        else:
+            parts.append(re.escape(character))
+
+        index += 1
+
+    return ''.join(parts)
+
+
+def compilePattern(line: str) -> Optional[IgnorePattern]:
+    """Compiles a line of an ignore file, or a glob of the config.json.
+
+    A pattern with a ``/`` other than a trailing one is anchored to the folder of its ignore file, else it matches at
+    any depth. A trailing ``/`` only matches the folders.
+
+    Returns:
+        The compiled pattern, None for a blank line or a comment.
+    """
+    line = line.rstrip('\r\n')
+
+    # The trailing spaces are ignored unless they're escaped.
+    while line.endswith(' ') and not line.endswith('\\ '):
+        line = line[:-1]
+
+    if not line or line.startswith('#'):
+        return None
+
+    isNegated = line.startswith('!')
+    if isNegated:
+        line = line[1:]
+
+    elif line.startswith('\\#') or line.startswith('\\!'):
+        line = line[1:]
+
+    isDirectoryOnly = line.endswith('/')
+    line = line.rstrip('/')
+
+    if not line:
+        return None
+
+    isAnchored = '/' in line
+    line = line.lstrip('/')
+
+    source = _translate(line) if isAnchored else '(?:.*/)?' + _translate(line)
+
+    try:
+        regex = re.compile(source, PATTERN_FLAGS)
+
+    except re.error:
+        LOGGER.debug("Invalid ignore pattern {}".format(line))
+        return None
+
+    return IgnorePattern(regex, isNegated, isDirectoryOnly)
+
+
+def compilePatterns(lines: Iterable[str]) -> Tuple[IgnorePattern, ...]:
+    return tuple(pattern for pattern in map(compilePattern, lines) if pattern is not None)
+
+
+def readIgnoreFile(path: str) -> Tuple[IgnorePattern, ...]:
+    """Gets the compiled patterns of an ignore file, it's only read again once its size or modification time changes.
+
+    Returns:
+        The patterns, in the order of the file, none if it can't be read.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return ()
+
+    with _ignoreFilesLock:
+        cached = _ignoreFiles.get(path)
+
+    if cached is not None and cached[0] == (stat.st_size, stat.st_mtime_ns):
+        return cached[1]
+
+    try:
+        with open(path, encoding='utf-8', errors='replace') as reader:
+            patterns = compilePatterns(reader)
+
+    except OSError:
+        return ()
+
+    with _ignoreFilesLock:
+        _ignoreFiles[path] = ((stat.st_size, stat.st_mtime_ns), patterns)
+
+    return patterns
+
+
+class IgnoreScope:
+    """The ignore patterns that apply within a folder, a sub folder gets a new scope if it has its own ignore files."""
+
+    __slots__ = ('layers',)
+
+    def __init__(self, layers: Tuple[Layer, ...] = ()) -> None:
+        """Initialisation of IgnoreScope.
+
+        Parameters:
+            layers: The patterns of each ignore file, from the outermost folder to the innermost.
+        """
+        self.layers = layers
+
+    def enter(self, path: str, names: Iterable[str]) -> 'IgnoreScope':
+        """Gets the scope of a sub folder.
+
+        Parameters:
+            path: The path of the sub folder.
+            names: The names of the entries of the sub folder, only the ignore files among them are read.
+        """
+        layers = []
+
+        for name in IGNORE_FILES:
+            if name in names:
+                patterns = readIgnoreFile(os.path.join(path, name))
+                if patterns:
+                    layers.append((path, '', patterns))
+
+        return IgnoreScope(self.layers + tuple(layers)) if layers else self
+
+    def isIgnored(self, path: str, isDirectory: bool) -> bool:
+        """Gets if a folder or a file is ignored, the deepest and last matching pattern decides.
+
+        Parameters:
+            path: The path of the folder or the file, within the folder of every layer.
+            isDirectory: If true, the patterns that end with a "/" apply too.
+        """
+        for base, prefix, patterns in reversed(self.layers):
+            relativePath = prefix + path[len(base) + 1:].replace(os.sep, '/')
+
+            for pattern in reversed(patterns):
+                if pattern.isDirectoryOnly and not isDirectory:
+                    continue
+
+                if pattern.regex.fullmatch(relativePath):
+                    return not pattern.isNegated
+
+        return False
+
+
+def gitRoot(path: str) -> Optional[str]:
+    """Gets the root of the git repository that contains the provided folder, None if it's not in a repository."""
+    folder = os.path.abspath(path)
+
+    while True:
+        if os.path.exists(os.path.join(folder, '.git')):
+            return folder
+
+        parent = os.path.dirname(folder)
+        if parent == folder:
+            return None
+
+        folder = parent
+
+
+class WalkRules:
+    """The searched extensions, the include globs and the exclude globs of the config.json, compiled once."""
+
+    def __init__(
+            self,
+            extensions: Iterable[str] = ('.py',),
+            includeGlobs: Iterable[str] = (),
+            excludeGlobs: Iterable[str] = ()
+    ) -> None:
+        """Initialisation of WalkRules.
+
+        Parameters:
+            extensions: The extensions of the searched files, like ".py".
+            includeGlobs: If any, only the files that match one of them are searched.
+            excludeGlobs: The folders and files that are never walked, in the syntax of a .gitignore.
+        """
+        self.extensions = tuple(extension.lower() for extension in extensions)
+        self.includePatterns = compilePatterns(includeGlobs)
+        self.excludePatterns = compilePatterns(excludeGlobs)
+
+    def isModule(self, name: str, relativePath: str) -> bool:
+        """Gets if a file that is not ignored is searched.
+
+        Parameters:
+            name: The name of the file.
+            relativePath: The path of the file within the walked folder, "/" separated.
+        """
+        if not name.lower().endswith(self.extensions) or name in constants.EXCLUDED_MODULES:
+            return False
+
+        return not self.includePatterns \
+            or any(pattern.regex.fullmatch(relativePath) for pattern in self.includePatterns)
+
+    def rootScope(self, path: str) -> IgnoreScope:
+        """Gets the scope of a walked folder before its own ignore files are read, see :meth:`IgnoreScope.enter`.
+
+        It holds the exclude globs and the ignore files of the parent folders, up to the root of the git repository.
+        """
+        layers = [(path, '', self.excludePatterns)] if self.excludePatterns else []
+
+        root = gitRoot(path)
+
+        if root is not None:
+            folder = os.path.dirname(os.path.abspath(path))
+            parentLayers = []
+
+            while len(folder) >= len(root):
+                prefix = os.path.relpath(os.path.abspath(path), folder).replace(os.sep, '/') + '/'
+
+                for name in IGNORE_FILES:
+                    patterns = readIgnoreFile(os.path.join(folder, name))
+                    if patterns:
+                        parentLayers.append((path, prefix, patterns))
+
+                if folder == root:
+                    break
+                folder = os.path.dirname(folder)
+
+            # The outermost ignore file first, it has the lowest precedence.
+            layers += reversed(parentLayers)
+
+        return IgnoreScope(tuple(layers))
+
+    def isSearchedPath(self, relativePath: str) -> bool:
+        """Gets if a file of a tree that is not on disk, like a GitHub repository, is searched.
+
+        Only the extensions, the include globs and the exclude globs apply, each parent folder is checked as a folder.
+
+        Parameters:
+            relativePath: The path of the file within the tree, "/" separated.
+        """
+        # The paths are given with a leading "/" within a layer of an empty base.
+        scope = IgnoreScope((('', '', self.excludePatterns),))
+        parts = relativePath.split('/')
+
+        for index in range(1, len(parts)):
+            if parts[index - 1] in constants.EXCLUDED_DIRECTORIES \
+                    or scope.isIgnored('/' + '/'.join(parts[:index]), True):
+                return False
+
+        return self.isModule(parts[-1], relativePath) and not scope.isIgnored('/' + relativePath, False)
+
+
+def _configValue(name: str) -> List[str]:
+    value = core.getConfigValueByName(name)
+
+    return list(constants.DEFAULT_CONFIG[name] if value is None else value)
+
+
+def walkRules() -> WalkRules:
+    """Gets the walk rules of the config.json, they're only compiled again once the config.json changes."""
+    global _rules
+
+    extensions = _configValue(constants.MODULE_EXTENSIONS)
+    includeGlobs = _configValue(constants.INCLUDE_GLOBS)
+    excludeGlobs = _configValue(constants.EXCLUDE_GLOBS)
+
+    key = (extensions, includeGlobs, excludeGlobs)
+
+    if _rules is None or _rules[0] != key:
+        _rules = (key, WalkRules(extensions, includeGlobs, excludeGlobs))
+
+    return _rules[1]
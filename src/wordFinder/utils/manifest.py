@@ -0,0 +1,137 @@
+import os
+import hashlib
+from typing import Dict, List, NamedTuple, Optional
+
+from wordFinder.utils import moduleWalker
+
+
+class Fingerprint(NamedTuple):
+    """What is known of a module when it was last read."""
+    size: int
+    mTime: int
+    digest: Optional[bytes] = None
+
+
+class ManifestDiff(NamedTuple):
+    """The modules that have been added, changed or deleted between two manifests."""
+    added: List[str]
+    changed: List[str]
+    deleted: List[str]
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.changed or self.deleted)
+
+
+def contentDigest(content: bytes) -> bytes:
+    """Gets the digest of a module content, see :attr:`Fingerprint.digest`."""
+    return hashlib.blake2b(content, digest_size=16).digest()
+
+
+class Manifest:
+    """The fingerprint of each module within a search path.
+
+    A manifest is compared to a newer one to find the modules to reprocess, a module is changed if its size or its
+    modification time has changed. If its content digest is known and its size is the same, the content is read and
+    compared so a module that was only touched is not reprocessed.
+    """
+
+    def __init__(self, fingerprints: Optional[Dict[str, Fingerprint]] = None) -> None:
+        """Initialisation of Manifest.
+
+        Parameters:
+            fingerprints: The fingerprint of each module path.
+        """
+        self.fingerprints = fingerprints if fingerprints is not None else {}
+
+    def __len__(self) -> int:
+        return len(self.fingerprints)
+
+    def __contains__(self, modulePath: str) -> bool:
+        return modulePath in self.fingerprints
+
+    @classmethod
+    def scan(cls, searchPath: str) -> 'Manifest':
+        """Stats every module within the provided search path, the contents are not read."""
+        fingerprints = {}
+
+        for entry in moduleWalker.scanSearchPath(searchPath):
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+
+            fingerprints[entry.path] = Fingerprint(stat.st_size, stat.st_mtime_ns)
+
+        return cls(fingerprints)
+
+    def isCurrent(self, modulePath: str) -> bool:
+        """Gets if a module has the size and the modification time it had when it was last read, only it is stat."""
+        fingerprint = self.fingerprints.get(modulePath)
+
+        if fingerprint is None:
+            return False
+
+        try:
+            stat = os.stat(modulePath)
+        except OSError:
+            return False
+
+        return stat.st_size == fingerprint.size and stat.st_mtime_ns == fingerprint.mTime
+
+    def set(self, modulePath: str, fingerprint: Fingerprint) -> None:
+        self.fingerprints[modulePath] = fingerprint
+
+    def remove(self, modulePath: str) -> None:
+        self.fingerprints.pop(modulePath, None)
+
+    def paths(self) -> List[str]:
+        return list(self.fingerprints)
+
+    def diff(self, newer: 'Manifest') -> ManifestDiff:
+        """Gets the modules that differ between this manifest and the provided newer one.
+
+        The unchanged modules whose stat only has changed get their fingerprint updated in this manifest.
+        """
+        added = []
+        changed = []
+        deleted = [modulePath for modulePath in self.fingerprints if modulePath not in newer.fingerprints]
+
+        for modulePath, fingerprint in newer.fingerprints.items():
+            previous = self.fingerprints.get(modulePath)
+
+            if previous is None:
+                added.append(modulePath)
+                continue
+
+            if previous.size == fingerprint.size and previous.mTime == fingerprint.mTime:
+                continue
+
+            if previous.digest is not None and previous.size == fingerprint.size:
+                try:
+                    with open(modulePath, 'rb') as reader:
+                        digest = contentDigest(reader.read())
+
+                except OSError:
+                    digest = None
+
+                if digest == previous.digest:
+                    self.fingerprints[modulePath] = fingerprint._replace(digest=digest)
+                    continue
+
+            changed.append(modulePath)
+
+        return ManifestDiff(added, changed, deleted)
+
+
+def readFingerprint(modulePath: str, content: bytes) -> Optional[Fingerprint]:
+    """Gets the fingerprint of a module whose content has just been read.
+
+    Returns:
+        The fingerprint, None if the module can't be stat.
+    """
+    try:
+        stat = os.stat(modulePath)
+    except OSError:
+        return None
+
+    return Fingerprint(stat.st_size, stat.st_mtime_ns, contentDigest(content))
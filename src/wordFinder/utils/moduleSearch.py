@@ -0,0 +1,451 @@
+import io
+import os
+import mmap
+import time
+import codecs
+import logging
+from concurrent import futures
+from typing import List, Tuple, Optional, Iterator, Union, Callable
+
+from wordFinder.utils import sentenceProcess
+
+
+LOGGER = logging.getLogger(__name__)
+LOGGER.setLevel(20)
+
+# Below this number of modules, the search runs in a single process, starting the workers would cost more than the scan.
+PARALLEL_SEARCH_MIN_MODULES = 200
+
+# The number of modules sent to a worker process at once.
+SHARD_SIZE = 64
+
+# From this size, the modules are memory-mapped instead of read.
+MMAP_MIN_SIZE = 1024 * 1024
+
+# The size of the chunks copied from a mmap to count its line endings.
+NEWLINE_CHUNK_SIZE = 1024 * 1024
+
+# The number of bytes read at the start of a module to find its encoding, or that it's binary.
+SNIFF_SIZE = 4096
+
+# The encoding of the modules that are not UTF-8, any byte decodes in Latin-1.
+FALLBACK_ENCODING = 'latin-1'
+
+# The UTF-32 BOMs start like the UTF-16 ones, they're checked first.
+BYTE_ORDER_MARKS = (
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+Block = List[Tuple[int, str, bool]]
+
+_executor = None
+_executorWorkers = 0
+
+
+class SkippedModule(Exception):
+    """Raised when a module is not searched, the search goes on with the next one."""
+
+    BINARY = 'binary'
+    TOO_LARGE = 'too large'
+    UNREADABLE = 'unreadable'
+
+    def __init__(self, modulePath: str, reason: str) -> None:
+        """Initialisation of SkippedModule.
+
+        Parameters:
+            modulePath: The path of the skipped module.
+            reason: :attr:`BINARY`, :attr:`TOO_LARGE` or :attr:`UNREADABLE`.
+        """
+        super().__init__("{} is skipped, {}".format(modulePath, reason))
+
+        self.modulePath = modulePath
+        self.reason = reason
+
+
+def sniffEncoding(head: bytes) -> Optional[str]:
+    """Gets the encoding of a module from its first bytes.
+
+    A byte order mark gives the encoding, else a module without null byte is UTF-8 if its first bytes decode, or
+    :const:`FALLBACK_ENCODING`.
+
+    Parameters:
+        head: The first :const:`SNIFF_SIZE` bytes of the module, or the whole module if it's smaller.
+
+    Returns:
+        The encoding, None if the module is binary.
+    """
+    for byteOrderMark, encoding in BYTE_ORDER_MARKS:
+        if head.startswith(byteOrderMark):
+            return encoding
+
+    if b'\0' in head:
+        return None
+
+    try:
+        # The head may end within a character, it's only an error if the module ends there too.
+        codecs.getincrementaldecoder('utf-8')().decode(head, final=len(head) < SNIFF_SIZE)
+
+    except UnicodeDecodeError:
+        return FALLBACK_ENCODING
+
+    return 'utf-8'
+
+
+def decodeModule(content: bytes, encoding: str) -> str:
+    """Decodes a module with the encoding sniffed from its head, see :func:`sniffEncoding`.
+
+    A module whose head is UTF-8 may still hold Latin-1 bytes further on, it's decoded as :const:`FALLBACK_ENCODING`
+    as a whole then, rather than replacing these bytes.
+    """
+    if encoding == 'utf-8':
+        try:
+            return content.decode('utf-8')
+
+        except UnicodeDecodeError:
+            return content.decode(FALLBACK_ENCODING)
+
+    return content.decode(encoding, errors='replace')
+
+
+def skipSummary(skipped: List[Tuple[str, str]]) -> str:
+    """Gets a sentence that counts the skipped modules by reason, like "3 files skipped: 2 binary, 1 too large".
+
+    Parameters:
+        skipped: The (modulePath, reason) of each skipped module, see :class:`SkippedModule`.
+    """
+    counts = {}
+    for _, reason in skipped:
+        counts[reason] = counts.get(reason, 0) + 1
+
+    return "{} file{} skipped: {}".format(
+        len(skipped),
+        's' if len(skipped) > 1 else '',
+        ', '.join("{} {}".format(count, reason) for reason, count in sorted(counts.items()))
+    )
+
+
+def searchModule(
+        modulePath: str,
+        query: sentenceProcess.SearchQuery,
+        numberOfExtraLine: int = 0,
+        maxMatches: int = 0,
+        isCancelled: Optional[Callable[[], bool]] = None,
+        maxFileSize: int = 0
+) -> List[Block]:
+    """Searches the provided query in a module.
+
+    The first bytes of the module are sniffed first, see :func:`sniffEncoding`. If the module is UTF-8 and the query
+    has an ASCII bytes prefilter, the undecoded module is searched as a whole, see :func:`searchBuffer`, the modules
+    bigger than :const:`MMAP_MIN_SIZE` are memory-mapped instead of read. The ASCII bytes are the same in Latin-1, so
+    a Latin-1 byte past the sniffed head doesn't hide a match. Else, the module is decoded and searched line by line,
+    see :func:`decodeModule`.
+
+    Parameters:
+        modulePath: The path of the module to read.
+        query: The compiled query to search.
+        numberOfExtraLine: The number of context lines to keep before and after each match.
+        maxMatches: If not 0, the scan of the module stops once this number of matching lines is found.
+        isCancelled: If provided, polled while the module is scanned, the blocks found so far are returned once it
+            returns True.
+        maxFileSize: If not 0, the modules bigger than this number of bytes are skipped.
+
+    Returns:
+        The blocks to display, see :func:`sentenceProcess.contextBlocks`.
+
+    Raises:
+        SkippedModule: If the module is binary, too large or can't be read.
+    """
+    try:
+        with open(modulePath, 'rb') as reader:
+            size = os.fstat(reader.fileno()).st_size
+
+            if maxFileSize and size > maxFileSize:
+                raise SkippedModule(modulePath, SkippedModule.TOO_LARGE)
+
+            head = reader.read(SNIFF_SIZE)
+            encoding = sniffEncoding(head)
+
+            if encoding is None:
+                raise SkippedModule(modulePath, SkippedModule.BINARY)
+
+            if encoding == 'utf-8' and query.bytesPrefilter is not None and query.bytesPrefilter.pattern.isascii() \
+                    and not query.multiline:
+                if size < MMAP_MIN_SIZE:
+                    return searchBuffer(head + reader.read(), query, numberOfExtraLine, maxMatches, isCancelled)
+
+                with mmap.mmap(reader.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                    return searchBuffer(buffer, query, numberOfExtraLine, maxMatches, isCancelled)
+
+            content = head + reader.read()
+
+    except OSError as error:
+        LOGGER.debug("Cannot read {}: {}".format(modulePath, error))
+        raise SkippedModule(modulePath, SkippedModule.UNREADABLE)
+
+    # The line endings are translated like a module opened in text mode.
+    lines = io.StringIO(decodeModule(content, encoding), newline=None).readlines()
+
+    # The context is sliced from the lines already in memory, the module is read only once.
+    return sentenceProcess.contextBlocks(
+        lines,
+        query.matchingLineNumbers(lines, maxMatches, isCancelled),
+        numberOfExtraLine
+    )
+
+
+def _countNewlines(buffer: Union[bytes, mmap.mmap], start: int, end: int) -> int:
+    """Counts the line endings between the provided offsets, a mmap is copied chunk by chunk to count them."""
+    if isinstance(buffer, bytes):
+        return buffer.count(b'\n', start, end)
+
+    return sum(
+        buffer[chunkStart:min(chunkStart + NEWLINE_CHUNK_SIZE, end)].count(b'\n')
+        for chunkStart in range(start, end, NEWLINE_CHUNK_SIZE)
+    )
+
+
+def _decodeLine(buffer: Union[bytes, mmap.mmap], start: int, end: int) -> str:
+    """Decodes the line between the provided offsets as :meth:`io.TextIOWrapper.readlines` would return it.
+
+    Parameters:
+        start: The offset of the first character of the line.
+        end: The offset of the line ending, or the size of the buffer for a last line without ending.
+    """
+    line = buffer[start:end]
+
+    try:
+        line = line.decode('utf-8')
+
+    except UnicodeDecodeError:
+        # A Latin-1 line past the sniffed head, see :func:`decodeModule`.
+        line = line.decode(FALLBACK_ENCODING)
+
+    line = line.rstrip('\r')
+
+    return line + '\n' if end < len(buffer) else line
+
+
+def searchBuffer(
+        buffer: Union[bytes, mmap.mmap],
+        query: sentenceProcess.SearchQuery,
+        numberOfExtraLine: int = 0,
+        maxMatches: int = 0,
+        isCancelled: Optional[Callable[[], bool]] = None
+) -> List[Block]:
+    """Searches the provided query in an undecoded UTF-8 module.
+
+    The bytes prefilter of the query runs over the whole buffer, only the lines it finds are decoded and checked
+    with the query. The line numbers are counted from one candidate line to the next, the lines that don't
+    match or are not in a context are never decoded.
+
+    Parameters:
+        buffer: The content of the module, a mmap or bytes.
+        query: The compiled query to search, it must have a :attr:`SearchQuery.bytesPrefilter`.
+        numberOfExtraLine: The number of context lines to keep before and after each match.
+        maxMatches: If not 0, the scan stops once this number of matching lines is found.
+        isCancelled: If provided, polled every :const:`sentenceProcess.CANCEL_CHECK_INTERVAL` candidate lines.
+
+    Returns:
+        The blocks to display, see :func:`sentenceProcess.contextBlocks`.
+    """
+    prefilterSearch = query.bytesPrefilter.search
+    matchLine = query.matchLine
+    size = len(buffer)
+
+    # The (lineStart, lineEnd, isMatch) of each line to display, by line number.
+    lines = {}
+
+    lineNumber = 1
+    lineStart = 0
+    position = 0
+    candidateCount = 0
+    matchCount = 0
+
+    while position <= size:
+        found = prefilterSearch(buffer, position)
+
+        if found is None or matchCount == maxMatches > 0:
+            break
+
+        candidateCount += 1
+        if isCancelled is not None and not candidateCount % sentenceProcess.CANCEL_CHECK_INTERVAL and isCancelled():
+            break
+
+        start = buffer.rfind(b'\n', 0, found.start()) + 1
+        end = buffer.find(b'\n', found.start())
+        if end == -1:
+            end = size
+
+        lineNumber += _countNewlines(buffer, lineStart, start)
+        lineStart = start
+        position = end + 1
+
+        if not matchLine(_decodeLine(buffer, start, end)):
+            continue
+
+        # A matching line may already be in the context of the previous match.
+        lines[lineNumber] = (start, end, True)
+        matchCount += 1
+
+        # Walk back then forward from the matching line to find its context.
+        contextEnd = start - 1
+        for contextNumber in range(lineNumber - 1, lineNumber - 1 - numberOfExtraLine, -1):
+            if contextEnd < 0:
+                break
+
+            contextStart = buffer.rfind(b'\n', 0, contextEnd) + 1
+            lines.setdefault(contextNumber, (contextStart, contextEnd, False))
+            contextEnd = contextStart - 1
+
+        contextStart = end + 1
+        for contextNumber in range(lineNumber + 1, lineNumber + 1 + numberOfExtraLine):
+            if contextStart >= size:
+                break
+
+            contextEnd = buffer.find(b'\n', contextStart)
+            if contextEnd == -1:
+                contextEnd = size
+
+            lines.setdefault(contextNumber, (contextStart, contextEnd, False))
+            contextStart = contextEnd + 1
+
+    blocks = []
+    previousNumber = None
+
+    for number in sorted(lines):
+        start, end, isMatch = lines[number]
+
+        if previousNumber is None or number != previousNumber + 1:
+            blocks.append([])
+
+        blocks[-1].append((number, _decodeLine(buffer, start, end), isMatch))
+        previousNumber = number
+
+    return blocks
+
+
+def searchModules(
+        modulePaths: List[str],
+        query: sentenceProcess.SearchQuery,
+        numberOfExtraLine: int = 0,
+        maxMatches: int = 0,
+        deadline: Optional[float] = None,
+        maxFileSize: int = 0
+) -> Tuple[List[Tuple[str, List[Block]]], List[Tuple[str, str]]]:
+    """Searches the provided query in several modules, this is the task run by the worker processes.
+
+    Parameters:
+        modulePaths: The paths of the modules to scan.
+        query: The compiled query to search.
+        numberOfExtraLine: The number of context lines to keep before and after each match.
+        maxMatches: If not 0, the scan of each module stops once this number of matching lines is found.
+        deadline: If provided, the :func:`time.time` at which the scan stops, a worker process can't poll the
+            cancellation of the search.
+        maxFileSize: If not 0, the modules bigger than this number of bytes are skipped.
+
+    Returns:
+        The (modulePath, blocks) of each module that contains a match, in the order of the provided modules, and the
+        (modulePath, reason) of each skipped module, see :class:`SkippedModule`.
+    """
+    results = []
+    skipped = []
+    isExpired = None if deadline is None else lambda: time.time() >= deadline
+
+    for modulePath in modulePaths:
+        if isExpired is not None and isExpired():
+            break
+
+        try:
+            blocks = searchModule(modulePath, query, numberOfExtraLine, maxMatches, isExpired, maxFileSize)
+
+        except SkippedModule as error:
+            skipped.append((error.modulePath, error.reason))
+            continue
+
+        if blocks:
+            results.append((modulePath, blocks))
+
+    return results, skipped
+
+
+def workerCount(configuredWorkers: Optional[int]) -> int:
+    """Gets the number of worker processes to use.
+
+    Parameters:
+        configuredWorkers: The number of workers set in the config.json, 0 or None uses every core.
+    """
+    if not configuredWorkers or configuredWorkers < 0:
+        return os.cpu_count() or 1
+
+    return configuredWorkers
+
+
+def isParallelSearch(moduleCount: int, workers: int) -> bool:
+    """Gets if a search over the provided number of modules is worth running in several processes."""
+    return workers > 1 and moduleCount >= PARALLEL_SEARCH_MIN_MODULES
+
+
+def getExecutor(workers: int) -> 'futures.ProcessPoolExecutor':
+    """Gets the process pool, it's kept alive between searches so the workers are only started once.
+
+    The annotation is a string, :mod:`concurrent.futures` only imports the multiprocessing machinery on first use.
+
+    Parameters:
+        workers: The number of worker processes, the pool is recreated if this number changes.
+    """
+    global _executor, _executorWorkers
+
+    if _executor is None or _executorWorkers != workers:
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+
+        _executor = futures.ProcessPoolExecutor(max_workers=workers)
+        _executorWorkers = workers
+
+    return _executor
+
+
+def parallelSearch(
+        modulePaths: List[str],
+        query: sentenceProcess.SearchQuery,
+        numberOfExtraLine: int,
+        workers: int,
+        maxMatches: int = 0,
+        deadline: Optional[float] = None,
+        maxFileSize: int = 0
+) -> Iterator[Tuple[List[str], List[Tuple[str, List[Block]]], List[Tuple[str, str]]]]:
+    """Shards the modules across the worker processes and yields the results of each shard.
+
+    The shards are yielded in the order of the provided modules whatever the order the workers finish them, closing
+    the generator cancels the shards that are not started yet.
+
+    Parameters:
+        modulePaths: The paths of the modules to scan.
+        query: The compiled query to search.
+        numberOfExtraLine: The number of context lines to keep before and after each match.
+        workers: The number of worker processes.
+        maxMatches: If not 0, the scan of each module stops once this number of matching lines is found.
+        deadline: If provided, the :func:`time.time` at which the workers stop scanning.
+        maxFileSize: If not 0, the modules bigger than this number of bytes are skipped.
+
+    Yields:
+        The modules of the shard, their results and the skipped modules, see :func:`searchModules`.
+    """
+    executor = getExecutor(workers)
+    shards = [modulePaths[index:index + SHARD_SIZE] for index in range(0, len(modulePaths), SHARD_SIZE)]
+    pending = [
+        executor.submit(searchModules, shard, query, numberOfExtraLine, maxMatches, deadline, maxFileSize)
+        for shard in shards
+    ]
+
+    try:
+        for shard, future in zip(shards, pending):
+            yield (shard,) + future.result()
+
+    finally:
+        for future in pending:
+            future.cancel()
@@ -0,0 +1,183 @@
+import os
+import logging
+from typing import Iterator, Tuple, List, Optional, Callable, NamedTuple
+
+from wordFinder import constants
+from wordFinder.utils import ignoreRules
+
+
+LOGGER = logging.getLogger(__name__)
+LOGGER.setLevel(20)
+
+
+def packages(searchPath: str) -> Iterator[str]:
+    """Yields the name of the packages within the provided search path, the ignored folders are not packages.
+
+    Parameters:
+        searchPath: The folder that contains the packages.
+    """
+    names = os.listdir(searchPath)
+    scope = ignoreRules.walkRules().rootScope(searchPath).enter(searchPath, names)
+
+    for package in names:
+        packagePath = os.path.join(searchPath, package)
+
+        if os.path.isdir(packagePath) and package not in constants.EXCLUDED_MODULES \
+                and not scope.isIgnored(packagePath, True):
+            yield package
+
+
+class FolderEntry(NamedTuple):
+    """A folder or a file within a listed folder."""
+    name: str
+    path: str
+    isDir: bool
+
+    # The entry it was listed from, if it was listed with :func:`os.scandir`.
+    dirEntry: Optional[os.DirEntry] = None
+
+
+def scanFolder(path: str) -> List[FolderEntry]:
+    """Lists the provided folder with :func:`os.scandir`, the directory entries are kept.
+
+    Returns:
+        The entries of the folder, none if it can't be read or has been deleted meanwhile, the walk goes on.
+    """
+    try:
+        return _scanFolder(path)
+
+    except OSError as error:
+        LOGGER.debug("Cannot list {}: {}".format(path, error))
+        return []
+
+
+def _scanFolder(path: str) -> List[FolderEntry]:
+    with os.scandir(path) as iterator:
+        return [FolderEntry(entry.name, entry.path, entry.is_dir(), entry) for entry in iterator]
+
+
+def walk(
+        path: str,
+        rules: Optional[ignoreRules.WalkRules] = None,
+        listFolder: Callable[[str], List[FolderEntry]] = scanFolder
+) -> Iterator[FolderEntry]:
+    """Yields the modules within the provided path and its sub folders.
+
+    The ignored folders are never listed, see :mod:`ignoreRules`.
+
+    Parameters:
+        path: The path where to search the modules.
+        rules: The searched extensions and globs, the ones of the config.json if None.
+        listFolder: Lists a folder, see :meth:`ModuleTree.listFolder` for a cached listing.
+
+    Yields:
+        The entry of each module.
+    """
+    rules = rules or ignoreRules.walkRules()
+
+    yield from _walk(path, path, rules.rootScope(path), rules, listFolder)
+
+
+def _walk(
+        root: str,
+        path: str,
+        scope: ignoreRules.IgnoreScope,
+        rules: ignoreRules.WalkRules,
+        listFolder: Callable[[str], List[FolderEntry]]
+) -> Iterator[FolderEntry]:
+    """See :func:`walk`, the scope holds the ignore files of the parent folders."""
+    entries = listFolder(path)
+    scope = scope.enter(path, [entry.name for entry in entries])
+
+    for entry in entries:
+        if entry.isDir:
+            if entry.name not in constants.EXCLUDED_DIRECTORIES and not scope.isIgnored(entry.path, True):
+                yield from _walk(root, entry.path, scope, rules, listFolder)
+
+        elif rules.isModule(entry.name, _relativePath(root, entry.path)) and not scope.isIgnored(entry.path, False):
+            yield entry
+
+
+def _relativePath(root: str, path: str) -> str:
+    """Gets the "/" separated path of a walked entry within the walked folder."""
+    return path[len(root) + 1:].replace(os.sep, '/')
+
+
+def walkModules(path: str, rules: Optional[ignoreRules.WalkRules] = None) -> Iterator[Tuple[str, str]]:
+    """Same as :func:`walk` but yields the name and the path of each module."""
+    for entry in walk(path, rules):
+        yield entry.name, entry.path
+
+
+def searchPathModules(searchPath: str) -> Iterator[str]:
+    """Yields the path of every module of every package within the provided search path."""
+    for package in packages(searchPath):
+        for _, modulePath in walkModules(os.path.join(searchPath, package)):
+            yield modulePath
+
+
+def scanModules(path: str, rules: Optional[ignoreRules.WalkRules] = None) -> Iterator[os.DirEntry]:
+    """Same as :func:`walk` but yields the directory entries, their stat is free on Windows and cached else."""
+    for entry in walk(path, rules):
+        yield entry.dirEntry
+
+
+def scanSearchPath(searchPath: str) -> Iterator[os.DirEntry]:
+    """Yields the directory entry of every module of every package within the provided search path."""
+    for package in packages(searchPath):
+        yield from scanModules(os.path.join(searchPath, package))
+
+
+class ModuleTree:
+    """A cache of the folders walked to find the modules, shared by the package checkBoxes.
+
+    Each folder is listed once with :func:`os.scandir`, then only stat'ed: it's listed again once its modification
+    time changes, which happens when an entry is added, removed or renamed within it.
+    """
+
+    def __init__(self) -> None:
+        # The (mTime, entries) of each listed folder, by path. The ignore rules are applied when the folders are
+        # walked, a change of the config.json or of an ignore file doesn't change the folder.
+        self._folders = {}
+
+    def listFolder(self, path: str) -> List[FolderEntry]:
+        """Gets the entries of the provided folder, it's only listed again once its modification time changes."""
+        try:
+            mTime = os.stat(path).st_mtime_ns
+
+            cached = self._folders.get(path)
+            if cached is not None and cached[0] == mTime:
+                return cached[1]
+
+            # The directory entries are not kept, they would hold their stat.
+            entries = [entry._replace(dirEntry=None) for entry in _scanFolder(path)]
+
+        except OSError as error:
+            # A folder that can't be read is skipped, and listed again on the next walk.
+            LOGGER.debug("Cannot list {}: {}".format(path, error))
+            self._folders.pop(path, None)
+            return []
+
+        self._folders[path] = (mTime, entries)
+
+        return entries
+
+    def walkModules(self, path: str, rules: Optional[ignoreRules.WalkRules] = None) -> Iterator[Tuple[str, str]]:
+        """Same as :func:`walkModules`, the folders that have not changed since they were last listed are not read.
+
+        Parameters:
+            path: The path where to search the modules.
+            rules: The searched extensions and globs, the ones of the config.json if None.
+
+        Yields:
+            The name and the path of each module.
+        """
+        for entry in walk(path, rules, self.listFolder):
+            yield entry.name, entry.path
+
+    def clear(self) -> None:
+        """Forgets every listed folder."""
+        self._folders.clear()
+
+
+MODULE_TREE = ModuleTree()
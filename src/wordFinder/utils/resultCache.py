@@ -0,0 +1,290 @@
+"""An in-memory cache of the matches of the last searches, so a search run again only to display it with a smaller
+context reads no module.
+
+The matches are keyed by the query, the way it's matched, its maximum number of matches and the searched modules, they
+are checked against the size and the modification time of each module before they're used. They're stored with the
+context lines they were found with, any smaller context is sliced from them, see :func:`engine.withContext`. The least
+recently used searches are evicted once the cache outgrows its size cap.
+
+The same query with a larger context, or a query that narrows a cached one, see :meth:`SearchQuery.isNarrowerThan`,
+only scans the modules that matched it and the modules that have changed since, see :meth:`ResultCache.narrowedPaths`.
+"""
+import os
+import logging
+import threading
+from collections import OrderedDict
+from typing import List, Tuple, Optional, Hashable, NamedTuple, TYPE_CHECKING
+
+from wordFinder import constants
+from wordFinder import core
+from wordFinder.utils import sentenceProcess
+
+if TYPE_CHECKING:
+    from wordFinder import engine
+
+
+LOGGER = logging.getLogger(__name__)
+LOGGER.setLevel(20)
+
+# The approximate size of a match and of one of its lines besides their text, in bytes.
+MATCH_OVERHEAD = 200
+LINE_OVERHEAD = 100
+
+Fingerprint = Optional[Tuple[int, int]]
+
+_cache = None
+
+
+class CacheStats(NamedTuple):
+    """The counters of a :class:`ResultCache` since it was created."""
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+
+    def __str__(self) -> str:
+        return "result cache: {} hits, {} misses, {} evictions, {:.1f} MB".format(
+            self.hits, self.misses, self.evictions, self.size / 1024 / 1024
+        )
+
+
+class CacheEntry(NamedTuple):
+    """The matches of a search and the state of the modules they were found in."""
+    query: sentenceProcess.SearchQuery
+    fingerprints: Tuple[Fingerprint, ...]
+    numberOfExtraLine: int
+    matches: List['engine.Match']
+    skipped: List[Tuple[str, str]]
+    size: int
+    # False if the search stopped at its maximum number of matches, the modules after the last match were not scanned.
+    isComplete: bool = True
+
+
+def fingerprints(modulePaths: List[str]) -> Tuple[Fingerprint, ...]:
+    """Gets the (size, modification time) of each module, None for a module that can't be read."""
+    result = []
+
+    for modulePath in modulePaths:
+        try:
+            stat = os.stat(modulePath)
+        except OSError:
+            result.append(None)
+            continue
+
+        result.append((stat.st_size, stat.st_mtime_ns))
+
+    return tuple(result)
+
+
+def matchesSize(matches: List['engine.Match']) -> int:
+    """Gets the approximate memory used by the provided matches, in bytes."""
+    size = 0
+
+    for match in matches:
+        size += MATCH_OVERHEAD + len(match.path) + len(match.line)
+        size += sum(LINE_OVERHEAD + len(line) for _, line in match.before)
+        size += sum(LINE_OVERHEAD + len(line) for _, line in match.after)
+
+    return size
+
+
+class ResultCache:
+    """The matches of the last searches, the most recently used last."""
+
+    def __init__(self, maxSize: int) -> None:
+        """Initialisation of ResultCache.
+
+        Parameters:
+            maxSize: The size cap of the cache, in bytes, see :func:`matchesSize`.
+        """
+        self.maxSize = maxSize
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(
+            query: sentenceProcess.SearchQuery,
+            modulePaths: List[str],
+            maxMatches: int = 0,
+            matchesPerFile: int = 0,
+            maxFileSize: int = 0
+    ) -> Hashable:
+        """Gets the key of a search, the number of context lines is not part of it.
+
+        Parameters:
+            query: The compiled query.
+            modulePaths: The searched modules, in the order of the search.
+            maxMatches: The number of matches after which the search stops, 0 if it's not capped.
+            matchesPerFile: The number of matches after which the scan of a module stops, 0 if it's scanned to the end.
+            maxFileSize: The size from which a module is skipped, 0 if no module is skipped for its size.
+        """
+        return (
+            query.word, query.mode, query.ignoreCase, query.multiline, maxMatches, matchesPerFile, maxFileSize,
+            tuple(modulePaths)
+        )
+
+    def get(self, key: Hashable, numberOfExtraLine: int = 0) -> Optional[CacheEntry]:
+        """Gets the matches of a search, the modules are only checked with :func:`os.stat`.
+
+        Parameters:
+            key: The key of the search, see :meth:`key`.
+            numberOfExtraLine: The number of context lines to display, the matches are not used if they were stored
+                with less.
+
+        Returns:
+            The stored search, None if it's not cached or a module has changed since.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None or entry.numberOfExtraLine < numberOfExtraLine:
+                self.misses += 1
+                return None
+
+        # The last element of the key is the searched modules, they're stat'ed outside of the lock.
+        isCurrent = fingerprints(key[-1]) == entry.fingerprints
+
+        with self._lock:
+            if not isCurrent:
+                # Another thread may have stored a newer search meanwhile.
+                if self._entries.get(key) is entry:
+                    self._forget(key)
+                self.misses += 1
+                return None
+
+            if key in self._entries:
+                self._entries.move_to_end(key)
+
+            self.hits += 1
+
+        return entry
+
+    def narrowedPaths(
+            self,
+            query: sentenceProcess.SearchQuery,
+            modulePaths: List[str],
+            maxFileSize: int,
+            moduleFingerprints: Tuple[Fingerprint, ...]
+    ) -> Optional[List[str]]:
+        """Gets the modules that may match a query, from the most recent complete search over the same modules of
+        the same query, or of a query it narrows.
+
+        Parameters:
+            query: The compiled query.
+            modulePaths: The searched modules, in the order of the search.
+            maxFileSize: The size from which a module is skipped, see :meth:`key`.
+            moduleFingerprints: The current state of the modules, see :func:`fingerprints`.
+
+        Returns:
+            The modules that matched the cached search, were skipped by it or have changed since, in the order of the
+            search. None if no cached search can narrow the query, every module has to be scanned.
+        """
+        modulePaths = tuple(modulePaths)
+        queryKey = self.key(query, [])[:4]
+
+        with self._lock:
+            entries = [
+                (key, entry) for key, entry in reversed(self._entries.items())
+                if entry.isComplete and key[-2:] == (maxFileSize, modulePaths)
+                and (key[:4] == queryKey or query.isNarrowerThan(entry.query))
+            ]
+
+            if not entries:
+                return None
+
+            key, entry = entries[0]
+            self._entries.move_to_end(key)
+
+        # The skipped modules are scanned again, so they are reported again.
+        matchingPaths = {match.path for match in entry.matches}
+        matchingPaths.update(modulePath for modulePath, _ in entry.skipped)
+
+        return [
+            modulePath for modulePath, fingerprint, cachedFingerprint
+            in zip(modulePaths, moduleFingerprints, entry.fingerprints)
+            if modulePath in matchingPaths or fingerprint != cachedFingerprint
+        ]
+
+    def put(
+            self,
+            key: Hashable,
+            query: sentenceProcess.SearchQuery,
+            moduleFingerprints: Tuple[Fingerprint, ...],
+            numberOfExtraLine: int,
+            matches: List['engine.Match'],
+            skipped: List[Tuple[str, str]],
+            isComplete: bool = True
+    ) -> None:
+        """Stores the matches of a search that was not cancelled, the least recently used searches are evicted if the
+        cache outgrows its size cap.
+
+        Parameters:
+            key: The key of the search, see :meth:`key`.
+            query: The query of the search.
+            moduleFingerprints: The state of the modules before they were scanned, see :func:`fingerprints`.
+            numberOfExtraLine: The number of context lines of the matches.
+            matches: The matches of the search.
+            skipped: The (modulePath, reason) of the modules that were not searched.
+            isComplete: False if the search stopped at its maximum number of matches, it can't narrow another search.
+        """
+        size = matchesSize(matches)
+
+        with self._lock:
+            self._forget(key)
+
+            # A search bigger than the whole cache would evict everything else, it's not stored.
+            if size > self.maxSize:
+                return
+
+            self._entries[key] = CacheEntry(
+                query, moduleFingerprints, numberOfExtraLine, matches, skipped, size, isComplete
+            )
+            self._size += size
+
+            self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _forget(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+
+        if entry is not None:
+            self._size -= entry.size
+
+    def _evict(self) -> None:
+        """Removes the least recently used searches until the cache fits its size cap."""
+        while self._size > self.maxSize and self._entries:
+            _, entry = self._entries.popitem(last=False)
+            self._size -= entry.size
+            self.evictions += 1
+
+    @property
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(self.hits, self.misses, self.evictions, self._size)
+
+
+def getCache() -> ResultCache:
+    """Gets the result cache of the process, its size cap is read from the config.json, in megabytes."""
+    global _cache
+
+    maxSize = core.getConfigValueByName(constants.RESULT_CACHE_SIZE)
+    if maxSize is None:
+        maxSize = constants.DEFAULT_CONFIG[constants.RESULT_CACHE_SIZE]
+    maxSize = int(maxSize) * 1024 * 1024
+
+    if _cache is None:
+        _cache = ResultCache(maxSize)
+    else:
+        _cache.maxSize = maxSize
+
+    return _cache
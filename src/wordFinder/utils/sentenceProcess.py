@@ -1,58 +1,409 @@
 import re
+import html
+import bisect
+import functools
+import itertools
+from typing import List, Tuple, Optional, Union, Pattern, Callable
+
+try:
+    from re import _parser as sreParse
+except ImportError:
+    import sre_parse as sreParse
 
 from wordFinder.utils import syntaxColors
 
 
-def wordInLine(word: str, line: str, isLiteral: bool) -> bool:
-        """Gets if the provided line contains the provided word.
+# The number of lines scanned between two checks of a cancellation, a check per line would slow the scan down.
+CANCEL_CHECK_INTERVAL = 1024
+
+# The ASCII letters that also match a non-ASCII character when the case is ignored, like the KELVIN SIGN for "k".
+UNICODE_FOLDED_LETTERS = frozenset('iksIKS')
+
+
+class SearchQuery:
+    """The word to search and the way to search it, compiled once per search.
 
-        There is two ways to search the word, with a simple check or with a regex.
+    The :attr:`matchLine` method is picked at initialisation, the hot loop calls it for each line without rebuilding
+    any pattern.
+    """
+
+    LITERAL = 'literal'
+    WHOLE_WORD = 'wholeWord'
+    REGEX = 'regex'
+
+    def __init__(self, word: str, mode: str = LITERAL, ignoreCase: bool = False, multiline: bool = False) -> None:
+        """Initialisation of SearchQuery.
 
         Parameters:
-            isLiteral: If true, the method will search if the provided word is in the sentence, if false, the method will search the word using a regex.
-            word: The word to search.
-            line: The line that is used to search for the word.
+            word: The word, sentence or regular expression to search.
+            mode: :attr:`LITERAL` searches the word anywhere in the line, :attr:`WHOLE_WORD` searches it between
+                non-word characters, :attr:`REGEX` uses the word as a regular expression.
+            ignoreCase: If true, the case is ignored.
+            multiline: If true, the query runs over the whole module so a regular expression can span several lines,
+                ``^`` and ``$`` still match at each line.
 
-        Returns:
-            True if the line contains the word, else False.
+        Raises:
+            re.error: If the regular expression is not valid.
+            ValueError: If the mode is unknown.
         """
-        if isLiteral:
-            if word in line:
-                return True
+        if mode not in (self.LITERAL, self.WHOLE_WORD, self.REGEX):
+            raise ValueError("Unknown search mode: {}".format(mode))
 
+        self.word = word
+        self.mode = mode
+        self.ignoreCase = ignoreCase
+        self.multiline = multiline
+
+        if mode == self.REGEX:
+            source = word
+        elif mode == self.WHOLE_WORD:
+            source = r"(?<!\w)" + re.escape(word) + r"(?!\w)"
         else:
-            pattern = r"\b" + re.escape(word) + r"\b"
+            source = re.escape(word)
+
+        flags = re.MULTILINE
+        if ignoreCase:
+            flags |= re.IGNORECASE
+
+        self.pattern = re.compile(source, flags)
+
+        self.bytesPrefilter = self._bytesPrefilter()
+
+        # A plain substring check is several times faster than any regex, a whole word is only checked with the
+        # regex when the line contains it.
+        if mode == self.LITERAL and not ignoreCase:
+            self.matchLine = self._containsWord
+        elif mode == self.WHOLE_WORD and not ignoreCase:
+            self.matchLine = self._containsWholeWord
+        else:
+            self.matchLine = self.pattern.search
+
+    def __repr__(self) -> str:
+        return "SearchQuery({!r}, mode={!r}, ignoreCase={}, multiline={})".format(
+            self.word, self.mode, self.ignoreCase, self.multiline
+        )
+
+    def __reduce__(self):
+        # Rebuild the query from its arguments, the picked matcher is a bound method that can't be pickled.
+        return self.__class__, (self.word, self.mode, self.ignoreCase, self.multiline)
+
+    def requiredLiterals(self) -> List[str]:
+        """Gets the literals that any match of the query must contain.
+
+        For a regex, only the literal characters that follow each other are joined, everything else, a branch, a
+        character class or an optional group, ends the current literal. Some of the literals may be empty.
+        """
+        if self.mode != self.REGEX:
+            return [self.word]
+
+        literals = []
+        _literalRuns(sreParse.parse(self.word), literals)
+
+        return literals
+
+    def isNarrowerThan(self, previous: 'SearchQuery') -> bool:
+        """Gets if every module that matches this query provably matches the previous one, like a literal that is
+        extended, ``getConfig`` then ``getConfigValueByName``.
+
+        Only a previous literal is compared, this query must require a literal that contains it, with the same case
+        or the case folded as ASCII if the previous query ignores it.
+
+        Parameters:
+            previous: The query of the last search.
+        """
+        if previous.mode != self.LITERAL or not previous.word or '\n' in previous.word:
+            return False
+
+        ignoresCase = bool(self.pattern.flags & re.IGNORECASE)
+        literals = self.requiredLiterals()
+
+        if not previous.ignoreCase:
+            return not ignoresCase and any(previous.word in literal for literal in literals)
+
+        if not previous.word.isascii():
+            return False
+
+        word = previous.word.lower()
+
+        return any(literal.isascii() and word in literal.lower() for literal in literals)
+
+    def _bytesPrefilter(self) -> Optional['re.Pattern']:
+        """Compiles the longest required literal as a bytes pattern, to find the candidate lines in an undecoded module.
+
+        The case is folded as ASCII, so there is no prefilter for a query that ignores the case of non-ASCII characters,
+        or of a letter of :const:`UNICODE_FOLDED_LETTERS`.
+
+        Returns:
+            The UTF-8 pattern, None if the query has no usable literal.
+        """
+        literal = max(self.requiredLiterals(), key=len)
+
+        if not literal:
+            return None
+
+        if self.pattern.flags & re.IGNORECASE:
+            if not literal.isascii() or not UNICODE_FOLDED_LETTERS.isdisjoint(literal):
+                return None
+            return re.compile(re.escape(literal.encode('utf-8')), re.IGNORECASE)
+
+        return re.compile(re.escape(literal.encode('utf-8')))
+
+    def _containsWord(self, line: str) -> bool:
+        return self.word in line
+
+    def _containsWholeWord(self, line: str) -> bool:
+        return self.word in line and self.pattern.search(line) is not None
+
+    def matchingLineNumbers(
+            self,
+            lines: List[str],
+            maxCount: int = 0,
+            isCancelled: Optional[Callable[[], bool]] = None
+    ) -> List[int]:
+        """Gets the numbers of the lines that match the query.
+
+        Parameters:
+            lines: The lines of a module, with their line endings.
+            maxCount: If not 0, the scan stops once this number of matching lines is found.
+            isCancelled: If provided, polled every :const:`CANCEL_CHECK_INTERVAL` lines, the lines found so far are
+                returned once it returns True.
+
+        Returns:
+            The sorted numbers of the matching lines, starting at 1. In multiline mode, every line covered by a match
+            is a matching line.
+        """
+        if not self.multiline and not maxCount and isCancelled is None:
+            matchLine = self.matchLine
+            return [lineNumber for lineNumber, line in enumerate(lines, start=1) if matchLine(line)]
+
+        if not self.multiline:
+            return self._limitedMatchingLineNumbers(lines, maxCount, isCancelled)
+
+        lineEnds = list(itertools.accumulate(len(line) for line in lines))
+        lineNumbers = []
+
+        for match in self.pattern.finditer(''.join(lines)):
+            first = bisect.bisect_right(lineEnds, match.start()) + 1
+            last = bisect.bisect_right(lineEnds, max(match.start(), match.end() - 1)) + 1
+
+            if lineNumbers and first <= lineNumbers[-1]:
+                first = lineNumbers[-1] + 1
+
+            lineNumbers.extend(range(first, min(last, len(lines)) + 1))
+
+            if maxCount and len(lineNumbers) >= maxCount:
+                return lineNumbers[:maxCount]
+
+            if isCancelled is not None and isCancelled():
+                break
+
+        return lineNumbers
+
+    def _limitedMatchingLineNumbers(
+            self,
+            lines: List[str],
+            maxCount: int,
+            isCancelled: Optional[Callable[[], bool]]
+    ) -> List[int]:
+        """Gets the numbers of the matching lines chunk by chunk, see :meth:`matchingLineNumbers`."""
+        matchLine = self.matchLine
+        lineNumbers = []
+
+        for chunkStart in range(0, len(lines), CANCEL_CHECK_INTERVAL):
+            if isCancelled is not None and isCancelled():
+                break
+
+            chunk = lines[chunkStart:chunkStart + CANCEL_CHECK_INTERVAL]
 
-            if re.search(pattern, line):
-                return True
+            for lineNumber, line in enumerate(chunk, start=chunkStart + 1):
+                if matchLine(line):
+                    lineNumbers.append(lineNumber)
 
-        return False
+                    if len(lineNumbers) == maxCount:
+                        return lineNumbers
 
+        return lineNumbers
 
-def colorizeLine(line: str, wordToSearch: str) -> str:
+
+def _literalRuns(parsedPattern, runs: List[str]) -> None:
+    """Appends the literals that any match of the provided parsed pattern must contain to the runs.
+
+    See :meth:`SearchQuery.requiredLiterals`.
+    """
+    current = []
+
+    for opcode, argument in parsedPattern:
+        if opcode is sreParse.LITERAL:
+            current.append(chr(argument))
+            continue
+
+        runs.append(''.join(current))
+        current = []
+
+        # (group, addFlags, removeFlags, pattern) since Python 3.6, a group that changes the flags may ignore the case.
+        if opcode is sreParse.SUBPATTERN and not argument[1] and not argument[2]:
+            _literalRuns(argument[-1], runs)
+
+        elif opcode in (sreParse.MAX_REPEAT, sreParse.MIN_REPEAT) and argument[0] >= 1:
+            _literalRuns(argument[2], runs)
+
+    runs.append(''.join(current))
+
+
+def contextWindows(matchLineNumbers: List[int], lineCount: int, numberOfExtraLine: int) -> List[Tuple[int, int]]:
+    """Gets the ranges of lines to display around the provided matching lines.
+
+    The windows of two matches that overlap or touch each other are merged so a line is never displayed twice.
+
+    Parameters:
+        matchLineNumbers: The sorted numbers of the matching lines, starting at 1.
+        lineCount: The number of lines of the module.
+        numberOfExtraLine: The number of lines to display before and after each matching line.
+
+    Returns:
+        The (firstLineNumber, lastLineNumber) of each window, both included.
+    """
+    windows = []
+
+    for lineNumber in matchLineNumbers:
+        start = max(1, lineNumber - numberOfExtraLine)
+        end = min(lineCount, lineNumber + numberOfExtraLine)
+
+        if windows and start <= windows[-1][1] + 1:
+            windows[-1] = (windows[-1][0], max(windows[-1][1], end))
+            continue
+
+        windows.append((start, end))
+
+    return windows
+
+
+def contextBlocks(
+        lines: List[str],
+        matchLineNumbers: List[int],
+        numberOfExtraLine: int
+) -> List[List[Tuple[int, str, bool]]]:
+    """Splits the lines of a module into the blocks to display, see :func:`contextWindows`.
+
+    Parameters:
+        lines: The lines of the module.
+        matchLineNumbers: The sorted numbers of the matching lines, starting at 1.
+        numberOfExtraLine: The number of lines to display before and after each matching line.
+
+    Returns:
+        A list of blocks, each block holds the (lineNumber, line, isMatch) of its lines.
+    """
+    matches = set(matchLineNumbers)
+
+    return [
+        [(lineNumber, lines[lineNumber - 1], lineNumber in matches) for lineNumber in range(start, end + 1)]
+        for start, end in contextWindows(matchLineNumbers, len(lines), numberOfExtraLine)
+    ]
+
+
+# A regex word of the syntaxColors module that only matches one word, like r"\b(?P<str>str)\b".
+PLAIN_WORD_REGEX = re.compile(r'\\b\(\?P<(?P<group>\w+)>(?P<word>\w+)\)\\b')
+
+
+def _syntaxPattern() -> Tuple[Pattern, dict, dict]:
+    """Combines the words of the syntaxColors module in a single tokenizer.
+
+    Each identifier of a line is matched once by a ``\\w+`` alternative and its color is looked up by word, the
+    other targeted words are alternatives of their own.
+
+    Returns:
+        The pattern, the color of each word, and the color of each named group of the other alternatives.
+    """
+    wordColors = {}
+    groupColors = {}
+    alternatives = []
+
+    for word in syntaxColors.regexTargetedWords:
+        plainWord = PLAIN_WORD_REGEX.fullmatch(word.regex)
+
+        if plainWord is not None and plainWord.group('group') == word.matchingGroup:
+            wordColors[plainWord.group('word')] = word.color
+
+        # The arguments are painted as a region below the words, see colorizeLine.
+        elif word.matchingGroup != 'arguments':
+            alternatives.append('(?:{})'.format(word.regex))
+            groupColors[word.matchingGroup] = word.color
+
+    # The longest words first, "**kwargs" must win over "*args".
+    for index, (word, color) in enumerate(sorted(syntaxColors.targetedWords.items(), key=lambda item: -len(item[0]))):
+        if re.fullmatch(r'\w+', word):
+            wordColors[word] = color
+            continue
+
+        group = 'classic{}'.format(index)
+        alternatives.append('(?P<{}>{}{})'.format(group, re.escape(word), r'\b' if word[-1].isalnum() else ''))
+        groupColors[group] = color
+
+    alternatives.append(r'(?P<word>\w+)')
+
+    return re.compile('|'.join(alternatives)), wordColors, groupColors
+
+
+SYNTAX_PATTERN, WORD_COLORS, GROUP_COLORS = _syntaxPattern()
+
+ARGUMENTS_PATTERN = next(
+    re.compile(word.regex) for word in syntaxColors.regexTargetedWords if word.matchingGroup == 'arguments'
+)
+ARGUMENTS_COLOR = next(word.color for word in syntaxColors.regexTargetedWords if word.matchingGroup == 'arguments')
+
+# The number of colorized lines kept by colorizeLine.
+COLORIZED_LINE_CACHE_SIZE = 4096
+
+
+@functools.lru_cache(maxsize=COLORIZED_LINE_CACHE_SIZE)
+def colorizeLine(line: str, wordToSearch: Union[str, Pattern]) -> str:
     """Colorizes the provided line depending on the targets words from the syntaxColors module.
 
+    The line is tokenized once by the :data:`SYNTAX_PATTERN`, the colors are laid on the original line then each
+    run of a same color is escaped and wrapped in a single font tag, so a searched word like "font" can't break the
+    HTML. The result is cached per line and searched word.
+
     Parameters:
         line: The line where to search the word.
-        wordToSearch: the word to search in the :param:`line`.
+        wordToSearch: The word to search in the :param:`line`, or the compiled pattern of a :class:`SearchQuery`.
 
     Returns:
         A colored line in HTML format.
     """
-    coloredLine = line
+    if not line:
+        return line
 
-    for word in syntaxColors.regexTargetedWords:
-        matches = re.search(word.regex, coloredLine)
+    colors = [None] * len(line)
+
+    # From the lowest priority to the highest: the arguments, the syntax, the searched word.
+    for match in ARGUMENTS_PATTERN.finditer(line):
+        start, end = match.span('arguments')
+        colors[start:end] = [ARGUMENTS_COLOR] * (end - start)
+
+    for match in SYNTAX_PATTERN.finditer(line):
+        group = match.lastgroup
+        color = WORD_COLORS.get(match.group()) if group == 'word' else GROUP_COLORS[group]
+
+        if color is not None:
+            start, end = match.span(group)
+            colors[start:end] = [color] * (end - start)
+
+    if isinstance(wordToSearch, str):
+        wordToSearch = re.compile(re.escape(wordToSearch)) if wordToSearch else None
+
+    if wordToSearch is not None:
+        for match in wordToSearch.finditer(line):
+            start, end = match.span()
+            colors[start:end] = [syntaxColors.SEARCHED_WORD_COLOR] * (end - start)
 
-        if matches:
-            if matches.group(word.matchingGroup) != '':
-                coloredLine = coloredLine.replace(matches.group(word.matchingGroup), f"<font color={word.color}>{matches.group(word.matchingGroup)}</font>")
+    # The start of each run of a same color.
+    starts = [0] + [index for index in range(1, len(line)) if colors[index] is not colors[index - 1]]
+    coloredLine = []
 
-    for word, color in syntaxColors.targetedWords.items():
-        if word in line:
-            coloredLine = coloredLine.replace(word, f"<font color={color}>{word}</font>")
+    for start, end in zip(starts, starts[1:] + [len(line)]):
+        text = html.escape(line[start:end], quote=False)
+        color = colors[start]
 
-    if wordToSearch in coloredLine:
-        coloredLine = coloredLine.replace(wordToSearch, f"""<font color={"#5ffa16"}>{wordToSearch}</font>""")
+        coloredLine.append(text if color is None else '<font color={}>{}</font>'.format(color, text))
 
-    return coloredLine
+    return ''.join(coloredLine)
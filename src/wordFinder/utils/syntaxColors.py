@@ -1,14 +1,19 @@
-from dataclasses import dataclass
+from typing import NamedTuple
 
 
-@dataclass(frozen=True)
-class Matching:
-    """The purpose of this class is to keep a regex pattern, its matching group, and the associated color together in one place."""
+class Matching(NamedTuple):
+    """The purpose of this class is to keep a regex pattern, its matching group, and the associated color together in one place.
+
+    A NamedTuple rather than a frozen dataclass, the dataclasses module alone doubles the start time of the command line.
+    """
     regex: str
     matchingGroup: str
     color: str
 
 
+# The color of the searched word.
+SEARCHED_WORD_COLOR = "#5ffa16"
+
 # Classic matching.
 targetedWords = {
     "def": "#e35bba",
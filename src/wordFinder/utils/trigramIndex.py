@@ -0,0 +1,351 @@
+"""An on-disk trigram index of the modules within the search path.
+
+Each trigram of the lowered content of the modules points to the ids of the modules that contain it. A query is
+split into the literals any match must contain, only the modules that contain every trigram of these literals can
+match, so only them have to be read.
+
+The index is rebuilt from the Options menu or with::
+
+    python -m wordFinder.utils.trigramIndex <searchPath>
+"""
+import os
+import re
+import sys
+import pickle
+import logging
+from array import array
+from typing import List, Optional, Set, Callable, Dict
+
+from wordFinder import constants
+from wordFinder.utils import manifest
+from wordFinder.utils import moduleSearch
+from wordFinder.utils import moduleWalker
+from wordFinder.utils import sentenceProcess
+
+
+LOGGER = logging.getLogger(__name__)
+LOGGER.setLevel(20)
+
+_loadedIndex = None
+_loadedIndexMTime = None
+
+
+# Folds the lowered non-ASCII characters that the re module matches with an ASCII letter when the case is ignored:
+# the LONG S, the DOTLESS I and the COMBINING DOT ABOVE left by lowering the DOTTED I. The KELVIN SIGN lowers to "k".
+ASCII_FOLDING = str.maketrans({'\u017f': 's', '\u0131': 'i', '\u0307': None})
+
+
+def moduleTrigrams(text: str) -> Set[str]:
+    """Gets the trigrams a module is indexed under, the ones of its lowered text and of its folded text if they
+    differ, see :const:`ASCII_FOLDING`.
+    """
+    lowered = text.lower()
+    grams = trigrams(lowered)
+
+    if not lowered.isascii():
+        grams.update(trigrams(lowered.translate(ASCII_FOLDING)))
+
+    return grams
+
+
+def trigrams(text: str) -> Set[str]:
+    """Gets the distinct trigrams of the provided text."""
+    return {text[index:index + 3] for index in range(len(text) - 2)}
+
+
+def requiredLiterals(query: sentenceProcess.SearchQuery) -> Optional[List[str]]:
+    """Gets the lowered literals that any line matching the provided query must contain.
+
+    Returns:
+        The literals long enough to select candidates, None if the index can't narrow the query.
+    """
+    literals = [literal.lower() for literal in query.requiredLiterals() if len(literal) >= 3]
+
+    # The flags of the pattern hold an inline (?i) of a regex as well.
+    if query.pattern.flags & re.IGNORECASE and not all(literal.isascii() for literal in literals):
+        # The lowered index doesn't follow the case folding of the re module for every non-ASCII character.
+        return None
+
+    return literals or None
+
+
+class TrigramIndex:
+    """The trigram index of the modules within a search path.
+
+    The index is updated in place from a :class:`manifest.ManifestDiff`, a changed or deleted module keeps its id
+    and its postings but is no longer referenced by :attr:`pathIds`, so it can't be a candidate anymore. Once these
+    stale ids outnumber the live ones, the index is rebuilt.
+    """
+
+    VERSION = 4
+
+    def __init__(
+            self,
+            root: str,
+            paths: List[Optional[str]],
+            postings: Dict[str, array],
+            moduleManifest: manifest.Manifest
+    ) -> None:
+        """Initialisation of TrigramIndex.
+
+        Parameters:
+            root: The indexed search path.
+            paths: The path of each indexed module, the id of a module is its position in this list, the id of a
+                changed or deleted module is set to None.
+            postings: The sorted ids of the modules that contain each trigram.
+            moduleManifest: The fingerprint of each indexed module when it was read.
+        """
+        self.root = root
+        self.paths = paths
+        self.postings = postings
+        self.manifest = moduleManifest
+
+        self.pathIds = {modulePath: moduleId for moduleId, modulePath in enumerate(paths) if modulePath is not None}
+
+    @classmethod
+    def build(cls, root: str, progress: Optional[Callable[[int, int], None]] = None) -> 'TrigramIndex':
+        """Reads every module within the provided search path and indexes its trigrams.
+
+        Parameters:
+            root: The search path to index.
+            progress: If provided, called with the number of indexed modules and the total number of modules.
+        """
+        index = cls(root, [], {}, manifest.Manifest())
+        modulePaths = list(moduleWalker.searchPathModules(root))
+
+        for indexedCount, modulePath in enumerate(modulePaths, start=1):
+            index.addModule(modulePath)
+
+            if progress is not None:
+                progress(indexedCount, len(modulePaths))
+
+        return index
+
+    @property
+    def staleCount(self) -> int:
+        """The number of ids that no longer point to a module."""
+        return len(self.paths) - len(self.pathIds)
+
+    def addModule(self, modulePath: str) -> None:
+        """Reads the provided module and indexes its trigrams under a new id."""
+        try:
+            with open(modulePath, 'rb') as reader:
+                content = reader.read()
+
+        except OSError:
+            LOGGER.debug("Cannot index {}".format(modulePath))
+            return
+
+        moduleId = len(self.paths)
+        self.paths.append(modulePath)
+        self.pathIds[modulePath] = moduleId
+
+        fingerprint = manifest.readFingerprint(modulePath, content)
+        if fingerprint is not None:
+            self.manifest.set(modulePath, fingerprint)
+
+        postings = self.postings
+        # Decoded like the search decodes it, a Latin-1 or UTF-16 module is a candidate of its own words.
+        encoding = moduleSearch.sniffEncoding(content[:moduleSearch.SNIFF_SIZE]) or 'utf-8'
+        for trigram in moduleTrigrams(moduleSearch.decodeModule(content, encoding)):
+            posting = postings.get(trigram)
+            if posting is None:
+                posting = postings[trigram] = array('I')
+            posting.append(moduleId)
+
+    def removeModule(self, modulePath: str) -> None:
+        """Forgets the provided module, its postings are left until the next rebuild."""
+        moduleId = self.pathIds.pop(modulePath, None)
+
+        if moduleId is not None:
+            self.paths[moduleId] = None
+
+        self.manifest.remove(modulePath)
+
+    def update(self, newer: manifest.Manifest) -> manifest.ManifestDiff:
+        """Reindexes the modules that have been added or changed since the index was built, forgets the deleted ones.
+
+        Parameters:
+            newer: The manifest of the search path as it is now.
+
+        Returns:
+            The modules that have been reprocessed.
+        """
+        diff = self.manifest.diff(newer)
+
+        for modulePath in diff.deleted + diff.changed:
+            self.removeModule(modulePath)
+
+        for modulePath in diff.changed + diff.added:
+            self.addModule(modulePath)
+
+        return diff
+
+    def save(self, path: str) -> None:
+        """Writes the index to the provided path, the previous index is replaced only once the new one is written."""
+        temporaryPath = path + '.tmp'
+
+        with open(temporaryPath, 'wb') as writer:
+            pickle.dump(
+                (self.VERSION, self.root, self.paths, self.postings, self.manifest.fingerprints),
+                writer,
+                protocol=pickle.HIGHEST_PROTOCOL
+            )
+
+        os.replace(temporaryPath, path)
+
+    @classmethod
+    def load(cls, path: str) -> Optional['TrigramIndex']:
+        """Reads the index stored at the provided path.
+
+        Returns:
+            The index, None if the file is missing or was written by another version.
+        """
+        try:
+            with open(path, 'rb') as reader:
+                data = pickle.load(reader)
+
+        except (OSError, EOFError, ValueError, pickle.UnpicklingError):
+            return None
+
+        if data[0] != cls.VERSION:
+            return None
+
+        _, root, paths, postings, fingerprints = data
+
+        return cls(root, paths, postings, manifest.Manifest(fingerprints))
+
+    def candidateIds(self, literals: List[str]) -> Set[int]:
+        """Gets the ids of the modules that contain every trigram of the provided literals."""
+        grams = set()
+        for literal in literals:
+            grams.update(trigrams(literal))
+
+        postings = sorted((self.postings.get(gram, ()) for gram in grams), key=len)
+
+        # Start from the rarest trigram, the intersection can only shrink.
+        ids = set(postings[0])
+        for posting in postings[1:]:
+            if not ids:
+                break
+            ids.intersection_update(posting)
+
+        return ids
+
+    def candidatePaths(self, query: sentenceProcess.SearchQuery, modulePaths: List[str]) -> List[str]:
+        """Filters the provided modules down to the ones that may contain the query, no module is stat'ed.
+
+        The modules that are not indexed are always kept, they may have been created after the index. A module
+        edited since it was indexed may be missing, see :meth:`changedPaths`.
+
+        Parameters:
+            query: The compiled query to search.
+            modulePaths: The modules to filter.
+
+        Returns:
+            The candidate modules, in the order of the provided modules.
+        """
+        literals = requiredLiterals(query)
+
+        if literals is None:
+            return modulePaths
+
+        candidates = self.candidateIds(literals)
+        pathIds = self.pathIds
+
+        return [
+            modulePath for modulePath in modulePaths
+            if pathIds.get(modulePath) in candidates or modulePath not in pathIds
+        ]
+
+    def changedPaths(self, modulePaths: List[str]) -> List[str]:
+        """Gets the indexed modules whose size or modification time has changed since they were indexed, each of
+        them is stat'ed, see :meth:`manifest.Manifest.isCurrent`.
+
+        Parameters:
+            modulePaths: The modules to check, the ones that are not indexed are ignored.
+        """
+        pathIds = self.pathIds
+
+        return [
+            modulePath for modulePath in modulePaths
+            if modulePath in pathIds and not self.manifest.isCurrent(modulePath)
+        ]
+
+
+def _storeIndex(index: TrigramIndex) -> None:
+    """Saves the provided index and keeps it as the loaded one."""
+    global _loadedIndex, _loadedIndexMTime
+
+    index.save(constants.INDEX_PATH)
+
+    _loadedIndex = index
+    _loadedIndexMTime = os.stat(constants.INDEX_PATH).st_mtime_ns
+
+
+def getIndex(searchPath: str) -> Optional[TrigramIndex]:
+    """Gets the stored index if it was built for the provided search path, it's kept in memory until it's rebuilt.
+
+    Parameters:
+        searchPath: The current search path.
+    """
+    global _loadedIndex, _loadedIndexMTime
+
+    try:
+        mTime = os.stat(constants.INDEX_PATH).st_mtime_ns
+    except OSError:
+        return None
+
+    if _loadedIndex is None or _loadedIndexMTime != mTime:
+        _loadedIndex = TrigramIndex.load(constants.INDEX_PATH)
+        _loadedIndexMTime = mTime
+
+    if _loadedIndex is None or _loadedIndex.root != searchPath:
+        return None
+
+    return _loadedIndex
+
+
+def rebuildIndex(searchPath: str, progress: Optional[Callable[[int, int], None]] = None) -> TrigramIndex:
+    """Builds the index of the provided search path and stores it next to the config.json."""
+    index = TrigramIndex.build(searchPath, progress)
+    _storeIndex(index)
+
+    LOGGER.info("{} modules indexed in {}".format(len(index.pathIds), constants.INDEX_PATH))
+
+    return index
+
+
+def updateIndex(searchPath: str, newer: manifest.Manifest) -> Optional[manifest.ManifestDiff]:
+    """Brings the stored index of the provided search path up to date, only the modules that differ are read.
+
+    Parameters:
+        searchPath: The indexed search path.
+        newer: The manifest of the search path as it is now.
+
+    Returns:
+        The reprocessed modules, None if the search path is not indexed.
+    """
+    index = getIndex(searchPath)
+
+    if index is None:
+        return None
+
+    diff = index.update(newer)
+
+    if index.staleCount > len(index.pathIds):
+        index = rebuildIndex(searchPath)
+
+    elif diff:
+        _storeIndex(index)
+
+    LOGGER.debug("Index updated: {} added, {} changed, {} deleted".format(*map(len, diff)))
+
+    return diff
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 2 or not os.path.isdir(sys.argv[1]):
+        sys.exit("Usage: python -m wordFinder.utils.trigramIndex <searchPath>")
+
+    print("{} modules indexed".format(len(rebuildIndex(sys.argv[1]).pathIds)))
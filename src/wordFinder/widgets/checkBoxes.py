@@ -1,11 +1,11 @@
 import os
 import logging
-from typing import Mapping, Union, Any
+from typing import Mapping, Union, Any, Dict
 from functools import partial
 
 from PySide2 import QtCore, QtWidgets, QtGui
 
-from wordFinder import constants
+from wordFinder.utils import moduleWalker
 
 
 LOGGER = logging.getLogger(__name__)
@@ -46,16 +46,40 @@ class AbstractPackageCheckBox(QtWidgets.QCheckBox):
         super().__init__(text, parent)
 
         self.path = path
-        self.modules = {}
+
+        # The modules picked in the module window, None until the window is opened.
+        self.selectedModules = None
 
         self._connectUi()
-        self.getModules(self.path)
 
         self.setStyleSheet(self.STYLESHEET)
 
     def _connectUi(self):
         self.onRightClick.connect(self.openModuleWindow)
 
+    @property
+    def modules(self) -> Dict[str, str]:
+        """The path of the modules of the package by their "/" separated path within the package, they're listed
+        when the package is searched, not when the checkBox is created.
+        """
+        if self.selectedModules is not None:
+            return self.selectedModules
+
+        return self.getModules(self.path)
+
+    def getModules(self, path: str) -> Dict[str, str]:
+        """Gets the modules within the provided path, by their "/" separated path within it."""
+        return {}
+
+    def forgetDeletedModules(self) -> None:
+        """Removes the modules that no longer exist from the modules picked in the module window."""
+        if self.selectedModules is None:
+            return
+
+        for module, modulePath in list(self.selectedModules.items()):
+            if not os.path.isfile(modulePath):
+                self.selectedModules.pop(module)
+
     def enterEvent(self, event: QtCore.QEvent) -> None:
         self.setProperty('hover', True)
         self.style().polish(self)
@@ -83,39 +107,42 @@ class AbstractPackageCheckBox(QtWidgets.QCheckBox):
         globalPos = QtGui.QCursor.pos()
 
         # Reset the modules.
-        self.getModules(self.path)
+        self.selectedModules = None
 
         self.moduleWindow = CheckBoxModulesWindow(self.modules)
         self.moduleWindow.move(globalPos)
         self.moduleWindow.show()
 
         # Copy the checked modules to update the list.
-        self.modules = self.moduleWindow.activatedModules
+        self.selectedModules = self.moduleWindow.activatedModules
 
 
 class LocalPackageCheckBox(AbstractPackageCheckBox):
 
-    def getModules(self, path: str) -> None:
-        """Get the module within the provided path.
+    def getModules(self, path: str) -> Dict[str, str]:
+        """Get the module within the provided path, the folders are read from the shared
+        :data:`moduleWalker.MODULE_TREE`, only the ones that have changed are listed again.
 
         Parameters:
             path: The path where to search the modules.
-        """
-        for module in os.listdir(path):
-            modulePath = os.path.join(path, module)
 
-            if os.path.isdir(modulePath) and module not in constants.EXCLUDED_DIRECTORIES:
-                self.getModules(modulePath)
+        Returns:
+            The path of the modules by their "/" separated path within the provided path, two modules of the same
+            name in different folders are both kept.
+        """
+        modules = {
+            os.path.relpath(modulePath, path).replace(os.sep, '/'): modulePath
+            for _, modulePath in moduleWalker.MODULE_TREE.walkModules(path)
+        }
 
-            if module.rpartition('.')[-1] == 'py' and module not in constants.EXCLUDED_MODULES:
-                self.modules[module] = modulePath
+        LOGGER.debug("Modules from PackageCheckBox: {}".format(modules))
 
-        LOGGER.debug("Modules from PackageCheckBox: {}".format(self.modules))
+        return modules
 
 
 class GitHubPackageCheckBox(AbstractPackageCheckBox):
     """This class handle the Git part."""
-    def getModules(self, path: str) -> None:
+    def getModules(self, path: str) -> Dict[str, str]:
         """Get the module within the provided path.
 
         Parameters:
@@ -124,7 +151,7 @@ class GitHubPackageCheckBox(AbstractPackageCheckBox):
         Notes:
             WIP, this feature is not implemented yet.
         """
-        ...
+        return {}
 
 
 class CheckBoxModulesWindow(QtWidgets.QWidget):
@@ -0,0 +1,240 @@
+import html
+from array import array
+from typing import List, Tuple, Optional, Any
+
+from PySide2 import QtCore, QtWidgets, QtGui
+
+from wordFinder import engine
+from wordFinder.utils import sentenceProcess
+
+# The kind of each row of a ResultStore.
+CONTEXT = 0
+MATCH = 1
+SEPARATOR = 2
+MESSAGE = 3
+
+HTML_ROLE = QtCore.Qt.UserRole + 1
+
+
+class ResultStore:
+    """The rows of a search output, kept in flat arrays rather than one object or one html string per row.
+
+    The module names are stored once and referenced by id, only the text of the lines is kept per row.
+    """
+
+    def __init__(self) -> None:
+        self.moduleNames = []
+        self._moduleIds = {}
+
+        self.rowModuleIds = array('I')
+        self.lineNumbers = array('I')
+        self.kinds = array('B')
+        self.lines = []
+
+        self.matchCount = 0
+
+        self._lastMatch = None
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def _appendRow(self, moduleId: int, lineNumber: int, line: str, kind: int) -> None:
+        self.rowModuleIds.append(moduleId)
+        self.lineNumbers.append(lineNumber)
+        self.kinds.append(kind)
+        self.lines.append(line)
+
+    def matchRows(self, moduleName: str, match: engine.Match, showContext: bool) -> List[Tuple[str, int, str, int]]:
+        """Gets the rows of a match, an empty row is put before it if it doesn't continue the previous block.
+
+        The rows are not appended, see :meth:`appendRows`.
+
+        Parameters:
+            moduleName: The name to display before each line.
+            match: The match to display, with its context lines.
+            showContext: If true, the blocks are separated by an empty row.
+        """
+        rows = []
+
+        isNewBlock = self._lastMatch is None or self._lastMatch.path != match.path \
+            or match.firstLineNumber != self._lastMatch.lastLineNumber + 1
+        if showContext and isNewBlock and self._lastMatch is not None:
+            rows.append(('', 0, '', SEPARATOR))
+
+        rows.extend((moduleName, lineNumber, line, CONTEXT) for lineNumber, line in match.before)
+        rows.append((moduleName, match.lineNumber, match.line, MATCH))
+        rows.extend((moduleName, lineNumber, line, CONTEXT) for lineNumber, line in match.after)
+
+        self._lastMatch = match
+
+        return rows
+
+    def appendRows(self, rows: List[Tuple[str, int, str, int]]) -> None:
+        """Appends the (moduleName, lineNumber, line, kind) of each row."""
+        for moduleName, lineNumber, line, kind in rows:
+            moduleId = self._moduleIds.get(moduleName)
+            if moduleId is None:
+                moduleId = self._moduleIds[moduleName] = len(self.moduleNames)
+                self.moduleNames.append(moduleName)
+
+            self._appendRow(moduleId, lineNumber, line, kind)
+            self.matchCount += kind == MATCH
+
+    def appendMessage(self, text: str) -> None:
+        """Appends a row of plain text."""
+        self._appendRow(0, 0, text, MESSAGE)
+
+    def row(self, index: int) -> Tuple[str, int, str, int]:
+        """Gets the (moduleName, lineNumber, line, kind) of the provided row."""
+        kind = self.kinds[index]
+        moduleName = self.moduleNames[self.rowModuleIds[index]] if kind < SEPARATOR else ''
+
+        return moduleName, self.lineNumbers[index], self.lines[index], kind
+
+
+class ResultModel(QtCore.QAbstractListModel):
+    """Exposes a :class:`ResultStore` to a view, the html of a row is only built when the row is painted."""
+
+    def __init__(self, parent: Optional[QtCore.QObject] = None) -> None:
+        super().__init__(parent)
+
+        self.store = ResultStore()
+        self.query = None
+        self.showContext = False
+        self.useSyntaxColor = False
+
+    def reset(
+            self,
+            query: Optional[sentenceProcess.SearchQuery] = None,
+            showContext: bool = False,
+            useSyntaxColor: bool = False
+    ) -> None:
+        """Removes every row and sets how the next rows are displayed.
+
+        Parameters:
+            query: The searched query, its matches are highlighted in the matching lines.
+            showContext: If true, the blocks are separated by an empty row.
+            useSyntaxColor: If true, the matching lines will be colored, is false, they will be white.
+        """
+        self.beginResetModel()
+        self.store = ResultStore()
+        self.query = query
+        self.showContext = showContext
+        self.useSyntaxColor = useSyntaxColor
+        self.endResetModel()
+
+    def setSyntaxColor(self, useSyntaxColor: bool) -> None:
+        """Colors the matching lines or not, the rows are only painted again, see :meth:`rowHtml`."""
+        if useSyntaxColor == self.useSyntaxColor:
+            return
+
+        self.useSyntaxColor = useSyntaxColor
+
+        if len(self.store):
+            self.dataChanged.emit(self.index(0), self.index(len(self.store) - 1), [HTML_ROLE])
+
+    def appendMatches(self, matches: List[Tuple[str, engine.Match]]) -> None:
+        """Appends a batch of matches, the view is notified once for the whole batch.
+
+        Parameters:
+            matches: The (moduleName, match) of each match.
+        """
+        rows = [row for moduleName, match in matches for row in self.store.matchRows(moduleName, match, self.showContext)]
+
+        if not rows:
+            return
+
+        first = len(self.store)
+
+        self.beginInsertRows(QtCore.QModelIndex(), first, first + len(rows) - 1)
+        self.store.appendRows(rows)
+        self.endInsertRows()
+
+    def appendMessage(self, text: str) -> None:
+        """Appends a row of plain text."""
+        row = len(self.store)
+
+        self.beginInsertRows(QtCore.QModelIndex(), row, row)
+        self.store.appendMessage(text)
+        self.endInsertRows()
+
+    @property
+    def matchCount(self) -> int:
+        return self.store.matchCount
+
+    def rowCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.store)
+
+    def data(self, index: QtCore.QModelIndex, role: int = QtCore.Qt.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+
+        moduleName, lineNumber, line, kind = self.store.row(index.row())
+
+        if role == HTML_ROLE:
+            return self.rowHtml(moduleName, lineNumber, line, kind)
+
+        if role in (QtCore.Qt.DisplayRole, QtCore.Qt.ToolTipRole):
+            if kind >= SEPARATOR:
+                return line
+
+            return "{} -> line {} -> {}".format(QtGui.QTextDocumentFragment.fromHtml(moduleName).toPlainText(), lineNumber, line)
+
+        return None
+
+    def rowHtml(self, moduleName: str, lineNumber: int, line: str, kind: int) -> str:
+        """Formats a row the way it's painted, the syntax colors are only applied here, see
+        :func:`sentenceProcess.colorizeLine`.
+        """
+        if kind == SEPARATOR:
+            return ''
+
+        if kind == MESSAGE:
+            return html.escape(line)
+
+        if kind == CONTEXT:
+            return "<font color='grey'>{}</font> <span>&#8594;</span> <font color='grey'>line {}</font> <span>&#8594;</span> <font color='grey'>{}</font>".format(moduleName, lineNumber, html.escape(line, quote=False))
+
+        # Colorize the line dependent on the syntax.
+        if self.useSyntaxColor and self.query is not None:
+            processedLine = sentenceProcess.colorizeLine(line, self.query.pattern)
+        else:
+            processedLine = html.escape(line, quote=False)
+
+        return "<font color=#40D139>{}</font> <span>&#8594;</span> <font color=#40D139>line {}</font> <span>&#8594;</span> {}".format(
+            moduleName,
+            lineNumber,
+            processedLine
+        )
+
+
+class ResultDelegate(QtWidgets.QStyledItemDelegate):
+    """Paints the html of a row, only the rows in the viewport are ever formatted."""
+
+    def __init__(self, parent: Optional[QtCore.QObject] = None) -> None:
+        super().__init__(parent)
+
+        self._document = QtGui.QTextDocument(self)
+        self._document.setDocumentMargin(0)
+
+    def paint(self, painter: QtGui.QPainter, option: QtWidgets.QStyleOptionViewItem, index: QtCore.QModelIndex) -> None:
+        options = QtWidgets.QStyleOptionViewItem(option)
+        self.initStyleOption(options, index)
+        options.text = ''
+
+        # The background and the selection.
+        style = options.widget.style() if options.widget else QtWidgets.QApplication.style()
+        style.drawControl(QtWidgets.QStyle.CE_ItemViewItem, options, painter, options.widget)
+
+        self._document.setDefaultFont(options.font)
+        self._document.setHtml(index.data(HTML_ROLE))
+
+        painter.save()
+        painter.translate(options.rect.topLeft())
+        painter.setClipRect(0, 0, options.rect.width(), options.rect.height())
+        self._document.drawContents(painter)
+        painter.restore()
+
+    def sizeHint(self, option: QtWidgets.QStyleOptionViewItem, index: QtCore.QModelIndex) -> QtCore.QSize:
+        # Every row is a single line, the view uses uniform item sizes.
+        return QtCore.QSize(option.rect.width(), option.fontMetrics.height() + 4)
@@ -1,16 +1,20 @@
 import os
 import logging
-from typing import Optional, List, Union, Generator
+from typing import Optional, List, Union, Generator, Tuple
 
 from PySide2 import QtCore, QtWidgets, QtGui
 
-import core
+from wordFinder import core
+from wordFinder import engine
 from wordFinder.widgets import checkBoxes
-from constants import COLUMN_COUNT
+from wordFinder.widgets import workers
+from wordFinder.widgets import results
 from wordFinder.utils import wordFinderUtils
 from wordFinder.utils import sentenceProcess
+from wordFinder.utils import moduleSearch
+from wordFinder.utils import moduleWalker
+from wordFinder.utils import resultCache
 from wordFinder import constants
-from wordFinder.gitHub import auth
 
 
 LOGGER = logging.getLogger(__name__)
@@ -58,7 +62,7 @@ class PushButton(QtWidgets.QPushButton):
         return QtCore.QSize(230, 25)
 
 
-class OutputWidget(QtWidgets.QPlainTextEdit):
+class OutputWidget(QtWidgets.QListView):
 
     STYLESHEET = \
         """
@@ -66,10 +70,44 @@ class OutputWidget(QtWidgets.QPlainTextEdit):
         """
 
     def __init__(self):
-        """This widget is a classic QPlainTextEdit with a minimum size hint to output the founded sentence."""
+        """This widget outputs the founded sentences, the rows are stored in a :class:`results.ResultModel` and only
+        the visible ones are formatted, by a :class:`results.ResultDelegate`.
+        """
         super().__init__()
+
+        self.results = results.ResultModel(self)
+        self.setModel(self.results)
+        self.setItemDelegate(results.ResultDelegate(self))
+
+        self.setUniformItemSizes(True)
+        self.setSelectionMode(QtWidgets.QAbstractItemView.ExtendedSelection)
         self.setStyleSheet(self.STYLESHEET)
 
+    def clear(
+            self,
+            query: Optional[sentenceProcess.SearchQuery] = None,
+            showContext: bool = False,
+            useSyntaxColor: bool = False
+    ) -> None:
+        """Removes the displayed rows, see :meth:`results.ResultModel.reset`."""
+        self.results.reset(query, showContext, useSyntaxColor)
+
+    def setSyntaxColor(self, useSyntaxColor: bool) -> None:
+        """Colors the displayed matching lines or not, see :meth:`results.ResultModel.setSyntaxColor`."""
+        self.results.setSyntaxColor(useSyntaxColor)
+
+    def appendMatches(self, matches: List[Tuple[str, engine.Match]]) -> None:
+        """Appends a batch of (moduleName, match), see :meth:`results.ResultModel.appendMatches`."""
+        self.results.appendMatches(matches)
+
+    def appendPlainText(self, text: str) -> None:
+        self.results.appendMessage(text)
+
+    @property
+    def matchCount(self) -> int:
+        """The number of matching lines displayed."""
+        return self.results.matchCount
+
     def minimumSizeHint(self):
         return QtCore.QSize(300, 350)
 
@@ -110,7 +148,7 @@ class ModuleLayoutWindow(QtWidgets.QDialog):
         self.okButton.clicked.connect(self.accept)
         self.cancelButton.clicked.connect(self.reject)
 
-    @wordFinderUtils.storeConfig(COLUMN_COUNT)
+    @wordFinderUtils.storeConfig(constants.COLUMN_COUNT)
     def getColumnSliderValue(self, *args) -> int:
         """Gets the value of the :attr:`columnsSlider` and sets it to the :attr:`columnCount`.
 
@@ -214,6 +252,9 @@ class AbstractModuleWidget(QtWidgets.QWidget):
     }
     """
 
+    # The delay between two refreshes of the hit counter, in milliseconds.
+    MATCH_COUNT_INTERVAL = 200
+
     def __init__(self, parent: Optional[QtWidgets.QWidget]=None):
         """This is a metaclass for the LocalModuleWidget and the GitHubModuleWidget.
 
@@ -225,6 +266,13 @@ class AbstractModuleWidget(QtWidgets.QWidget):
 
         self.allCheckBoxes = []
 
+        self._searchWorker = None
+        self._searchWord = None
+
+        # The hit counter is refreshed on a timer while a search runs, not for every match.
+        self.matchCountTimer = QtCore.QTimer(self)
+        self.matchCountTimer.setInterval(self.MATCH_COUNT_INTERVAL)
+
         self._buildUi()
         self._setupUi()
         self._connectUi()
@@ -238,7 +286,10 @@ class AbstractModuleWidget(QtWidgets.QWidget):
         self.checkAllLayout = QtWidgets.QHBoxLayout()
         self.modulesWidgets = QtWidgets.QWidget()
 
+        self.searchStatusLayout = QtWidgets.QHBoxLayout()
         self.matchingCount = QtWidgets.QLabel()
+        self.searchProgress = QtWidgets.QProgressBar()
+        self.cancelSearchButton = PushButton("Cancel")
 
         self.output = OutputWidget()
 
@@ -253,7 +304,11 @@ class AbstractModuleWidget(QtWidgets.QWidget):
         self.checkAllLayout.addWidget(self.checkAllButton)
         self.checkAllLayout.addWidget(self.uncheckAllButton)
 
-        self.mainLayout.addWidget(self.matchingCount)
+        self.mainLayout.addLayout(self.searchStatusLayout)
+        self.searchStatusLayout.addWidget(self.matchingCount)
+        self.searchStatusLayout.addStretch()
+        self.searchStatusLayout.addWidget(self.searchProgress)
+        self.searchStatusLayout.addWidget(self.cancelSearchButton)
         self.mainLayout.addWidget(self.output)
 
         self.checkAllLayout.addStretch()
@@ -261,12 +316,17 @@ class AbstractModuleWidget(QtWidgets.QWidget):
         self.checkAllButton.setFocusPolicy(QtCore.Qt.NoFocus)
         self.uncheckAllButton.setFocusPolicy(QtCore.Qt.NoFocus)
         self.output.setFont(QtGui.QFont('Arial', 13))
-        self.output.setReadOnly(True)
         self.matchingCount.setStyleSheet("background-color: transparent;")
+        self.searchProgress.setFormat("%v / %m files")
+        self.searchProgress.hide()
+        self.cancelSearchButton.setFocusPolicy(QtCore.Qt.NoFocus)
+        self.cancelSearchButton.hide()
 
     def _connectUi(self):
         self.checkAllButton.clicked.connect(self.checkAllCheckBoxes)
         self.uncheckAllButton.clicked.connect(self.unCheckAllCheckBoxes)
+        self.cancelSearchButton.clicked.connect(self.cancelSearch)
+        self.matchCountTimer.timeout.connect(self.updateMatchingCount)
 
     @property
     def searchPath(self):
@@ -283,13 +343,6 @@ class AbstractModuleWidget(QtWidgets.QWidget):
         then, adds it to the allCheckBoxes list.
         """
         self.clearLayout()
-        # Get how many columns has been set from the config.json
-        columnMax = core.getConfigValueByName(COLUMN_COUNT)
-        row = 0
-        column = 0
-
-        if not self.modules():
-            return
 
         for module in self.modules():
             checkBox = checkBoxes.LocalPackageCheckBox(module, os.path.join(self.searchPath, module))
@@ -298,20 +351,39 @@ class AbstractModuleWidget(QtWidgets.QWidget):
             if self.isCheckBoxPreviouslyChecked(checkBox):
                 checkBox.setChecked(True)
 
-            self.moduleLayout.addWidget(checkBox, row, column)
             self.allCheckBoxes.append(checkBox)
 
-            column += 1
-            if column == columnMax:
-                column = 0
-                row += 1
+        self.arrangeCheckBoxes()
 
     def modules(self) -> Generator:
         """Yields the module name within the :attr:`searchPath` folder."""
-        for repo in auth.gitHubRepositories():
-            if repo not in constants.EXCLUDED_MODULES:
+        # PyGithub and its HTTP stack are only imported once the GitHub tab is used.
+        from wordFinder.gitHub import auth
+
+        with auth.API_CALLS.measure("List the GitHub repositories"):
+            repositories = auth.gitHubRepositories()
+
+        for repo in repositories:
+            if repo.full_name not in constants.EXCLUDED_MODULES:
                 yield repo.full_name
 
+    def arrangeCheckBoxes(self) -> None:
+        """Places the :attr:`allCheckBoxes` in the grid with the column count of the config.json, the modules are
+        not read again.
+        """
+        # Get how many columns has been set from the config.json, a missing or zero count falls back to the default.
+        columnMax = core.getConfigValueByName(constants.COLUMN_COUNT)
+        if not columnMax or int(columnMax) < 1:
+            columnMax = constants.DEFAULT_CONFIG[constants.COLUMN_COUNT]
+        columnMax = int(columnMax)
+
+        for checkBox in self.allCheckBoxes:
+            self.moduleLayout.removeWidget(checkBox)
+
+        for index, checkBox in enumerate(self.allCheckBoxes):
+            row, column = divmod(index, columnMax)
+            self.moduleLayout.addWidget(checkBox, row, column)
+
     def clearLayout(self) -> None:
         """Clears the main layout."""
         self.allCheckBoxes.clear()
@@ -339,10 +411,121 @@ class AbstractModuleWidget(QtWidgets.QWidget):
 
         return allModules
 
+    @staticmethod
+    def searchLimits() -> Tuple[int, float, int]:
+        """Gets the number of matches and the number of seconds after which a search stops, and the number of bytes
+        from which a module is skipped, 0 for no limit.
+        """
+        maxMatches = core.getConfigValueByName(constants.MAX_MATCHES)
+        if maxMatches is None:
+            maxMatches = constants.DEFAULT_CONFIG[constants.MAX_MATCHES]
+
+        timeLimit = core.getConfigValueByName(constants.SEARCH_TIME_LIMIT)
+        if timeLimit is None:
+            timeLimit = constants.DEFAULT_CONFIG[constants.SEARCH_TIME_LIMIT]
+
+        # In megabytes in the config.json.
+        maxFileSize = core.getConfigValueByName(constants.MAX_FILE_SIZE)
+        if maxFileSize is None:
+            maxFileSize = constants.DEFAULT_CONFIG[constants.MAX_FILE_SIZE]
+
+        return max(int(maxMatches), 0), max(float(timeLimit), 0.0), max(int(float(maxFileSize) * 1024 * 1024), 0)
+
+    def startSearchWorker(self, searchWorker: workers.LocalSearchWorker, total: int) -> None:
+        """Streams the matches of a search worker to the output, the worker runs on the global QThreadPool.
+
+        Parameters:
+            searchWorker: The worker, not started yet.
+            total: The number of files to scan, the initial range of the progress bar.
+        """
+        self._searchWorker = searchWorker
+        self._searchWorker.signals.matchesFound.connect(self.onMatchesFound)
+        self._searchWorker.signals.progress.connect(self.onSearchProgress)
+        self._searchWorker.signals.finished.connect(self.onSearchFinished)
+        self._searchWorker.signals.message.connect(self.onSearchMessage)
+
+        self.searchProgress.setRange(0, total)
+        self.searchProgress.setValue(0)
+        self.searchProgress.show()
+        self.cancelSearchButton.show()
+        self.updateMatchingCount()
+        self.matchCountTimer.start()
+
+        QtCore.QThreadPool.globalInstance().start(self._searchWorker)
+
+    def cancelSearch(self) -> None:
+        """Cancels the running search, the matches already displayed are kept."""
+        if self._searchWorker is None:
+            return
+
+        self._searchWorker.cancel()
+        self._searchWorker = None
+
+        self.matchCountTimer.stop()
+        self.updateMatchingCount()
+        self.searchProgress.hide()
+        self.cancelSearchButton.hide()
+
+    def _isCurrentSearch(self) -> bool:
+        """Gets if the emitted signal comes from the running worker, a cancelled worker may still emit its last batch."""
+        return self._searchWorker is not None and self.sender() is self._searchWorker.signals
+
+    def onMatchesFound(self, matches: List[engine.Match]) -> None:
+        """Appends a batch of matches streamed by the search worker to the output, the hit counter follows on the
+        next tick of the :attr:`matchCountTimer`.
+        """
+        if not self._isCurrentSearch():
+            return
+
+        self.output.appendMatches([
+            (' <span>&#8594;</span> '.join(match.path.split(os.sep)[-3:]), match) for match in matches
+        ])
+
+    def onSearchProgress(self, scannedCount: int, total: int) -> None:
+        """Updates the progress bar with the number of scanned files."""
+        if not self._isCurrentSearch():
+            return
+
+        # The total shrinks when the trigram index filters the modules.
+        self.searchProgress.setRange(0, total)
+        self.searchProgress.setValue(scannedCount)
+
+    def onSearchMessage(self, text: str) -> None:
+        """Appends a message of the search worker to the output."""
+        if self._isCurrentSearch():
+            self.output.appendPlainText(text)
+
+    def onSearchFinished(self, matchCount: int) -> None:
+        """Hides the progress widgets and reports a search without match."""
+        if not self._isCurrentSearch():
+            return
+
+        self._searchWorker = None
+        self.matchCountTimer.stop()
+        self.updateMatchingCount()
+        self.searchProgress.hide()
+        self.cancelSearchButton.hide()
+
+        if wordFinderUtils.DEV_MODE:
+            self.matchingCount.setText("{} ({})".format(self.matchingCount.text(), resultCache.getCache().stats))
+
+        if not matchCount:
+            self.output.appendPlainText('The word "{}" has not been found'.format(self._searchWord))
+
+    def updateMatchingCount(self) -> None:
+        """Displays the number of matching lines in the output."""
+        self.matchingCount.setText("The word is found {} time".format(self.output.matchCount))
+
 
 class LocalModuleWidget(AbstractModuleWidget):
     """This widget is responsible for searching within the local packages."""
 
+    def __init__(self, parent: Optional[QtWidgets.QWidget]=None):
+        super().__init__(parent)
+
+        self._indexWorker = None
+        self._refreshedSearchPath = None
+
     @staticmethod
     def isCheckBoxPreviouslyChecked(checkBox: QtWidgets.QCheckBox) -> bool:
         """Gets if the provided checkBox is present in the config file, if it is, sets it to checked.
@@ -353,118 +536,113 @@ class LocalModuleWidget(AbstractModuleWidget):
         Returns:
             True if the checkBox is present in the config file, else False.
         """
-        checkedBoxes = core.getConfigValueByName(constants.LOCAL_CHECKED_MODULES)
-
-        if not checkedBoxes:
-            return False
-
-        if checkBox.text() in checkedBoxes:
-            return True
+        return core.isInConfigList(constants.LOCAL_CHECKED_MODULES, checkBox.text())
 
     def modules(self) -> Union[Generator, None]:
         """Yields the module name within the :attr:`searchPath` folder."""
         if not self._searchPath:
             return None
 
-        for module in os.listdir(self._searchPath):
-            if os.path.isdir(os.path.join(self._searchPath, module)) and module not in constants.EXCLUDED_MODULES:
-                yield module
+        yield from moduleWalker.packages(self._searchPath)
 
-    @wordFinderUtils.devMode(wordFinderUtils.timed)
     def searchWordInLocal(
             self,
-            word: str,
+            query: sentenceProcess.SearchQuery,
             showContext: bool,
-            isLiteral: bool,
             useSyntaxColor: bool,
-            numberOfExtraLine: int
+            numberOfExtraLine: int,
+            filesWithMatches: bool = False
     ) -> None:
         """Search a word or sentence in the checked modules.
 
+        The modules are scanned by a :class:`workers.LocalSearchWorker` on the global QThreadPool, the matches
+        are appended to the output as they are streamed back. Large searches are sharded across the number of
+        processes set in the config.json, if the search path is indexed, only the candidate modules are scanned.
+        The search stops at the limits of the config.json, see :meth:`searchLimits`.
+
         Parameters:
-            word: The word to search.
+            query: The compiled query to search.
             showContext: If true, the method will output [x] lines before and after the found sentence.
-            isLiteral: If true, the method will search if the provided word is in the sentence, if false, the method will search the word using a regex.
             useSyntaxColor: If true, the output text will be colored, is false, it will be white.
             numberOfExtraLine: The number of line to display if the showComment parameter is True.
+            filesWithMatches: If true, only the first match of each module is displayed.
         """
-        self.output.clear()
-        modulesWithPrints = []
-        matchCount = 0
-
-        for checkBox in self.checkedModules:
-            for modulePath in checkBox.modules.values():
-                try:
-                    with open(modulePath, 'r', encoding='utf-8') as reader:
-                        lines = reader.readlines()
-                        for lineNumber, line in enumerate(lines, start=1):
-                            if sentenceProcess.wordInLine(word, line, isLiteral):
-                                modulesWithPrints.append(modulePath)
-                                matchCount += 1
-                                self.matchingCount.setText("The word is found {} time".format(matchCount))
-                                if showContext:
-                                    self.displayPreviousLines(numberOfExtraLine, modulePath, lineNumber)
-                                # Colorize the line dependent on the syntax.
-                                processedLine = sentenceProcess.colorizeLine(line, word) if useSyntaxColor else line
-
-                                self.output.appendHtml(
-                                    "<font color=#40D139>{}</font> <span>&#8594;</span> <font color=#40D139>line {}</font> <span>&#8594;</span> {}".format(' <span>&#8594;</span> '.join(
-                                    modulePath.split(os.sep)[-3:]),
-                                        lineNumber,
-                                        processedLine
-                                    )
-                                )
-
-                                if showContext:
-                                    self.displayNextLines(numberOfExtraLine, modulePath, lineNumber)
-
-                except PermissionError:
-                    LOGGER.debug("Permission denied for {}".format(modulePath))
-
-        if not modulesWithPrints:
-            self.output.appendPlainText('The word "{}" has not been found'.format(word))
-            self.matchingCount.setText("The word is found {} time".format(matchCount))
-
-    def displayPreviousLines(self, numberOfExtraLine: int, modulePath: str, lineNumber: int) -> None:
-        """Opens the provided module to find the [x] lines before the provided line and appends them to the output window.
-
-        Parameters:
-            numberOfExtraLine: The [x] lines to display.
-            modulePath: The module path.
-            lineNumber: The line that contains the word to search.
+        self.cancelSearch()
+
+        self.output.clear(query, showContext, useSyntaxColor)
+        self._searchWord = query.word
+
+        # Sorted by package then path so the results come in the same order whatever the number of workers.
+        modulePaths = sorted(
+            (checkBox.text(), modulePath) for checkBox in self.checkedModules for modulePath in checkBox.modules.values()
+        )
+        modulePaths = [modulePath for _, modulePath in modulePaths]
+
+        maxMatches, timeLimit, maxFileSize = self.searchLimits()
+
+        searchWorker = workers.LocalSearchWorker(
+            query,
+            modulePaths,
+            int(numberOfExtraLine) if showContext else 0,
+            moduleSearch.workerCount(core.getConfigValueByName(constants.SEARCH_WORKERS)),
+            self.searchPath,
+            maxMatches,
+            filesWithMatches,
+            timeLimit,
+            maxFileSize
+        )
+        self.startSearchWorker(searchWorker, len(modulePaths))
+
+    def refreshModules(self) -> None:
+        """Rebuilds the checkBoxes if the search path or its packages have changed.
+
+        The checkBoxes read their modules from :data:`moduleWalker.MODULE_TREE` when they're searched, so the
+        added or deleted modules need no walk here. The trigram index, if any, reprocesses the added, changed and
+        deleted modules in the background.
         """
-        with open(modulePath, 'r', encoding='utf-8') as readFile:
-            lines = readFile.readlines()
-            index = int(numberOfExtraLine)
+        packageCheckBoxes = {checkBox.text() for checkBox in self.allCheckBoxes}
 
-            for number, line in enumerate(lines, start=1):
-                if number == lineNumber - index:
-                    self.output.appendHtml("<font color='grey'>{}</font> <span>&#8594;</span> <font color='grey'>line {}</font> <span>&#8594;</span> <font color' -> {}</font>".format(" <span>&#8594;</span> ".join(modulePath.split(os.sep)[-3:]), number, line))
-                    index -= 1
+        if not self.searchPath or self._refreshedSearchPath != self.searchPath \
+                or set(self.modules()) != packageCheckBoxes:
+            self.addModules()
+            self._refreshedSearchPath = self.searchPath
 
-                    if index == 0:
-                        break
+        else:
+            for checkBox in self.allCheckBoxes:
+                checkBox.forgetDeletedModules()
 
-    def displayNextLines(self, numberOfExtraLine: int, modulePath: str, lineNumber: int) -> None:
-        """Same method as :meth:`displayPreviousLines` but this will append the next x lines after the provided line.
+        if self.searchPath:
+            self._indexWorker = workers.IndexWorker(self.searchPath, update=True)
+            self._indexWorker.signals.finished.connect(self.onIndexRebuilt)
+            QtCore.QThreadPool.globalInstance().start(self._indexWorker)
 
-        Parameters:
-            numberOfExtraLine: The [x] lines to display.
-            modulePath: The module path.
-            lineNumber: The line that contains the word to search.
-        """
-        with open(modulePath, 'r', encoding='utf-8') as readFile:
-            lines = readFile.readlines()
-            index = 1
+    def rebuildIndex(self) -> None:
+        """Rebuilds the trigram index of the :attr:`searchPath` on the global QThreadPool."""
+        if not self.searchPath:
+            return
 
-            for number, line in enumerate(lines, start=1):
-                if number == lineNumber + index:
-                    self.output.appendHtml("<font color='grey'>{}</font> <span>&#8594;</span> <font color='grey'>line {}</font> <span>&#8594;</span> <font color' -> {}</font>".format(" <span>&#8594;</span> ".join(modulePath.split(os.sep)[-3:]), number, line))
-                    index += 1
+        self._indexWorker = workers.IndexWorker(self.searchPath)
+        self._indexWorker.signals.progress.connect(self.onIndexProgress)
+        self._indexWorker.signals.finished.connect(self.onIndexRebuilt)
 
-                    if index == int(numberOfExtraLine) + 1:
-                        self.output.appendHtml('')
-                        break
+        self.matchingCount.setText("Indexing {}".format(self.searchPath))
+        self.searchProgress.setValue(0)
+        self.searchProgress.show()
+
+        QtCore.QThreadPool.globalInstance().start(self._indexWorker)
+
+    def onIndexProgress(self, indexedCount: int, total: int) -> None:
+        """Updates the progress bar with the number of indexed modules."""
+        self.searchProgress.setRange(0, total)
+        self.searchProgress.setValue(indexedCount)
+
+    def onIndexRebuilt(self, moduleCount: int) -> None:
+        """Reports the number of indexed modules."""
+        self._indexWorker = None
+        self.searchProgress.hide()
+
+        if moduleCount >= 0:
+            self.matchingCount.setText("{} modules indexed".format(moduleCount))
 
     @wordFinderUtils.storeConfig(constants.LOCAL_CHECKED_MODULES)
     def checkAllCheckBoxes(self):
@@ -495,13 +673,7 @@ class GitHubModuleWidget(AbstractModuleWidget):
         Returns:
             True if the checkBox is present in the config file, else False.
         """
-        checkedBoxes = core.getConfigValueByName(constants.GIT_HUB_CHECKED_MODULES)
-
-        if not checkedBoxes:
-            return False
-
-        if checkBox.text() in checkedBoxes:
-            return True
+        return core.isInConfigList(constants.GIT_HUB_CHECKED_MODULES, checkBox.text())
 
 
     @wordFinderUtils.storeConfig(constants.GIT_HUB_CHECKED_MODULES)
@@ -518,109 +690,103 @@ class GitHubModuleWidget(AbstractModuleWidget):
 
     def searchWordInGitHub(
             self,
-            word: str,
+            query: sentenceProcess.SearchQuery,
             showContext: bool,
-            isLiteral: bool,
             useSyntaxColor: bool,
-            numberOfExtraLine: int
+            numberOfExtraLine: int,
+            filesWithMatches: bool = False
         ) -> None:
         """Search a word or sentence in the checked modules.
 
+        If the mirror mode is set in the config.json, the repositories are synced to local clones and searched on
+        disk by a :class:`workers.MirrorSearchWorker`, see :meth:`searchWordInMirrors`. Else their files are read
+        through the REST API by a :class:`workers.GitHubSearchWorker`. The search stops at the limits of the
+        config.json, see :meth:`searchLimits`.
+
         Parameters:
-            word: The word to search.
+            query: The compiled query to search.
             showContext: If true, the method will output [x] lines before and after the found sentence.
-            isLiteral: If true, the method will search if the provided word is in the sentence, if false, the method will search the word using a regex.
             useSyntaxColor: If true, the output text will be colored, is false, it will be white.
             numberOfExtraLine: The number of line to display if the showComment parameter is True.
+            filesWithMatches: If true, only the first match of each file is displayed.
         """
-        self.output.clear()
-        modulesWithPrints = []
-        matchCount = 0
-
-        for checkBox in self.checkedModules:
-            for content in auth.getContent(checkBox.text(), ""):
-                try:
-                    decodedContent = content.decoded_content.decode('utf-8')
-                    for lineNumber, line in enumerate(decodedContent.splitlines()):
-                        if sentenceProcess.wordInLine(word, line, isLiteral):
-                            modulesWithPrints.append(checkBox.text())
-                            matchCount += 0
-
-                            if showContext:
-                                self.displayPreviousLines(numberOfExtraLine, content.path, decodedContent, lineNumber)
-
-                            # Colorize the line dependent on the syntax.
-                            processedLine = sentenceProcess.colorizeLine(line, word) if useSyntaxColor else line
-
-                            self.output.appendHtml(
-                                "<font color=#40D139>{}</font> <span>&#8594;</span> <font color=#40D139>line {}</font> <span>&#8594;</span> {}".format(
-                                    content.path,
-                                    lineNumber,
-                                    processedLine
-                                )
-                            )
-                            self.matchingCount.setText("The word is found {} time".format(matchCount))
-
-                            if showContext:
-                                self.displayNextLines(numberOfExtraLine, content.path, decodedContent, lineNumber)
-
-                except UnicodeDecodeError:
-                    LOGGER.debug("Cannot read {} file".format(content.path))
-
-            if not modulesWithPrints:
-                self.output.appendPlainText('The word "{}" has not been found'.format(word))
-                self.matchingCount.setText("The word is found {} time".format(matchCount))
-
-    def displayPreviousLines(self, numberOfExtraLine: int, moduleName: str, decodedContent: str, lineNumber: int) -> None:
-        """Opens the provided module to find the [x] lines before the provided line and appends them to the output window.
+        self.cancelSearch()
 
-        Parameters:
-            numberOfExtraLine: The [x] lines to display.
-            moduleName: The name to display before the line.
-            decodedContent: The str content.
-            lineNumber: The line that contains the word to search.
+        self.output.clear(query, showContext, useSyntaxColor)
+        self._searchWord = query.word
+        numberOfExtraLine = int(numberOfExtraLine) if showContext else 0
+
+        from wordFinder.gitHub import auth
+
+        self._firstCallCount = auth.API_CALLS.count
+
+        if core.getConfigValueByName(constants.GIT_HUB_MIRROR):
+            self.searchWordInMirrors(query, numberOfExtraLine, filesWithMatches)
+            return
+
+        maxMatches, timeLimit, _ = self.searchLimits()
+
+        searchWorker = workers.GitHubSearchWorker(
+            query,
+            [checkBox.text() for checkBox in self.checkedModules],
+            numberOfExtraLine,
+            maxMatches,
+            filesWithMatches,
+            timeLimit
+        )
+        self.startSearchWorker(searchWorker, 0)
+
+    def onSearchFinished(self, matchCount: int) -> None:
+        """See :meth:`AbstractModuleWidget.onSearchFinished`, the blob cache and the API calls of the search are
+        displayed as well in the dev mode.
         """
-        index = int(numberOfExtraLine)
+        isCurrentSearch = self._isCurrentSearch()
+
+        super().onSearchFinished(matchCount)
 
-        for number, line in enumerate(decodedContent.splitlines()):
-            if number == lineNumber - index:
-                self.output.appendHtml("<font color='grey'>{}</font> <span>&#8594;</span> <font color='grey'>line {}</font> <span>&#8594;</span> <font color' -> {}</font>".format(moduleName, lineNumber, line))
-                index -= 1
+        if isCurrentSearch and wordFinderUtils.DEV_MODE:
+            from wordFinder.gitHub import auth
+            from wordFinder.gitHub import blobCache
 
-                if index == 0:
-                    break
+            self.matchingCount.setText("{} ({}, {} API calls)".format(
+                self.matchingCount.text(),
+                blobCache.getCache().stats,
+                auth.API_CALLS.count - self._firstCallCount
+            ))
 
-    def displayNextLines(self, numberOfExtraLine: int, moduleName: str, decodedContent: str, lineNumber: int) -> None:
-        """Same method as :meth:`displayPreviousLines` but this will append the next x lines after the provided line.
+    def searchWordInMirrors(
+            self,
+            query: sentenceProcess.SearchQuery,
+            numberOfExtraLine: int,
+            filesWithMatches: bool = False
+    ) -> None:
+        """Syncs the mirrors of the checked repositories then searches them with the local engine.
 
         Parameters:
-            numberOfExtraLine: The [x] lines to display.
-            moduleName: The name to display before the line.
-            decodedContent: The str content.
-            lineNumber: The line that contains the word to search.
+            query: The compiled query to search.
+            numberOfExtraLine: The number of context lines to display before and after each match.
+            filesWithMatches: If true, only the first match of each module is displayed.
         """
-        index = 1
-
-        for number, line in enumerate(decodedContent.splitlines()):
-            if number == lineNumber + index:
-                self.output.appendHtml("<font color='grey'>{}</font> <span>&#8594;</span> <font color='grey'>line {}</font> <span>&#8594;</span> <font color' -> {}</font>".format(moduleName, lineNumber, line))
-                index += 1
-                if index == int(numberOfExtraLine) + 1:
-                    self.output.appendHtml('')
-                    break
+        repoNames = sorted(checkBox.text() for checkBox in self.checkedModules)
+        maxMatches, timeLimit, maxFileSize = self.searchLimits()
+
+        searchWorker = workers.MirrorSearchWorker(
+            query,
+            repoNames,
+            numberOfExtraLine,
+            moduleSearch.workerCount(core.getConfigValueByName(constants.SEARCH_WORKERS)),
+            maxMatches,
+            filesWithMatches,
+            timeLimit,
+            maxFileSize
+        )
+        self.startSearchWorker(searchWorker, len(repoNames))
 
     def addModules(self) -> Optional[List[str]]:
         """Adds the modules found in the :attr:`searchPath` in a checkBox, get if this module was previously checked,
         then, adds it to the allCheckBoxes list.
         """
         self.clearLayout()
-        # Get how many columns has been set from the config.json
-        columnMax = core.getConfigValueByName(COLUMN_COUNT)
-        row = 0
-        column = 0
-
-        if not self.modules():
-            return
 
         for module in self.modules():
             checkBox = checkBoxes.GitHubPackageCheckBox(module, module)
@@ -629,13 +795,9 @@ class GitHubModuleWidget(AbstractModuleWidget):
             if self.isCheckBoxPreviouslyChecked(checkBox):
                 checkBox.setChecked(True)
 
-            self.moduleLayout.addWidget(checkBox, row, column)
             self.allCheckBoxes.append(checkBox)
 
-            column += 1
-            if column == columnMax:
-                column = 0
-                row += 1
+        self.arrangeCheckBoxes()
 
 
 class StackModulesWidget(QtWidgets.QTabWidget):
@@ -659,6 +821,15 @@ class StackModulesWidget(QtWidgets.QTabWidget):
         self.localTab = self.addTab(self.localWidget, 'Local')
         self.githubTab = self.addTab(self.githubWidget, 'Github')
 
+        # The GitHub repositories are listed the first time the tab is shown.
+        self._isGitHubLoaded = False
+        self.currentChanged.connect(self.onCurrentTabChanged)
+
+    def onCurrentTabChanged(self, index: int) -> None:
+        """Lists the GitHub repositories the first time the GitHub tab is shown."""
+        if index == self.githubTab and not self._isGitHubLoaded:
+            self.addGitHubModules()
+
     def setModulesWidgetSearchPath(self, path):
         """Pass the search path to each search widget"""
         self.localWidget.searchPath = path
@@ -668,12 +839,27 @@ class StackModulesWidget(QtWidgets.QTabWidget):
         """Adds the modules within the :attr:`searchPath` to the main layout."""
         self.localWidget.addModules()
 
+    def arrangeModules(self):
+        """Places the checkBoxes of each search widget with the column count of the config.json."""
+        self.localWidget.arrangeCheckBoxes()
+        self.githubWidget.arrangeCheckBoxes()
+
+    def refreshLocalModules(self):
+        """Updates the local modules with what has changed on disk, see :meth:`LocalModuleWidget.refreshModules`."""
+        self.localWidget.refreshModules()
+
     def addGitHubModules(self):
         """This method is currently not functional"""
         gitHubToken = core.getConfigValueByName(constants.GIT_HUB_HEY)
 
         if gitHubToken:
             self.githubWidget.addModules()
+            self._isGitHubLoaded = True
+
+    def refreshGitHubModules(self):
+        """Lists the GitHub repositories again, if they have already been listed or if the GitHub tab is shown."""
+        if self._isGitHubLoaded or self.currentIndex() == self.githubTab:
+            self.addGitHubModules()
 
     @property
     def allLocalCheckBoxes(self):
@@ -683,12 +869,26 @@ class StackModulesWidget(QtWidgets.QTabWidget):
     def allGitHubCheckBoxes(self):
         return self.githubWidget.allCheckBoxes
 
-    def searchWordInLocal(self, word, showContext, isLiteral, useSyntaxColor, numberOfExtraLine):
+    def rebuildLocalIndex(self) -> None:
+        """Rebuilds the trigram index of the local search path."""
+        self.localWidget.rebuildIndex()
+
+    def setSyntaxColor(self, useSyntaxColor: bool) -> None:
+        """Colors the matching lines displayed by each search widget or not, no search is run again."""
+        self.localWidget.output.setSyntaxColor(useSyntaxColor)
+        self.githubWidget.output.setSyntaxColor(useSyntaxColor)
+
+    def cancelSearches(self) -> None:
+        """Cancels the searches running in each search widget."""
+        self.localWidget.cancelSearch()
+        self.githubWidget.cancelSearch()
+
+    def searchWordInLocal(self, query, showContext, useSyntaxColor, numberOfExtraLine, filesWithMatches=False):
         """This method's purpose is to send the argument to the local search widget, to get the documentation
         of the method, please, refer to the :meth:`LocalModuleWidget.searchWordInLocal` method"""
-        self.localWidget.searchWordInLocal(word, showContext, isLiteral, useSyntaxColor, numberOfExtraLine)
+        self.localWidget.searchWordInLocal(query, showContext, useSyntaxColor, numberOfExtraLine, filesWithMatches)
 
-    def searchWordInGitHub(self, word, showContext, isLiteral, useSyntaxColor, numberOfExtraLine):
+    def searchWordInGitHub(self, query, showContext, useSyntaxColor, numberOfExtraLine, filesWithMatches=False):
         """This method's purpose is to send the argument to the local search widget, to get the documentation
         of the method, please, refer to the :meth:`LocalModuleWidget.searchWordInGit` method"""
-        self.githubWidget.searchWordInGitHub(word, showContext, isLiteral, useSyntaxColor, numberOfExtraLine)
+        self.githubWidget.searchWordInGitHub(query, showContext, useSyntaxColor, numberOfExtraLine, filesWithMatches)
@@ -0,0 +1,318 @@
+import time
+import logging
+from typing import Iterable, Iterator, List, Optional
+
+from PySide2 import QtCore
+
+from wordFinder import engine
+from wordFinder.utils import sentenceProcess
+from wordFinder.utils import manifest
+from wordFinder.utils import moduleSearch
+from wordFinder.utils import resultCache
+from wordFinder.utils import trigramIndex
+from wordFinder.utils import wordFinderUtils
+from wordFinder.gitHub import mirror
+
+
+LOGGER = logging.getLogger(__name__)
+LOGGER.setLevel(20)
+
+
+class SearchWorkerSignals(QtCore.QObject):
+    """The signals emitted by the :class:`LocalSearchWorker`, a QRunnable can't own signals itself.
+
+    Signals:
+        matchesFound: A batch of :class:`engine.Match`.
+        progress: The number of scanned files and the total number of files to scan.
+        finished: The total number of matches, emitted once the scan is over or cancelled.
+        message: A text to display in the output, like a repository that can't be synced.
+    """
+    matchesFound = QtCore.Signal(list)
+    progress = QtCore.Signal(int, int)
+    finished = QtCore.Signal(int)
+    message = QtCore.Signal(str)
+
+
+class LocalSearchWorker(QtCore.QRunnable):
+    """Consumes :func:`engine.search` on a thread of the QThreadPool and streams the matches back through signals.
+
+    The matches of a search run again on unchanged modules come from the :func:`resultCache.getCache`.
+    """
+
+    # The minimum delay between two emitted batches, in seconds.
+    BATCH_INTERVAL = 0.05
+
+    def __init__(
+            self,
+            query: sentenceProcess.SearchQuery,
+            modulePaths: List[str],
+            numberOfExtraLine: int = 0,
+            workers: int = 1,
+            searchPath: Optional[str] = None,
+            maxMatches: int = 0,
+            filesWithMatches: bool = False,
+            timeLimit: float = 0.0,
+            maxFileSize: int = 0
+    ) -> None:
+        """Initialisation of LocalSearchWorker.
+
+        Parameters:
+            query: The compiled query to search.
+            modulePaths: The paths of the modules to scan, the matches are sent in this order.
+            numberOfExtraLine: The number of context lines to send before and after each match.
+            workers: The number of processes to use, see :class:`engine.SearchOptions`.
+            searchPath: The search path of the modules, if its trigram index has been built, only the modules that
+                may contain the query are scanned.
+            maxMatches: If not 0, the search stops once this number of matches is found.
+            filesWithMatches: If true, only the first match of each module is sent.
+            timeLimit: If not 0, the search stops after this number of seconds, from the start of the scan.
+            maxFileSize: If not 0, the modules bigger than this number of bytes are skipped.
+        """
+        super().__init__()
+
+        self.query = query
+        self.modulePaths = modulePaths
+        self.numberOfExtraLine = numberOfExtraLine
+        self.workers = workers
+        self.searchPath = searchPath
+        self.maxMatches = maxMatches
+        self.filesWithMatches = filesWithMatches
+        self.timeLimit = timeLimit
+        self.maxFileSize = maxFileSize
+
+        self.signals = SearchWorkerSignals()
+        self.cancellationToken = engine.CancellationToken()
+
+        self._batch = []
+        self._lastEmit = 0.0
+        self._skipped = []
+
+    def sources(self) -> Iterable[engine.Source]:
+        """Gets the sources to scan, the paths of the modules."""
+        return self.modulePaths
+
+    def cancel(self) -> None:
+        """Asks the worker to stop, the scan is interrupted within the current module, or at the next shard."""
+        self.cancellationToken.cancel()
+
+    @property
+    def isCancelled(self) -> bool:
+        return self.cancellationToken.isCancelled
+
+    @wordFinderUtils.devMode(wordFinderUtils.timed)
+    def run(self) -> None:
+        if self.timeLimit > 0:
+            self.cancellationToken.deadline = time.time() + self.timeLimit
+
+        options = engine.SearchOptions(
+            numberOfExtraLine=self.numberOfExtraLine,
+            workers=self.workers,
+            searchPath=self.searchPath,
+            progress=self._onProgress,
+            isCancelled=self.cancellationToken,
+            maxMatches=self.maxMatches,
+            filesWithMatches=self.filesWithMatches,
+            resultCache=resultCache.getCache(),
+            maxFileSize=self.maxFileSize,
+            skipped=self._onSkipped
+        )
+
+        matchCount = 0
+        self._lastEmit = time.monotonic()
+
+        for match in engine.search(self.query, self.sources(), options):
+            self._batch.append(match)
+            matchCount += 1
+
+        self._emitBatch()
+
+        if self.maxMatches and matchCount == self.maxMatches:
+            self.signals.message.emit("The search stopped after {} matches".format(matchCount))
+        elif self.cancellationToken.isExpired:
+            self.signals.message.emit("The search stopped after {:g} seconds".format(self.timeLimit))
+
+        if self._skipped:
+            self.signals.message.emit(moduleSearch.skipSummary(self._skipped))
+
+        self.signals.finished.emit(matchCount)
+
+    def _onProgress(self, scannedCount: int, total: int) -> None:
+        """Called by the engine after each module or shard, the matches are emitted with the progress."""
+        # Throttle the signals, the event loop would be flooded by a signal per file or per match.
+        if time.monotonic() - self._lastEmit >= self.BATCH_INTERVAL or scannedCount == total:
+            self._emitBatch()
+            self.signals.progress.emit(scannedCount, total)
+            self._lastEmit = time.monotonic()
+
+    def _onSkipped(self, modulePath: str, reason: str) -> None:
+        """Called by the engine for each module that is not searched, they're counted in a message at the end."""
+        self._skipped.append((modulePath, reason))
+
+    def _emitBatch(self) -> None:
+        """Emits the pending matches."""
+        if self._batch:
+            self.signals.matchesFound.emit(self._batch)
+            self._batch = []
+
+
+class MirrorSearchWorker(LocalSearchWorker):
+    """Syncs the local mirrors of GitHub repositories, then scans them like the local packages, see :mod:`mirror`.
+
+    The repositories are looked up on GitHub by this worker too, none of their requests is sent by the GUI thread. The
+    progress signal reports the synced repositories first, then the scanned modules.
+    """
+
+    def __init__(
+            self,
+            query: sentenceProcess.SearchQuery,
+            repoNames: List[str],
+            numberOfExtraLine: int = 0,
+            workers: int = 1,
+            maxMatches: int = 0,
+            filesWithMatches: bool = False,
+            timeLimit: float = 0.0,
+            maxFileSize: int = 0
+    ) -> None:
+        """Initialisation of MirrorSearchWorker.
+
+        Parameters:
+            query: The compiled query to search.
+            repoNames: The full name of each repository, the matches are sent in this order. The default branch is
+                mirrored.
+            numberOfExtraLine: The number of context lines to send before and after each match.
+            workers: The number of processes to use, see :class:`engine.SearchOptions`.
+            maxMatches: If not 0, the search stops once this number of matches is found.
+            filesWithMatches: If true, only the first match of each module is sent.
+            timeLimit: If not 0, the search stops after this number of seconds, the sync is not counted.
+            maxFileSize: If not 0, the modules bigger than this number of bytes are skipped.
+        """
+        super().__init__(
+            query, [], numberOfExtraLine, workers, None, maxMatches, filesWithMatches, timeLimit, maxFileSize
+        )
+
+        self.repoNames = repoNames
+
+    def run(self) -> None:
+        from wordFinder.gitHub import auth
+
+        with auth.API_CALLS.measure("Mirror search"):
+            session = auth.getSession()
+
+            for index, repoName in enumerate(self.repoNames):
+                if self.isCancelled:
+                    self.signals.finished.emit(0)
+                    return
+
+                try:
+                    repo = session.repository(repoName)
+                    path = mirror.syncMirror(repo.full_name, repo.clone_url, repo.default_branch, session.gitHubToken)
+
+                except auth.REQUEST_ERRORS + (mirror.MirrorError,) as error:
+                    LOGGER.warning("Cannot sync {}: {}".format(repoName, error))
+                    self.signals.message.emit("Cannot sync {}: {}".format(repoName, error))
+                    continue
+
+                finally:
+                    self.signals.progress.emit(index + 1, len(self.repoNames))
+
+                self.modulePaths.extend(mirror.mirrorModulePaths(path))
+
+        super().run()
+
+
+class GitHubSearchWorker(LocalSearchWorker):
+    """Reads the files of GitHub repositories through the REST API and scans each one once it's downloaded, see
+    :func:`auth.getContent`.
+
+    The number of files is only known once they're listed, the progress signal reports the scanned files with a total
+    of 0. The cancellation token is passed down to the downloads, a cancelled search, or one that runs out of time,
+    neither waits for the rate limit nor downloads the queued blobs.
+    """
+
+    def __init__(
+            self,
+            query: sentenceProcess.SearchQuery,
+            repoNames: List[str],
+            numberOfExtraLine: int = 0,
+            maxMatches: int = 0,
+            filesWithMatches: bool = False,
+            timeLimit: float = 0.0
+    ) -> None:
+        """Initialisation of GitHubSearchWorker.
+
+        Parameters:
+            query: The compiled query to search.
+            repoNames: The full name of each repository, the matches are sent in this order.
+            numberOfExtraLine: The number of context lines to send before and after each match.
+            maxMatches: If not 0, the search stops once this number of matches is found.
+            filesWithMatches: If true, only the first match of each file is sent.
+            timeLimit: If not 0, the search stops after this number of seconds, the listing and the downloads are
+                counted.
+        """
+        super().__init__(query, [], numberOfExtraLine, 1, None, maxMatches, filesWithMatches, timeLimit)
+
+        self.repoNames = repoNames
+
+    def sources(self) -> Iterator[engine.TextSource]:
+        """Yields the decoded files of the repositories, one file after the other."""
+        from wordFinder.gitHub import auth
+
+        for repoName in self.repoNames:
+            try:
+                for path, content in auth.getContent(repoName, '', self.cancellationToken):
+                    try:
+                        yield engine.TextSource(path, content.decode('utf-8'))
+
+                    except UnicodeDecodeError:
+                        LOGGER.debug("Cannot read {} file".format(path))
+
+            except auth.REQUEST_ERRORS as error:
+                LOGGER.warning("Cannot read {}: {}".format(repoName, error))
+                self.signals.message.emit("Cannot read {}: {}".format(repoName, error))
+
+    def run(self) -> None:
+        from wordFinder.gitHub import auth
+
+        with auth.API_CALLS.measure("GitHub search"):
+            super().run()
+
+
+class IndexWorker(QtCore.QRunnable):
+    """Rebuilds or updates the trigram index of a search path on a thread of the QThreadPool.
+
+    The progress signal reports the indexed modules, the finished signal the number of indexed modules, or -1 if
+    an update is asked for a search path that is not indexed.
+
+    The index is only updated when the search path is refreshed, a module edited in between is still searched, see
+    :func:`engine.search`, an index that is partly stale only costs speed.
+    """
+
+    def __init__(self, searchPath: str, update: bool = False) -> None:
+        """Initialisation of IndexWorker.
+
+        Parameters:
+            searchPath: The search path to index.
+            update: If true, the search path is scanned and the index is only updated with the modules that differ.
+        """
+        super().__init__()
+
+        self.searchPath = searchPath
+        self.update = update
+        self.signals = SearchWorkerSignals()
+
+    def run(self) -> None:
+        if not self.update:
+            trigramIndex.rebuildIndex(self.searchPath, self._emitProgress)
+
+        # The search path is only scanned if it's indexed.
+        elif trigramIndex.getIndex(self.searchPath) is None \
+                or trigramIndex.updateIndex(self.searchPath, manifest.Manifest.scan(self.searchPath)) is None:
+            self.signals.finished.emit(-1)
+            return
+
+        self.signals.finished.emit(len(trigramIndex.getIndex(self.searchPath).pathIds))
+
+    def _emitProgress(self, indexedCount: int, total: int) -> None:
+        # A signal per module would flood the event loop.
+        if not indexedCount % 100 or indexedCount == total:
+            self.signals.progress.emit(indexedCount, total)
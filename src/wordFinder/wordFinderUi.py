@@ -1,13 +1,15 @@
+import re
 import logging
 from PySide2 import QtWidgets, QtCore, QtGui
 from typing import List
 
 from wordFinder import resources
-import constants
+from wordFinder import constants
 from wordFinder.widgets import widgets, checkBoxes
-import core
+from wordFinder.utils import sentenceProcess
+from wordFinder import core
 
-from utils import wordFinderUtils
+from wordFinder.utils import wordFinderUtils
 
 
 LOGGER = logging.getLogger(__name__)
@@ -18,6 +20,7 @@ logging.basicConfig(filename='utils/wordFinder.log', level=logging.INFO)
 class WordFinder(QtWidgets.QDialog):
 
     closed = QtCore.Signal()
+    firstPainted = QtCore.Signal()
 
     """Main ui class."""
     def __init__(self, parent=None) -> None:
@@ -26,14 +29,18 @@ class WordFinder(QtWidgets.QDialog):
         # Get if a search path has been stored.
         self.searchPath = core.getConfigValueByName(constants.SEARCH_PATH)
 
+        # The query of the last local search, displayed again when a display option changes.
+        self._lastLocalQuery = None
+
         self._buildUi()
         self._setupUi()
         self._connectUi()
 
-        # Add modules.
+        self._isPainted = False
+
+        # Add modules, the GitHub repositories are listed when their tab is first shown.
         self.stackedModulesWidget.setModulesWidgetSearchPath(self.searchPath)
-        self.stackedModulesWidget.addLocalModules()
-        self.stackedModulesWidget.addGitHubModules()
+        self.stackedModulesWidget.refreshLocalModules()
 
     def _buildUi(self) -> None:
         self.mainLayout = QtWidgets.QVBoxLayout(self)
@@ -51,9 +58,11 @@ class WordFinder(QtWidgets.QDialog):
         self.layoutAction = self.uiSetup.addAction('Layout')
         self.syntaxAction = self.uiSetup.addAction('Syntax highlighting')
         self.refreshAction = self.uiSetup.addAction('Refresh')
+        self.rebuildIndexAction = self.uiSetup.addAction('Rebuild index')
 
         # GitHub setup.
         self.githubTokenAction = self.githubSetup.addAction("Set GitHub personal access token")
+        self.gitHubMirrorAction = self.githubSetup.addAction("Search local mirrors")
 
         self.searchPathLabel = QtWidgets.QLabel()
         self.moduleToCheckLabel = QtWidgets.QLabel("Modules to check")
@@ -63,13 +72,20 @@ class WordFinder(QtWidgets.QDialog):
         self.radioSearchModeLayout = QtWidgets.QHBoxLayout(self.searchModeGroup)
 
         self.literalCheckBox = QtWidgets.QRadioButton("Classic")
+        self.wholeWordCheckBox = QtWidgets.QRadioButton("Whole word")
         self.regexCheckBox = QtWidgets.QRadioButton("Regex")
+        self.ignoreCaseCheckBox = QtWidgets.QCheckBox("Ignore case")
+        self.multilineCheckBox = QtWidgets.QCheckBox("Multiline")
 
         self.radioSearchModeLayout.addWidget(self.literalCheckBox)
+        self.radioSearchModeLayout.addWidget(self.wholeWordCheckBox)
         self.radioSearchModeLayout.addWidget(self.regexCheckBox)
+        self.radioSearchModeLayout.addWidget(self.ignoreCaseCheckBox)
+        self.radioSearchModeLayout.addWidget(self.multilineCheckBox)
 
         self.showContextCheckBox = QtWidgets.QCheckBox("Show context")
         self.contextNumberComboBox = QtWidgets.QComboBox()
+        self.filesWithMatchesCheckBox = QtWidgets.QCheckBox("Files with matches")
         self.checkButton = widgets.PushButton('check')
         self.wordToSearch = QtWidgets.QLineEdit()
         self.setSearchPathButton = widgets.PushButton("Set local search path")
@@ -85,6 +101,7 @@ class WordFinder(QtWidgets.QDialog):
         self.mainLayout.addLayout(self.optionLayout)
         self.optionLayout.addWidget(self.showContextCheckBox)
         self.optionLayout.addWidget(self.contextNumberComboBox)
+        self.optionLayout.addWidget(self.filesWithMatchesCheckBox)
         self.mainLayout.addWidget(self.separatorTwo)
         self.mainLayout.addWidget(self.moduleToCheckLabel)
         self.mainLayout.addWidget(self.stackedModulesWidget)
@@ -103,6 +120,8 @@ class WordFinder(QtWidgets.QDialog):
         self.devModeAction.setCheckable(True)
         self.syntaxAction.setCheckable(True)
         self.syntaxAction.setChecked(True)
+        self.gitHubMirrorAction.setCheckable(True)
+        self.gitHubMirrorAction.setChecked(bool(core.getConfigValueByName(constants.GIT_HUB_MIRROR)))
 
 
         self.optionLayout.addStretch()
@@ -136,19 +155,35 @@ class WordFinder(QtWidgets.QDialog):
     def _connectUi(self) -> None:
         self.closed.connect(self.saveLocalCheckedModules)
         self.closed.connect(self.saveGitHubCheckedModules)
+        self.closed.connect(self.stackedModulesWidget.cancelSearches)
         self.devModeAction.triggered.connect(self._devMode)
         self.layoutAction.triggered.connect(self.onLayoutActionTriggered)
         self.syntaxAction.triggered.connect(self.onSyntaxActionTriggered)
         self.refreshAction.triggered.connect(self.refreshModules)
+        self.rebuildIndexAction.triggered.connect(self.stackedModulesWidget.rebuildLocalIndex)
         self.githubTokenAction.triggered.connect(self.onGithubTokenActionTriggered)
+        self.gitHubMirrorAction.triggered.connect(self.onGitHubMirrorActionTriggered)
         self.setSearchPathButton.clicked.connect(self.setSearchPath)
         self.checkButton.clicked.connect(self.searchWord)
+        self.showContextCheckBox.toggled.connect(self.redisplayLocalSearch)
+        self.contextNumberComboBox.currentIndexChanged.connect(self.redisplayLocalSearch)
+
+    def paintEvent(self, event: QtGui.QPaintEvent) -> None:
+        """Emits the firstPainted signal once the window has been painted for the first time."""
+        super().paintEvent(event)
+
+        if not self._isPainted:
+            self._isPainted = True
+            self.firstPainted.emit()
 
     def closeEvent(self, event: QtGui.QCloseEvent) -> None:
         """Emits a signal when the ui is closed to store the method decorated by @wordFinderUtils.storeConfig"""
         event.accept()
         self.closed.emit()
 
+        # The configuration stored by the slots above is written now rather than after the write delay.
+        core.flushConfig()
+
     @wordFinderUtils.storeConfig(constants.LOCAL_CHECKED_MODULES)
     def saveLocalCheckedModules(self) -> List[str]:
         """Gets the checked checkBoxes and save them within the config file."""
@@ -196,12 +231,13 @@ class WordFinder(QtWidgets.QDialog):
         layoutWindow = widgets.ModuleLayoutWindow(self)
         layoutWindow.exec_()
 
-        # Set the modules with the new layout configuration.
-        self.stackedModulesWidget.addLocalModules()
-        self.stackedModulesWidget.addGitHubModules()
+        # Place the modules with the new layout configuration.
+        self.stackedModulesWidget.arrangeModules()
 
     def onSyntaxActionTriggered(self) -> None:
-        """Sets the syntax action icon"""
+        """Sets the syntax action icon and repaints the displayed matches, the search is not run again."""
+        self.stackedModulesWidget.setSyntaxColor(self.syntaxAction.isChecked())
+
         if self.syntaxAction.isChecked():
             self.syntaxAction.setIcon(QtGui.QIcon("wfIcons:check.png"))
             return
@@ -218,6 +254,11 @@ class WordFinder(QtWidgets.QDialog):
 
         return githubWindow.gitHubToken()
 
+    @wordFinderUtils.storeConfig(constants.GIT_HUB_MIRROR)
+    def onGitHubMirrorActionTriggered(self) -> bool:
+        """Sets if the GitHub repositories are cloned and searched on disk rather than read through the REST API."""
+        return self.gitHubMirrorAction.isChecked()
+
     def setSearchPath(self) -> None:
         """Opens a new window to allow the user write the path where to query the modules."""
         pathWindow = widgets.SearchPathWindow()
@@ -232,9 +273,9 @@ class WordFinder(QtWidgets.QDialog):
         """Refresh the modules checkboxes."""
         self.searchPathLabel.setText("Search path: {}".format(self.searchPath))
         self.stackedModulesWidget.setModulesWidgetSearchPath(self.searchPath)
-        self.stackedModulesWidget.addLocalModules()
-        self.stackedModulesWidget.addGitHubModules()
-        
+        self.stackedModulesWidget.refreshLocalModules()
+        self.stackedModulesWidget.refreshGitHubModules()
+
     def checkAllCheckBoxes(self) -> None:
         """Checks all checkBoxes"""
         for checkBox in self.stackedModulesWidget.allCheckBoxes:
@@ -245,22 +286,65 @@ class WordFinder(QtWidgets.QDialog):
         for checkBox in self.stackedModulesWidget.allCheckBoxes:
             checkBox.setChecked(False)
 
+    def searchQuery(self) -> sentenceProcess.SearchQuery:
+        """Compiles the word to search with the selected search mode.
+
+        Raises:
+            re.error: If the regex mode is selected and the word is not a valid regular expression.
+        """
+        if self.regexCheckBox.isChecked():
+            mode = sentenceProcess.SearchQuery.REGEX
+        elif self.wholeWordCheckBox.isChecked():
+            mode = sentenceProcess.SearchQuery.WHOLE_WORD
+        else:
+            mode = sentenceProcess.SearchQuery.LITERAL
+
+        return sentenceProcess.SearchQuery(
+            self.wordToSearch.text(),
+            mode,
+            self.ignoreCaseCheckBox.isChecked(),
+            self.multilineCheckBox.isChecked()
+        )
+
     def searchWord(self) -> None:
         """Search a word in the local or GitHub widget"""
+        try:
+            query = self.searchQuery()
+
+        except re.error as error:
+            QtWidgets.QMessageBox.warning(self, "Invalid regex", "The regex is not valid: {}".format(error))
+            return
+
         if not self.stackedModulesWidget.currentIndex():
+            self._lastLocalQuery = query
             self.stackedModulesWidget.searchWordInLocal(
-                self.wordToSearch.text(),
+                query,
                 self.showContextCheckBox.isChecked(),
-                self.literalCheckBox.isChecked(),
                 self.syntaxAction.isChecked(),
-                self.contextNumberComboBox.currentText()
+                self.contextNumberComboBox.currentText(),
+                self.filesWithMatchesCheckBox.isChecked()
             )
             return
 
         self.stackedModulesWidget.searchWordInGitHub(
-            self.wordToSearch.text(),
+            query,
+            self.showContextCheckBox.isChecked(),
+            self.syntaxAction.isChecked(),
+            self.contextNumberComboBox.currentText(),
+            self.filesWithMatchesCheckBox.isChecked()
+        )
+
+    def redisplayLocalSearch(self) -> None:
+        """Runs the last local search again with the new display options, its matches come from the result cache
+        unless a module has changed since.
+        """
+        if self._lastLocalQuery is None or self.stackedModulesWidget.currentIndex():
+            return
+
+        self.stackedModulesWidget.searchWordInLocal(
+            self._lastLocalQuery,
             self.showContextCheckBox.isChecked(),
-            self.literalCheckBox.isChecked(),
             self.syntaxAction.isChecked(),
-            self.contextNumberComboBox.currentText()
+            self.contextNumberComboBox.currentText(),
+            self.filesWithMatchesCheckBox.isChecked()
         )
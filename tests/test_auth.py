@@ -0,0 +1,331 @@
+"""Tests of the GitHub client against a local server that replays recorded responses, run them from the repository
+root::
+
+    python -m pytest tests
+"""
+import os
+import sys
+import json
+import types
+import base64
+import threading
+from concurrent import futures
+from http import server
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import pytest
+
+pytest.importorskip('github')
+pytest.importorskip('requests')
+
+from wordFinder import constants
+from wordFinder import core
+from wordFinder.gitHub import auth
+from wordFinder.gitHub import blobCache
+
+
+RATE_LIMIT_RESET = 4102444800
+
+MODULES = {
+    'core.py': ('b1', "def storeConfig():\n    pass\n"),
+    'utils/moduleSearch.py': ('b2', "storeConfig()\n"),
+    'README.md': ('b3', "storeConfig\n"),
+}
+
+
+class ReplayServer:
+    """Answers the recorded responses of the GitHub API, keyed by the path and the query of the request.
+
+    A response is the status, the JSON data and optionally more headers, or a list of them answered in turn.
+
+    Each response is sent with an ETag, a request that sends it back gets a 304 Not Modified.
+    """
+
+    def __init__(self) -> None:
+        self.responses = {}
+        self.requests = []
+        self.rateLimitRemaining = 4999
+
+        replay = self
+
+        class Handler(server.BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self) -> None:
+                replay.requests.append((self.path, dict(self.headers)))
+                response = replay.responses.get(self.path, (404, {'message': 'Not Found'}))
+
+                # A list of responses is answered in turn, the last one is kept.
+                if isinstance(response, list):
+                    response = response.pop(0) if len(response) > 1 else response[0]
+
+                status, data = response[:2]
+                extraHeaders = response[2] if len(response) > 2 else {}
+                etag = '"{}"'.format(abs(hash(self.path)))
+
+                if status == 200 and self.headers.get('If-None-Match') == etag:
+                    status, body = 304, b''
+                else:
+                    body = json.dumps(data).encode('utf-8')
+
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('ETag', etag)
+                self.send_header('X-RateLimit-Remaining', str(replay.rateLimitRemaining))
+                self.send_header('X-RateLimit-Reset', str(RATE_LIMIT_RESET))
+                for name, value in extraHeaders.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args) -> None:
+                pass
+
+        self.httpServer = server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = 'http://127.0.0.1:{}'.format(self.httpServer.server_address[1])
+
+    def paths(self) -> list:
+        return [path for path, _ in self.requests]
+
+
+@pytest.fixture
+def replayServer():
+    replay = ReplayServer()
+    thread = threading.Thread(target=replay.httpServer.serve_forever, daemon=True)
+    thread.start()
+
+    yield replay
+
+    replay.httpServer.shutdown()
+    replay.httpServer.server_close()
+
+
+@pytest.fixture
+def session(replayServer, tmp_path, monkeypatch):
+    """A session of the replay server, with its own config.json, response store and blob cache."""
+    monkeypatch.setattr(core, 'CONFIG', core.ConfigStore(str(tmp_path / 'config.json')))
+    monkeypatch.setattr(constants, 'GIT_HUB_RESPONSES_PATH', str(tmp_path / 'responses'))
+    monkeypatch.setattr(blobCache, '_cache', blobCache.BlobCache(str(tmp_path / 'blobs'), 1024 * 1024))
+    core.storeConfig(constants.GIT_HUB_DOWNLOADS, 2)
+
+    gitHubSession = auth.GitHubSession('secret', replayServer.url, poolSize=2)
+    monkeypatch.setattr(auth, 'getSession', lambda: gitHubSession)
+
+    yield gitHubSession
+
+    gitHubSession.close()
+
+
+def recordRepository(replayServer: ReplayServer, truncated: bool = False) -> None:
+    repoUrl = replayServer.url + '/repos/owner/repo'
+    blobs = [{'path': path, 'type': 'blob', 'sha': sha} for path, (sha, _) in MODULES.items()]
+
+    replayServer.responses['/repos/owner/repo'] = (200, {
+        'full_name': 'owner/repo',
+        'url': repoUrl,
+        'default_branch': 'main',
+        'clone_url': 'https://github.com/owner/repo.git'
+    })
+
+    if not truncated:
+        replayServer.responses['/repos/owner/repo/git/trees/main?recursive=1'] = (200, {
+            'sha': 't0',
+            'tree': [{'path': 'utils', 'type': 'tree', 'sha': 't1'}] + blobs,
+            'truncated': False
+        })
+    else:
+        replayServer.responses['/repos/owner/repo/git/trees/main?recursive=1'] = (200, {
+            'sha': 't0',
+            'tree': blobs[:1],
+            'truncated': True
+        })
+        replayServer.responses['/repos/owner/repo/git/trees/main'] = (200, {
+            'sha': 't0',
+            'tree': [blobs[0], blobs[2], {'path': 'utils', 'type': 'tree', 'sha': 't1'}]
+        })
+        replayServer.responses['/repos/owner/repo/git/trees/t1'] = (200, {
+            'sha': 't1',
+            'tree': [{'path': 'moduleSearch.py', 'type': 'blob', 'sha': 'b2'}]
+        })
+
+    for sha, text in MODULES.values():
+        replayServer.responses['/repos/owner/repo/git/blobs/' + sha] = (200, {
+            'sha': sha,
+            'encoding': 'base64',
+            'content': base64.b64encode(text.encode('utf-8')).decode('ascii')
+        })
+
+
+def testGetContent(replayServer, session):
+    recordRepository(replayServer)
+    firstCallCount = auth.API_CALLS.count
+
+    files = list(auth.getContent('owner/repo'))
+
+    # Only the modules of the default extensions are downloaded.
+    assert files == [
+        ('core.py', MODULES['core.py'][1].encode('utf-8')),
+        ('utils/moduleSearch.py', MODULES['utils/moduleSearch.py'][1].encode('utf-8'))
+    ]
+    assert sorted(replayServer.paths()) == [
+        '/repos/owner/repo',
+        '/repos/owner/repo/git/blobs/b1',
+        '/repos/owner/repo/git/blobs/b2',
+        '/repos/owner/repo/git/trees/main?recursive=1'
+    ]
+    assert auth.API_CALLS.count - firstCallCount == 4
+    assert all(headers['Authorization'] == 'token secret' for _, headers in replayServer.requests)
+    assert session.rateLimit == (4999, RATE_LIMIT_RESET)
+
+    # The repository is kept, the tree is not modified and the blobs are cached.
+    del replayServer.requests[:]
+    assert list(auth.getContent('owner/repo')) == files
+
+    assert replayServer.paths() == ['/repos/owner/repo/git/trees/main?recursive=1']
+    assert auth.API_CALLS.count - firstCallCount == 5
+    assert session.responses.notModifiedCount == 1
+
+
+def testGetContentOfFolder(replayServer, session):
+    recordRepository(replayServer)
+
+    assert [path for path, _ in auth.getContent('owner/repo', 'utils')] == ['utils/moduleSearch.py']
+
+
+def testGetContentOfTruncatedTree(replayServer, session):
+    recordRepository(replayServer, truncated=True)
+    firstCallCount = auth.API_CALLS.count
+
+    files = list(auth.getContent('owner/repo'))
+
+    assert [path for path, _ in files] == ['core.py', 'utils/moduleSearch.py']
+    assert auth.API_CALLS.count - firstCallCount == 6
+
+    # The sub trees are fetched by their sha, they are never requested again.
+    del replayServer.requests[:]
+    assert list(auth.getContent('owner/repo')) == files
+
+    assert replayServer.paths() == [
+        '/repos/owner/repo/git/trees/main?recursive=1', '/repos/owner/repo/git/trees/main'
+    ]
+    assert session.responses.notModifiedCount == 2
+
+
+def testErrorResponse(replayServer, session):
+    firstCallCount = auth.API_CALLS.count
+
+    with pytest.raises(auth.GithubException) as error:
+        list(auth.getContent('owner/missing'))
+
+    assert error.value.status == 404
+    assert auth.API_CALLS.count - firstCallCount == 1
+
+
+class Clock:
+    """Replaces the clock of the rate limiter, a sleep moves the time forward at once."""
+
+    def __init__(self, monkeypatch) -> None:
+        self.now = 1000.0
+        self.sleeps = []
+
+        monkeypatch.setattr(auth.time, 'time', lambda: self.now)
+        monkeypatch.setattr(auth.time, 'sleep', self.sleep)
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def testRateLimiterWait(monkeypatch):
+    clock = Clock(monkeypatch)
+    session = types.SimpleNamespace(rateLimit=None)
+    rateLimiter = auth.RateLimiter(session)
+
+    # No rate limit headers, or more requests left than the reserve.
+    rateLimiter.wait()
+    session.rateLimit = (auth.RATE_LIMIT_RESERVE + 1, clock.now + 3600)
+    rateLimiter.wait()
+
+    assert clock.sleeps == []
+
+    # Down to the reserve, the download waits until a second after the reset.
+    session.rateLimit = (auth.RATE_LIMIT_RESERVE, clock.now + 2.5)
+    rateLimiter.wait()
+
+    assert clock.sleeps == [1.0, 1.0, 1.0, 0.5]
+    assert clock.now == 1003.5
+
+
+def testRateLimiterCancelled(monkeypatch):
+    clock = Clock(monkeypatch)
+    session = types.SimpleNamespace(rateLimit=(0, clock.now + 3600))
+    rateLimiter = auth.RateLimiter(session, isCancelled=lambda: len(clock.sleeps) == 2)
+
+    rateLimiter.wait()
+
+    assert clock.sleeps == [1.0, 1.0]
+
+
+@pytest.mark.parametrize('headers, attempt, expected', [
+    ({'Retry-After': '3'}, 1, 3.0),
+    ({'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': '1010'}, 1, 11.0),
+    ({'X-RateLimit-Remaining': '5', 'X-RateLimit-Reset': '1010'}, 3, 8.0),
+    ({}, 2, 4.0),
+])
+def testBackOff(monkeypatch, headers, attempt, expected):
+    clock = Clock(monkeypatch)
+    rateLimiter = auth.RateLimiter(types.SimpleNamespace(rateLimit=None))
+
+    rateLimiter.backOff(auth.RateLimitExceededException(403, {}, headers), attempt)
+
+    assert clock.now - 1000.0 == expected
+
+
+def testDownloadBlobRetries(replayServer, session):
+    recordRepository(replayServer)
+    path = '/repos/owner/repo/git/blobs/b1'
+    replayServer.responses[path] = [
+        (429, {'message': 'Too Many Requests'}, {'Retry-After': '0'}),
+        (403, {'message': 'You have exceeded a secondary rate limit'}, {'Retry-After': '0'}),
+        replayServer.responses[path]
+    ]
+    repo = types.SimpleNamespace(url=replayServer.url + '/repos/owner/repo')
+
+    content = auth.downloadBlob(session, repo, 'b1', auth.RateLimiter(session))
+
+    assert content == MODULES['core.py'][1].encode('utf-8')
+    assert replayServer.paths() == [path] * 3
+
+
+def testDownloadBlobGivesUp(replayServer, session):
+    replayServer.responses['/repos/owner/repo/git/blobs/b1'] = (
+        429, {'message': 'Too Many Requests'}, {'Retry-After': '0'}
+    )
+    repo = types.SimpleNamespace(url=replayServer.url + '/repos/owner/repo')
+
+    with pytest.raises(auth.RateLimitExceededException):
+        auth.downloadBlob(session, repo, 'b1', auth.RateLimiter(session))
+
+    assert len(replayServer.requests) == auth.DOWNLOAD_ATTEMPTS
+
+    # A cancelled search sends nothing more.
+    del replayServer.requests[:]
+
+    with pytest.raises(futures.CancelledError):
+        auth.downloadBlob(session, repo, 'b1', auth.RateLimiter(session, isCancelled=lambda: True))
+
+    assert replayServer.requests == []
+
+
+def testDownloadBlobsCancelled(replayServer, session):
+    recordRepository(replayServer)
+    repo = types.SimpleNamespace(url=replayServer.url + '/repos/owner/repo')
+    blobs = [(path, sha) for path, (sha, _) in MODULES.items()]
+    paths = []
+
+    for path, _ in auth.downloadBlobs(session, repo, blobs, 1, isCancelled=lambda: len(paths) == 1):
+        paths.append(path)
+
+    assert paths == ['core.py']
@@ -0,0 +1,86 @@
+"""Tests of the GitHub blob cache, run them from the repository root::
+
+    python -m pytest tests
+"""
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from wordFinder.gitHub.blobCache import BlobCache
+
+
+def testFetchDownloadsOnce(tmp_path):
+    cache = BlobCache(str(tmp_path), 1024)
+    downloads = []
+
+    def download():
+        downloads.append(1)
+        return b'storeConfig = 1\n'
+
+    assert cache.fetch('ab12', download) == b'storeConfig = 1\n'
+    assert cache.fetch('ab12', download) == b'storeConfig = 1\n'
+
+    assert len(downloads) == 1
+    assert cache.stats[:3] == (1, 1, 0)
+    assert os.path.isfile(os.path.join(str(tmp_path), 'ab', 'ab12'))
+
+
+def testEvictsLeastRecentlyUsed(tmp_path):
+    cache = BlobCache(str(tmp_path), 20)
+    cache.put('aa01', b'0123456789')
+    cache.put('bb02', b'0123456789')
+
+    # A hit makes aa01 the most recently used, bb02 goes first.
+    assert cache.get('aa01') is not None
+    cache.put('cc03', b'0123456789')
+
+    assert cache.get('bb02') is None
+    assert cache.get('aa01') is not None
+    assert cache.get('cc03') is not None
+    assert not os.path.exists(os.path.join(str(tmp_path), 'bb', 'bb02'))
+    assert cache.stats.evictions == 1
+    assert cache.stats.size == 20
+
+
+def testOrderSurvivesRestart(tmp_path):
+    cache = BlobCache(str(tmp_path), 20)
+    cache.put('aa01', b'0123456789')
+    cache.put('bb02', b'0123456789')
+    os.utime(os.path.join(str(tmp_path), 'aa', 'aa01'), (1, 1))
+    os.utime(os.path.join(str(tmp_path), 'bb', 'bb02'), (2, 2))
+
+    reopened = BlobCache(str(tmp_path), 20)
+    reopened.put('cc03', b'0123456789')
+
+    assert reopened.get('aa01') is None
+    assert reopened.get('bb02') is not None
+
+
+def testMissingFileIsAMiss(tmp_path):
+    cache = BlobCache(str(tmp_path), 1024)
+    cache.put('aa01', b'0123456789')
+    os.remove(os.path.join(str(tmp_path), 'aa', 'aa01'))
+
+    assert cache.get('aa01') is None
+    assert cache.stats.size == 0
+
+
+def testConcurrentFetches(tmp_path):
+    cache = BlobCache(str(tmp_path), 35)
+    shas = ['{:02x}{:02d}'.format(index, index) for index in range(8)]
+
+    def fetchAll():
+        for sha in shas * 5:
+            assert cache.fetch(sha, lambda: sha.encode() * 2) == sha.encode() * 2
+
+    threads = [threading.Thread(target=fetchAll) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = cache.stats
+    assert stats.size <= 35
+    assert stats.hits + stats.misses == 8 * 8 * 5
@@ -0,0 +1,130 @@
+"""Tests of the config.json store, run them from the repository root::
+
+    python -m pytest tests
+"""
+import os
+import sys
+import json
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import pytest
+
+from wordFinder import constants
+from wordFinder import core
+
+
+@pytest.fixture
+def writes(monkeypatch):
+    """The paths the config.json has been renamed to, one per write."""
+    replacedPaths = []
+    replace = os.replace
+
+    def countedReplace(source, destination):
+        replacedPaths.append(destination)
+        replace(source, destination)
+
+    monkeypatch.setattr(core.os, 'replace', countedReplace)
+
+    return replacedPaths
+
+
+@pytest.fixture
+def store(tmp_path):
+    configStore = core.ConfigStore(str(tmp_path / 'config.json'))
+    configStore.WRITE_DELAY = 0.1
+
+    yield configStore
+
+    configStore.flush()
+
+
+def readConfig(store: core.ConfigStore) -> dict:
+    with open(store.path, 'r') as readFile:
+        return json.load(readFile)
+
+
+def testChangesAreWrittenOnce(store, writes):
+    assert not store.exists()
+
+    for index in range(10):
+        store.set(constants.SEARCH_PATH, '/project/{}'.format(index))
+
+    # Nothing is written until the changes stop.
+    assert writes == []
+    assert store.get(constants.SEARCH_PATH) == '/project/9'
+
+    deadline = time.monotonic() + 5
+    while not writes and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+    assert writes == [store.path]
+    assert readConfig(store)[constants.SEARCH_PATH] == '/project/9'
+
+    # The first change starts from the default configuration.
+    assert readConfig(store)[constants.GIT_HUB_DOWNLOADS] == constants.DEFAULT_CONFIG[constants.GIT_HUB_DOWNLOADS]
+
+
+def testFlush(store, writes):
+    store.set(constants.SEARCH_PATH, '/project')
+    store.flush()
+
+    assert writes == [store.path]
+    assert readConfig(store)[constants.SEARCH_PATH] == '/project'
+
+    # Nothing is pending anymore, the timer is cancelled.
+    store.flush()
+    time.sleep(store.WRITE_DELAY * 2)
+
+    assert writes == [store.path]
+
+
+def testAtomicWrite(store, monkeypatch):
+    store.reset({constants.SEARCH_PATH: '/project'})
+
+    def failingDump(*args, **kwargs):
+        raise ValueError("Not serializable")
+
+    monkeypatch.setattr(core.json, 'dump', failingDump)
+    store.set(constants.SEARCH_PATH, '/other')
+
+    with pytest.raises(ValueError):
+        store.flush()
+
+    monkeypatch.undo()
+
+    # The previous config.json is left whole and the temporary file is removed.
+    assert readConfig(store) == {constants.SEARCH_PATH: '/project'}
+    assert os.listdir(os.path.dirname(store.path)) == ['config.json']
+
+
+def testReadOnce(store):
+    store.reset({constants.SEARCH_PATH: '/project'})
+    reopened = core.ConfigStore(store.path)
+
+    assert reopened.get(constants.SEARCH_PATH) == '/project'
+
+    with open(store.path, 'w') as writeFile:
+        json.dump({constants.SEARCH_PATH: '/other'}, writeFile)
+
+    assert reopened.get(constants.SEARCH_PATH) == '/project'
+    assert reopened.asDict() == {constants.SEARCH_PATH: '/project'}
+
+
+def testContains(store):
+    store.reset({constants.LOCAL_CHECKED_MODULES: ['core', 'utils']})
+
+    assert store.contains(constants.LOCAL_CHECKED_MODULES, 'core')
+    assert not store.contains(constants.LOCAL_CHECKED_MODULES, 'widgets')
+    assert not store.contains(constants.SEARCH_PATH, 'core')
+
+    # A change of the list drops its set.
+    store.set(constants.LOCAL_CHECKED_MODULES, ['widgets'])
+
+    assert store.contains(constants.LOCAL_CHECKED_MODULES, 'widgets')
+    assert not store.contains(constants.LOCAL_CHECKED_MODULES, 'core')
+
+    store.reset({})
+
+    assert not store.contains(constants.LOCAL_CHECKED_MODULES, 'widgets')
@@ -0,0 +1,154 @@
+"""Tests of the search engine, run them from the repository root::
+
+    python -m pytest tests
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import pytest
+
+from wordFinder import constants
+from wordFinder import engine
+from wordFinder.utils import moduleSearch
+from wordFinder.utils import resultCache
+from wordFinder.utils import trigramIndex
+from wordFinder.utils.sentenceProcess import SearchQuery
+
+
+@pytest.fixture
+def modulePaths(tmp_path):
+    paths = []
+
+    for index in range(3):
+        path = tmp_path / 'module{}.py'.format(index)
+        path.write_text("storeConfig = 1\nvalue = storeConfig\n", encoding='utf-8')
+        paths.append(str(path))
+
+    return paths
+
+
+@pytest.mark.parametrize('useCache', [False, True])
+@pytest.mark.parametrize('maxMatches, expectedCount', [(2, 2), (1000, 6)])
+def testMaxMatches(modulePaths, useCache, maxMatches, expectedCount):
+    cache = resultCache.ResultCache(1024 * 1024) if useCache else None
+    options = engine.SearchOptions(maxMatches=maxMatches, resultCache=cache)
+
+    matches = list(engine.search(SearchQuery('storeConfig'), modulePaths, options))
+
+    assert len(matches) == expectedCount
+    assert [match.lineNumber for match in matches] == [1, 2, 1, 2, 1, 2][:expectedCount]
+
+
+def testMaxMatchesOfStreamedSources():
+    sources = (engine.TextSource('module{}.py'.format(index), "storeConfig\n" * 3) for index in range(3))
+
+    matches = list(engine.search(SearchQuery('storeConfig'), sources, engine.SearchOptions(maxMatches=4)))
+
+    assert [(match.path, match.lineNumber) for match in matches] == [
+        ('module0.py', 1), ('module0.py', 2), ('module0.py', 3), ('module1.py', 1)
+    ]
+
+
+def testStaleIndex(tmp_path, monkeypatch):
+    monkeypatch.setattr(constants, 'INDEX_PATH', str(tmp_path / 'index.pickle'))
+
+    package = tmp_path / 'package'
+    package.mkdir()
+    modulePath = package / 'module.py'
+    modulePath.write_text("other = 1\n", encoding='utf-8')
+
+    trigramIndex.rebuildIndex(str(tmp_path))
+
+    # Edited after the index was built, the index is not updated before the search.
+    modulePath.write_text("value = storeConfig\n", encoding='utf-8')
+
+    options = engine.SearchOptions(searchPath=str(tmp_path))
+    matches = list(engine.search(SearchQuery('storeConfig'), [str(modulePath)], options))
+
+    assert [match.line for match in matches] == ["value = storeConfig"]
+
+
+def testIndexedSearchStatsOnlyOnceCandidatesAreScanned(tmp_path, monkeypatch):
+    monkeypatch.setattr(constants, 'INDEX_PATH', str(tmp_path / 'index.pickle'))
+
+    package = tmp_path / 'package'
+    package.mkdir()
+    modulePaths = []
+    for index, text in enumerate(["storeConfig = 1\n", "other = 1\n"]):
+        modulePath = package / 'module{}.py'.format(index)
+        modulePath.write_text(text, encoding='utf-8')
+        modulePaths.append(str(modulePath))
+
+    trigramIndex.rebuildIndex(str(tmp_path))
+
+    checkedPaths = []
+    changedPaths = trigramIndex.TrigramIndex.changedPaths
+
+    def spyChangedPaths(index, paths):
+        checkedPaths.extend(paths)
+        return changedPaths(index, paths)
+
+    monkeypatch.setattr(trigramIndex.TrigramIndex, 'changedPaths', spyChangedPaths)
+
+    options = engine.SearchOptions(searchPath=str(tmp_path), maxMatches=1)
+    assert len(list(engine.search(SearchQuery('storeConfig'), modulePaths, options))) == 1
+    assert checkedPaths == []
+
+    options = engine.SearchOptions(searchPath=str(tmp_path))
+    assert len(list(engine.search(SearchQuery('storeConfig'), modulePaths, options))) == 1
+    assert checkedPaths == modulePaths[1:]
+
+
+@pytest.fixture
+def manyModulePaths(tmp_path, monkeypatch):
+    """Enough modules for the worker processes, the first ones are the largest so their shards end last."""
+    monkeypatch.setattr(moduleSearch, 'SHARD_SIZE', 16)
+
+    paths = []
+    for packageIndex in range(2):
+        package = tmp_path / 'package{}'.format(packageIndex)
+        package.mkdir()
+
+        for index in range(moduleSearch.PARALLEL_SEARCH_MIN_MODULES // 2 + 10):
+            lines = ["value = {}\n".format(line) for line in range(2000 if index < 16 else 10)]
+            lines[index % len(lines)] = "storeConfig = {}\n".format(index)
+            lines.append("storeConfig()\n")
+
+            path = package / 'module{:03d}.py'.format(index)
+            path.write_text(''.join(lines), encoding='utf-8')
+            paths.append(str(path))
+
+    yield paths
+
+    executor = moduleSearch._executor
+    if executor is not None:
+        moduleSearch._executor = None
+        executor.shutdown()
+
+
+def testShardedSearchOrder(manyModulePaths):
+    progress = []
+    query = SearchQuery('storeConfig')
+
+    sequentialMatches = list(engine.search(query, manyModulePaths, engine.SearchOptions(numberOfExtraLine=1)))
+    options = engine.SearchOptions(numberOfExtraLine=1, workers=4, progress=lambda *args: progress.append(args))
+    parallelMatches = list(engine.search(query, manyModulePaths, options))
+
+    assert moduleSearch.isParallelSearch(len(manyModulePaths), 4)
+    assert len(parallelMatches) == 2 * len(manyModulePaths)
+    assert parallelMatches == sequentialMatches
+    assert progress[-1] == (len(manyModulePaths), len(manyModulePaths))
+    assert len(progress) == len(manyModulePaths) // moduleSearch.SHARD_SIZE + 1
+
+
+def testShardedSearchStopsAtMaxMatches(manyModulePaths):
+    options = engine.SearchOptions(workers=4, maxMatches=5)
+
+    matches = list(engine.search(SearchQuery('storeConfig'), manyModulePaths, options))
+
+    assert [(match.path, match.lineNumber) for match in matches] == [
+        (manyModulePaths[0], 1), (manyModulePaths[0], 2001), (manyModulePaths[1], 2), (manyModulePaths[1], 2001),
+        (manyModulePaths[2], 3)
+    ]
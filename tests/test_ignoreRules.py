@@ -0,0 +1,165 @@
+"""Tests of the ignore rules of the module walkers, run them from the repository root::
+
+    python -m pytest tests
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import pytest
+
+from wordFinder import constants
+from wordFinder import core
+from wordFinder.utils import ignoreRules
+from wordFinder.utils import moduleWalker
+
+
+def writeFiles(root, files: dict) -> None:
+    for relativePath, text in files.items():
+        path = root / relativePath
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding='utf-8')
+
+
+def walkedPaths(root, rules: ignoreRules.WalkRules) -> list:
+    return sorted(
+        os.path.relpath(entry.path, str(root)).replace(os.sep, '/')
+        for entry in moduleWalker.scanModules(str(root), rules)
+    )
+
+
+@pytest.mark.parametrize('pattern, relativePath, isDirectory, expected', [
+    ('*.pyc', 'module.pyc', False, True),
+    ('*.pyc', 'package/module.pyc', False, True),
+    ('build/', 'package/build', True, True),
+    ('build/', 'package/build', False, False),
+    ('/build', 'build', True, True),
+    ('/build', 'package/build', True, False),
+    ('package/*.py', 'package/module.py', False, True),
+    ('package/*.py', 'package/sub/module.py', False, False),
+    ('package/**/*.py', 'package/sub/module.py', False, True),
+    ('**/generated', 'package/generated', True, True),
+    ('module?.py', 'module1.py', False, True),
+    ('module[!0-9].py', 'module1.py', False, False),
+    ('\\#module.py', '#module.py', False, True),
+    ('# comment', '# comment', False, False),
+])
+def testPattern(pattern, relativePath, isDirectory, expected):
+    scope = ignoreRules.IgnoreScope((('', '', ignoreRules.compilePatterns([pattern])),))
+
+    assert scope.isIgnored('/' + relativePath, isDirectory) is expected
+
+
+def testIgnoreFiles(tmp_path):
+    writeFiles(tmp_path, {
+        '.gitignore': "*_tmp.py\nbuild/\n",
+        '.ignore': "!kept_tmp.py\n",
+        'module.py': "",
+        'module_tmp.py': "",
+        'kept_tmp.py': "",
+        'build/module.py': "",
+        'package/.gitignore': "!module_tmp.py\nmodule.py\n",
+        'package/module.py': "",
+        'package/module_tmp.py': "",
+        'package/other.py': "",
+    })
+
+    # The .ignore wins over the .gitignore of its folder, a deeper file wins over both.
+    assert walkedPaths(tmp_path, ignoreRules.WalkRules()) == [
+        'kept_tmp.py', 'module.py', 'package/module_tmp.py', 'package/other.py'
+    ]
+
+
+def testParentIgnoreFiles(tmp_path):
+    writeFiles(tmp_path, {
+        '.git/HEAD': "",
+        '.gitignore': "project/skipped.py\n*.generated.py\n",
+        'project/module.py': "",
+        'project/skipped.py': "",
+        'project/module.generated.py': "",
+    })
+
+    # The ignore files of the parent folders apply up to the root of the git repository.
+    assert walkedPaths(tmp_path / 'project', ignoreRules.WalkRules()) == ['module.py']
+
+
+def testParentIgnoreFilesOutsideRepository(tmp_path):
+    writeFiles(tmp_path, {
+        '.gitignore': "*.generated.py\n",
+        'project/module.py': "",
+        'project/module.generated.py': "",
+    })
+
+    assert walkedPaths(tmp_path / 'project', ignoreRules.WalkRules()) == ['module.generated.py', 'module.py']
+
+
+def testGlobsAndExtensions(tmp_path):
+    writeFiles(tmp_path, {
+        '.gitignore': "!node_modules/\n",
+        'module.py': "",
+        'module.pyi': "",
+        'README.md': "",
+        '__init__.py': "",
+        'node_modules/module.py': "",
+        'tests/test_module.py': "",
+        'package/module.py': "",
+    })
+
+    rules = ignoreRules.WalkRules(('.py', '.pyi'), includeGlobs=['*.py', '*.pyi'], excludeGlobs=['node_modules/'])
+
+    # The ignore files win over the exclude globs of the config.json.
+    assert walkedPaths(tmp_path, rules) == [
+        'module.py', 'module.pyi', 'node_modules/module.py', 'package/module.py', 'tests/test_module.py'
+    ]
+
+    rules = ignoreRules.WalkRules(('.py',), includeGlobs=['tests/**'], excludeGlobs=['package/'])
+
+    assert walkedPaths(tmp_path, rules) == ['tests/test_module.py']
+
+
+def testIgnoreFileIsReadAgainOnceChanged(tmp_path):
+    writeFiles(tmp_path, {'.gitignore': "skipped.py\n", 'module.py': "", 'skipped.py': ""})
+
+    assert walkedPaths(tmp_path, ignoreRules.WalkRules()) == ['module.py']
+
+    (tmp_path / '.gitignore').write_text("module.py\n# and nothing else\n", encoding='utf-8')
+
+    assert walkedPaths(tmp_path, ignoreRules.WalkRules()) == ['skipped.py']
+
+
+@pytest.mark.parametrize('relativePath, expected', [
+    ('module.py', True),
+    ('package/module.py', True),
+    ('README.md', False),
+    ('package/__init__.py', False),
+    ('docs/module.py', False),
+    ('node_modules/package/module.py', False),
+    ('package/module_tmp.py', False),
+])
+def testIsSearchedPath(relativePath, expected):
+    rules = ignoreRules.WalkRules(('.py',), excludeGlobs=['node_modules/', '*_tmp.py'])
+
+    assert rules.isSearchedPath(relativePath) is expected
+
+
+def testWalkRulesOfConfig(tmp_path, monkeypatch):
+    monkeypatch.setattr(core, 'CONFIG', core.ConfigStore(str(tmp_path / 'config.json')))
+    core.makeDefaultConfig()
+
+    rules = ignoreRules.walkRules()
+
+    assert rules.extensions == ('.py',)
+    assert not rules.isSearchedPath('.venv/module.py')
+    assert ignoreRules.walkRules() is rules
+
+    # The rules are compiled again once the config.json changes.
+    core.storeConfig(constants.MODULE_EXTENSIONS, ['.py', '.md'])
+    core.storeConfig(constants.EXCLUDE_GLOBS, [])
+
+    rules = ignoreRules.walkRules()
+
+    assert rules.isSearchedPath('README.md')
+    assert rules.isSearchedPath('.venv/module.py')
+
+    core.flushConfig()
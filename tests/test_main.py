@@ -0,0 +1,31 @@
+"""Tests of the command line, run them from the repository root::
+
+    python -m pytest tests
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from wordFinder import constants
+from wordFinder import __main__ as commandLine
+from wordFinder.utils import trigramIndex
+
+
+def testSearchWithStaleIndex(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(constants, 'INDEX_PATH', str(tmp_path / 'index.pickle'))
+
+    package = tmp_path / 'package'
+    package.mkdir()
+    modulePath = package / 'module.py'
+    modulePath.write_text("other = 1\n", encoding='utf-8')
+
+    trigramIndex.rebuildIndex(str(tmp_path))
+
+    # Edited after the index was built, the command line doesn't update the index.
+    modulePath.write_text("value = storeConfig\n", encoding='utf-8')
+
+    status = commandLine.main(['search', 'storeConfig', '--search-path', str(tmp_path), '-j', '1'])
+
+    assert status == 0
+    assert capsys.readouterr().out == "{}:1:value = storeConfig\n".format(modulePath)
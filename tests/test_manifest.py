@@ -0,0 +1,83 @@
+"""Tests of the manifests of the search path, run them from the repository root::
+
+    python -m pytest tests
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import pytest
+
+from wordFinder.utils import manifest
+
+
+@pytest.fixture
+def searchPath(tmp_path):
+    for relativePath in ('package/core.py', 'package/utils/config.py', 'package/deleted.py', 'other/module.py'):
+        path = tmp_path / relativePath
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("storeConfig = 1\n", encoding='utf-8')
+
+    return tmp_path
+
+
+def touch(path, content: str = None) -> None:
+    """Writes the module again, or only moves its modification time forward."""
+    if content is not None:
+        path.write_text(content, encoding='utf-8')
+
+    stat = os.stat(str(path))
+    os.utime(str(path), ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000000))
+
+
+def testScan(searchPath):
+    scanned = manifest.Manifest.scan(str(searchPath))
+
+    assert sorted(os.path.relpath(path, str(searchPath)) for path in scanned.paths()) == [
+        os.path.join('other', 'module.py'),
+        os.path.join('package', 'core.py'),
+        os.path.join('package', 'deleted.py'),
+        os.path.join('package', 'utils', 'config.py'),
+    ]
+    assert all(scanned.isCurrent(path) for path in scanned.paths())
+    assert not manifest.Manifest.scan(str(searchPath)).diff(manifest.Manifest.scan(str(searchPath)))
+
+
+def testDiff(searchPath):
+    older = manifest.Manifest.scan(str(searchPath))
+
+    (searchPath / 'package' / 'added.py').write_text("storeConfig = 2\n", encoding='utf-8')
+    touch(searchPath / 'package' / 'core.py', "storeConfig = 10\n")
+    touch(searchPath / 'other' / 'module.py')
+    (searchPath / 'package' / 'deleted.py').unlink()
+
+    diff = older.diff(manifest.Manifest.scan(str(searchPath)))
+
+    # Without a digest, a module whose modification time moved is a change even if its content is the same.
+    assert diff
+    assert diff.added == [str(searchPath / 'package' / 'added.py')]
+    assert sorted(diff.changed) == [str(searchPath / 'other' / 'module.py'), str(searchPath / 'package' / 'core.py')]
+    assert diff.deleted == [str(searchPath / 'package' / 'deleted.py')]
+    assert not older.isCurrent(str(searchPath / 'package' / 'core.py'))
+
+
+def testTouchedModuleWithDigest(searchPath):
+    modulePath = str(searchPath / 'package' / 'core.py')
+    older = manifest.Manifest.scan(str(searchPath))
+    with open(modulePath, 'rb') as reader:
+        older.set(modulePath, manifest.readFingerprint(modulePath, reader.read()))
+
+    touch(searchPath / 'package' / 'core.py')
+    diff = older.diff(manifest.Manifest.scan(str(searchPath)))
+
+    # The content is the same, the fingerprint is updated so the module is current again.
+    assert not diff
+    assert older.isCurrent(modulePath)
+    assert older.fingerprints[modulePath].digest == manifest.contentDigest(b"storeConfig = 1\n")
+
+    # The same size with another content is a change.
+    touch(searchPath / 'package' / 'core.py', "storeConfig = 2\n")
+    diff = older.diff(manifest.Manifest.scan(str(searchPath)))
+
+    assert diff == manifest.ManifestDiff([], [modulePath], [])
@@ -0,0 +1,129 @@
+"""Tests of the local mirrors of the GitHub repositories, synced from a bare repository over file://, run them from
+the repository root::
+
+    python -m pytest tests
+"""
+import os
+import sys
+import shutil
+import subprocess
+import types
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import pytest
+
+from wordFinder import constants
+from wordFinder import core
+from wordFinder import engine
+from wordFinder.gitHub import mirror
+from wordFinder.utils.sentenceProcess import SearchQuery
+
+
+pytestmark = pytest.mark.skipif(shutil.which(mirror.GIT) is None, reason="git is not installed")
+
+
+def git(*arguments: str, cwd: str = None) -> None:
+    subprocess.run(
+        [mirror.GIT, '-c', 'user.name=Word Finder', '-c', 'user.email=wordFinder@example.com'] + list(arguments),
+        cwd=cwd,
+        check=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+
+
+def commit(workingPath: str, modules: dict) -> None:
+    """Commits the provided modules, their relative path and their text, and pushes them to the bare repository."""
+    for relativePath, text in modules.items():
+        modulePath = os.path.join(workingPath, relativePath)
+        os.makedirs(os.path.dirname(modulePath), exist_ok=True)
+
+        with open(modulePath, 'w', encoding='utf-8') as writer:
+            writer.write(text)
+
+    git('add', '--all', cwd=workingPath)
+    git('commit', '--quiet', '-m', 'Edit the modules', cwd=workingPath)
+    git('push', '--quiet', 'origin', 'main', cwd=workingPath)
+
+
+@pytest.fixture
+def bareRepository(tmp_path, monkeypatch):
+    """A bare repository and its working copy, the mirrors and the config.json are kept in the temporary folder."""
+    monkeypatch.setattr(constants, 'GIT_HUB_MIRRORS_PATH', str(tmp_path / 'mirrors'))
+    monkeypatch.setattr(core, 'CONFIG', core.ConfigStore(str(tmp_path / 'config.json')))
+
+    barePath = str(tmp_path / 'repo.git')
+    workingPath = str(tmp_path / 'working')
+
+    git('init', '--quiet', '--bare', '--initial-branch', 'main', barePath)
+    git('clone', '--quiet', barePath, workingPath)
+    git('checkout', '--quiet', '-b', 'main', cwd=workingPath)
+    commit(workingPath, {'core.py': "def storeConfig():\n    pass\n", 'README.md': "storeConfig\n"})
+
+    return 'file://' + barePath, workingPath
+
+
+def searchMirror(path: str, word: str) -> list:
+    matches = engine.search(SearchQuery(word), mirror.mirrorModulePaths(path))
+
+    return [(os.path.relpath(match.path, path), match.line) for match in matches]
+
+
+def testSyncTwice(bareRepository):
+    cloneUrl, workingPath = bareRepository
+
+    path = mirror.syncMirror('owner/repo', cloneUrl, 'main')
+
+    assert path == mirror.mirrorPath('owner/repo')
+    assert searchMirror(path, 'storeConfig') == [('core.py', "def storeConfig():")]
+    assert not os.path.exists(path + '.partial')
+
+    commit(workingPath, {
+        'core.py': "def getConfigValueByName():\n    pass\n",
+        os.path.join('utils', 'config.py'): "storeConfig = None\n"
+    })
+
+    # Fetched then reset on the last commit, the mirror is not cloned again.
+    assert mirror.syncMirror('owner/repo', cloneUrl, 'main') == path
+
+    assert searchMirror(path, 'storeConfig') == [(os.path.join('utils', 'config.py'), "storeConfig = None")]
+    assert searchMirror(path, 'getConfigValueByName') == [('core.py', "def getConfigValueByName():")]
+
+
+def testSyncUnknownBranch(bareRepository):
+    cloneUrl, _ = bareRepository
+
+    with pytest.raises(mirror.MirrorError):
+        mirror.syncMirror('owner/repo', cloneUrl, 'missing')
+
+    assert not os.path.exists(mirror.mirrorPath('owner/repo'))
+
+
+def testMirrorSearchWorker(bareRepository, monkeypatch):
+    pytest.importorskip('PySide2')
+    pytest.importorskip('github')
+
+    from wordFinder.gitHub import auth
+    from wordFinder.widgets import workers
+
+    cloneUrl, _ = bareRepository
+
+    repositories = {
+        'owner/repo': types.SimpleNamespace(full_name='owner/repo', clone_url=cloneUrl, default_branch='main'),
+        'owner/missing': types.SimpleNamespace(full_name='owner/missing', clone_url=cloneUrl, default_branch='missing'),
+    }
+    session = types.SimpleNamespace(repository=repositories.__getitem__, gitHubToken='')
+    monkeypatch.setattr(auth, 'getSession', lambda: session)
+
+    worker = workers.MirrorSearchWorker(SearchQuery('storeConfig'), ['owner/missing', 'owner/repo'])
+    matches, messages, finished = [], [], []
+    worker.signals.matchesFound.connect(matches.extend)
+    worker.signals.message.connect(messages.append)
+    worker.signals.finished.connect(finished.append)
+
+    worker.run()
+
+    assert [(os.path.basename(match.path), match.line) for match in matches] == [('core.py', "def storeConfig():")]
+    assert len(messages) == 1 and messages[0].startswith("Cannot sync owner/missing")
+    assert finished == [1]
@@ -0,0 +1,38 @@
+"""Tests of the module scanner, run them from the repository root::
+
+    python -m pytest tests
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import pytest
+
+from wordFinder.utils import moduleSearch
+from wordFinder.utils.sentenceProcess import SearchQuery
+
+
+@pytest.fixture
+def latinTailModule(tmp_path):
+    """A module whose sniffed head is ASCII, with a Latin-1 line past it."""
+    modulePath = tmp_path / 'module.py'
+    modulePath.write_bytes(b'# padding\n' * (moduleSearch.SNIFF_SIZE // 10 + 1) + 'value = "café"\n'.encode('latin-1'))
+
+    return str(modulePath)
+
+
+def matchingLines(modulePath, query):
+    return [line for block in moduleSearch.searchModule(modulePath, query) for _, line, isMatch in block if isMatch]
+
+
+@pytest.mark.parametrize('word', ['café', 'value'])
+def testLatinBytePastTheHead(latinTailModule, word):
+    # "value" goes through the ASCII bytes prefilter, "café" through the decoded module.
+    assert matchingLines(latinTailModule, SearchQuery(word)) == ['value = "café"\n']
+
+
+def testSniffEncoding():
+    assert moduleSearch.sniffEncoding(b'value = 1\n') == 'utf-8'
+    assert moduleSearch.sniffEncoding('café'.encode('latin-1')) == moduleSearch.FALLBACK_ENCODING
+    assert moduleSearch.sniffEncoding(b'\x00\x01') is None
@@ -0,0 +1,66 @@
+"""Tests of the module walkers, run them from the repository root::
+
+    python -m pytest tests
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from wordFinder.utils import ignoreRules
+from wordFinder.utils import moduleWalker
+
+
+def testWalkersAgree(tmp_path):
+    files = {
+        '.gitignore': "generated/\n*_tmp.py\n",
+        'module.py': "",
+        'module_tmp.py': "",
+        'sub/module.py': "",
+        'sub/.ignore': "skipped.py\n",
+        'sub/skipped.py': "",
+        'generated/module.py': "",
+        'docs/module.py': "",
+        'README.md': "",
+    }
+    for relativePath, text in files.items():
+        path = tmp_path / relativePath
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding='utf-8')
+
+    root = str(tmp_path)
+    rules = ignoreRules.WalkRules(extensions=('.py',))
+    expected = [os.path.join(root, 'module.py'), os.path.join(root, 'sub', 'module.py')]
+
+    assert sorted(modulePath for _, modulePath in moduleWalker.walkModules(root, rules)) == expected
+    assert sorted(entry.path for entry in moduleWalker.scanModules(root, rules)) == expected
+
+    tree = moduleWalker.ModuleTree()
+    for _ in range(2):
+        # The second walk is served from the listed folders.
+        assert sorted(modulePath for _, modulePath in tree.walkModules(root, rules)) == expected
+
+
+def testUnreadableFolderIsSkipped(tmp_path, monkeypatch):
+    for relativePath in ('module.py', 'locked/module.py', 'other/module.py'):
+        path = tmp_path / relativePath
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("", encoding='utf-8')
+
+    root = str(tmp_path)
+    lockedPath = os.path.join(root, 'locked')
+    scandir = os.scandir
+
+    def lockedScandir(path):
+        if path == lockedPath:
+            raise PermissionError(13, "Permission denied", path)
+        return scandir(path)
+
+    # Root can read any folder, the permission error is raised by hand.
+    monkeypatch.setattr(os, 'scandir', lockedScandir)
+
+    rules = ignoreRules.WalkRules(extensions=('.py',))
+    expected = [os.path.join(root, 'module.py'), os.path.join(root, 'other', 'module.py')]
+
+    assert sorted(modulePath for _, modulePath in moduleWalker.walkModules(root, rules)) == expected
+    assert sorted(modulePath for _, modulePath in moduleWalker.ModuleTree().walkModules(root, rules)) == expected
@@ -0,0 +1,157 @@
+"""Tests of the result cache, run them from the repository root::
+
+    python -m pytest tests
+"""
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import pytest
+
+from wordFinder import engine
+from wordFinder.utils import moduleSearch
+from wordFinder.utils import resultCache
+from wordFinder.utils.sentenceProcess import SearchQuery
+
+
+def testCountersFromThreads(tmp_path):
+    modulePath = tmp_path / 'module.py'
+    modulePath.write_text("storeConfig = 1\n", encoding='utf-8')
+
+    cache = resultCache.ResultCache(1024 * 1024)
+    query = SearchQuery('storeConfig')
+    modulePaths = [str(modulePath)]
+    key = cache.key(query, modulePaths)
+    cache.put(key, query, resultCache.fingerprints(modulePaths), 0, [], [])
+
+    def lookUp() -> None:
+        for _ in range(200):
+            cache.get(key)
+            cache.get(cache.key(SearchQuery('other'), modulePaths))
+
+    threads = [threading.Thread(target=lookUp) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert (cache.stats.hits, cache.stats.misses) == (8 * 200, 8 * 200)
+
+
+@pytest.fixture
+def scannedPaths(monkeypatch):
+    """Records the modules read from the disk."""
+    paths = []
+    searchModule = moduleSearch.searchModule
+
+    def recordedSearchModule(modulePath, *args, **kwargs):
+        paths.append(modulePath)
+        return searchModule(modulePath, *args, **kwargs)
+
+    monkeypatch.setattr(moduleSearch, 'searchModule', recordedSearchModule)
+
+    return paths
+
+
+@pytest.fixture
+def modulePaths(tmp_path):
+    paths = []
+
+    for index, text in enumerate(["a = 1\nstoreConfig = 1\nb = 2\n", "other = 1\n", "c = 3\nstoreConfig()\nd = 4\n"]):
+        path = tmp_path / 'module{}.py'.format(index)
+        path.write_text(text, encoding='utf-8')
+        paths.append(str(path))
+
+    return paths
+
+
+def testLargerContextOnlyScansMatchingModules(modulePaths, scannedPaths):
+    cache = resultCache.ResultCache(1024 * 1024)
+    query = SearchQuery('storeConfig')
+
+    list(engine.search(query, modulePaths, engine.SearchOptions(resultCache=cache)))
+    del scannedPaths[:]
+
+    matches = list(engine.search(query, modulePaths, engine.SearchOptions(numberOfExtraLine=1, resultCache=cache)))
+
+    assert scannedPaths == [modulePaths[0], modulePaths[2]]
+    assert [(match.before, match.after) for match in matches] == [
+        (((1, "a = 1"),), ((3, "b = 2"),)), (((1, "c = 3"),), ((3, "d = 4"),))
+    ]
+
+    # The smaller context is sliced from the cache.
+    del scannedPaths[:]
+    matches = list(engine.search(query, modulePaths, engine.SearchOptions(resultCache=cache)))
+
+    assert scannedPaths == []
+    assert [(match.before, match.after) for match in matches] == [((), ()), ((), ())]
+
+
+def testCappedSearchIsCached(modulePaths, scannedPaths):
+    cache = resultCache.ResultCache(1024 * 1024)
+    query = SearchQuery('storeConfig')
+    options = engine.SearchOptions(maxMatches=1, resultCache=cache)
+
+    assert [match.path for match in engine.search(query, modulePaths, options)] == modulePaths[:1]
+    del scannedPaths[:]
+
+    assert [match.path for match in engine.search(query, modulePaths, options)] == modulePaths[:1]
+    assert scannedPaths == []
+
+    # The capped search can't narrow the uncapped one, its last modules were not scanned.
+    matches = list(engine.search(query, modulePaths, engine.SearchOptions(resultCache=cache)))
+
+    assert [match.path for match in matches] == [modulePaths[0], modulePaths[2]]
+    assert scannedPaths == modulePaths
+
+
+def testNarrowerQueryOnlyScansMatchingModules(modulePaths, scannedPaths):
+    cache = resultCache.ResultCache(1024 * 1024)
+
+    list(engine.search(SearchQuery('storeConfig'), modulePaths, engine.SearchOptions(resultCache=cache)))
+    del scannedPaths[:]
+
+    matches = list(engine.search(SearchQuery('storeConfig('), modulePaths, engine.SearchOptions(resultCache=cache)))
+
+    assert [match.path for match in matches] == modulePaths[2:]
+    assert scannedPaths == [modulePaths[0], modulePaths[2]]
+
+    # A query that is not narrower scans every module.
+    del scannedPaths[:]
+    matches = list(engine.search(SearchQuery('other'), modulePaths, engine.SearchOptions(resultCache=cache)))
+
+    assert [match.path for match in matches] == modulePaths[1:2]
+    assert scannedPaths == modulePaths
+
+
+def testNarrowedSearchScansChangedModules(modulePaths, scannedPaths, tmp_path):
+    cache = resultCache.ResultCache(1024 * 1024)
+    (tmp_path / 'module3.py').write_text("unchanged = 1\n", encoding='utf-8')
+    modulePaths.append(str(tmp_path / 'module3.py'))
+
+    list(engine.search(SearchQuery('storeConfig'), modulePaths, engine.SearchOptions(resultCache=cache)))
+    del scannedPaths[:]
+
+    with open(modulePaths[1], 'a', encoding='utf-8') as writer:
+        writer.write("storeConfig(other)\n")
+    stat = os.stat(modulePaths[1])
+    os.utime(modulePaths[1], ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000000))
+
+    matches = list(engine.search(SearchQuery('storeConfig('), modulePaths, engine.SearchOptions(resultCache=cache)))
+
+    assert [match.path for match in matches] == modulePaths[1:3]
+    assert scannedPaths == modulePaths[:3]
+
+
+@pytest.mark.parametrize('word, mode, ignoreCase, previous, expected', [
+    ('storeConfigValue', SearchQuery.LITERAL, False, SearchQuery('storeConfig'), True),
+    ('storeConfig', SearchQuery.LITERAL, False, SearchQuery('storeConfigValue'), False),
+    (r'storeConfig\w*\(', SearchQuery.REGEX, False, SearchQuery('storeConfig'), True),
+    ('STORECONFIGVALUE', SearchQuery.LITERAL, False, SearchQuery('storeConfig', ignoreCase=True), True),
+    ('storeConfigValue', SearchQuery.LITERAL, True, SearchQuery('storeConfig'), False),
+    ('storeConfigValue', SearchQuery.LITERAL, False, SearchQuery('storeConfig', SearchQuery.WHOLE_WORD), False),
+])
+def testIsNarrowerThan(word, mode, ignoreCase, previous, expected):
+    assert SearchQuery(word, mode, ignoreCase).isNarrowerThan(previous) is expected
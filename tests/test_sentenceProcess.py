@@ -0,0 +1,97 @@
+"""Tests of the search queries, run them from the repository root::
+
+    python -m pytest tests
+"""
+import os
+import re
+import sys
+import pickle
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import pytest
+
+from wordFinder import engine
+from wordFinder.utils.sentenceProcess import SearchQuery
+
+
+def testIgnoreCaseBytesPrefilter():
+    assert SearchQuery('Value', ignoreCase=True).bytesPrefilter is not None
+
+    # The KELVIN SIGN, the LONG S and the dotted I fold to an ASCII letter, the ASCII prefilter would miss them.
+    for word in ('kelvin', 'class', 'init'):
+        assert SearchQuery(word, ignoreCase=True).bytesPrefilter is None
+
+
+def testIgnoreCaseNonAsciiEquivalent(tmp_path):
+    modulePath = tmp_path / 'module.py'
+    modulePath.write_text("temperature = 0  # Kelvin\n", encoding='utf-8')
+
+    matches = list(engine.search(SearchQuery('kelvin', ignoreCase=True), [str(modulePath)], engine.SearchOptions()))
+
+    assert [match.lineNumber for match in matches] == [1]
+
+
+LINES = [
+    "def storeConfig(name):\n",
+    "    storeConfigValue = name\n",
+    "    STORECONFIG = 1\n",
+    "    return store_config(name)\n",
+]
+
+
+@pytest.mark.parametrize('word, mode, ignoreCase, expected', [
+    ('storeConfig', SearchQuery.LITERAL, False, [1, 2]),
+    ('storeConfig', SearchQuery.LITERAL, True, [1, 2, 3]),
+    ('storeConfig', SearchQuery.WHOLE_WORD, False, [1]),
+    ('storeConfig', SearchQuery.WHOLE_WORD, True, [1, 3]),
+    (r'store_?[cC]onfig\(', SearchQuery.REGEX, False, [1, 4]),
+    (r'^\s+\w+ = ', SearchQuery.REGEX, False, [2, 3]),
+    ('(name)', SearchQuery.LITERAL, False, [1, 4]),
+])
+def testModes(word, mode, ignoreCase, expected):
+    query = SearchQuery(word, mode, ignoreCase)
+
+    assert query.matchingLineNumbers(LINES) == expected
+    assert [lineNumber for lineNumber, line in enumerate(LINES, start=1) if query.matchLine(line)] == expected
+
+
+def testMultiline():
+    query = SearchQuery(r'def \w+\(name\):\n\s+storeConfigValue', SearchQuery.REGEX, multiline=True)
+
+    assert query.matchingLineNumbers(LINES) == [1, 2]
+    assert SearchQuery(query.word, SearchQuery.REGEX).matchingLineNumbers(LINES) == []
+
+
+def testMaxCount():
+    query = SearchQuery('name')
+
+    assert query.matchingLineNumbers(LINES, maxCount=2) == [1, 2]
+    assert query.matchingLineNumbers(LINES, isCancelled=lambda: True) == []
+
+
+def testInvalidQuery():
+    with pytest.raises(re.error):
+        SearchQuery('store(', SearchQuery.REGEX)
+
+    with pytest.raises(ValueError):
+        SearchQuery('storeConfig', 'fuzzy')
+
+
+def testPickledQuery():
+    query = pickle.loads(pickle.dumps(SearchQuery('storeConfig', SearchQuery.WHOLE_WORD, ignoreCase=True)))
+
+    assert (query.word, query.mode, query.ignoreCase) == ('storeConfig', SearchQuery.WHOLE_WORD, True)
+    assert query.matchingLineNumbers(LINES) == [1, 3]
+
+
+@pytest.mark.parametrize('word, expected', [
+    ('storeConfig', ['storeConfig']),
+    (r'get(Config|Value)ByName', ['get', 'ByName']),
+    (r'storeConfig\w*\(', ['storeConfig', '(']),
+    (r'(?:store)+Config', ['store', 'Config']),
+])
+def testRequiredLiterals(word, expected):
+    literals = SearchQuery(word, SearchQuery.REGEX).requiredLiterals()
+
+    assert [literal for literal in literals if literal] == expected
@@ -0,0 +1,68 @@
+"""Tests of the trigram index, run them from the repository root::
+
+    python -m pytest tests
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from wordFinder.utils import trigramIndex
+from wordFinder.utils.sentenceProcess import SearchQuery
+
+
+def testEditedModuleIsChanged(tmp_path):
+    package = tmp_path / 'package'
+    package.mkdir()
+
+    paths = []
+    for index, text in enumerate(["storeConfig = 1\n", "other = 2\n"]):
+        path = package / 'module{}.py'.format(index)
+        path.write_text(text, encoding='utf-8')
+        paths.append(str(path))
+
+    index = trigramIndex.TrigramIndex.build(str(tmp_path))
+
+    assert index.candidatePaths(SearchQuery('storeConfig'), paths) == paths[:1]
+
+    # Edited after the index was built, with another size so the stat differs whatever the clock resolution.
+    (package / 'module1.py').write_text("value = storeConfig\n", encoding='utf-8')
+
+    # The candidates are picked without any stat, the edited module is found once the modules are checked.
+    assert index.candidatePaths(SearchQuery('storeConfig'), paths) == paths[:1]
+    assert index.changedPaths(paths) == paths[1:]
+
+
+def testNonAsciiCaseEquivalentIsCandidate(tmp_path):
+    package = tmp_path / 'package'
+    package.mkdir()
+
+    # The LONG S, the DOTTED I and the KELVIN SIGN match "s", "i" and "k" when the case is ignored.
+    paths = []
+    for index, text in enumerate(["cla\u017fs = 1\n", "\u0130nit = 1\n", "\u212aelvin = 1\n"]):
+        path = package / 'module{}.py'.format(index)
+        path.write_text(text, encoding='utf-8')
+        paths.append(str(path))
+
+    index = trigramIndex.TrigramIndex.build(str(tmp_path))
+
+    for word, modulePath in zip(('class', 'init', 'kelvin'), paths):
+        assert index.candidatePaths(SearchQuery(word, ignoreCase=True), paths) == [modulePath]
+
+
+def testInlineIgnoreCase(tmp_path):
+    package = tmp_path / 'package'
+    package.mkdir()
+
+    paths = []
+    for index, text in enumerate(["FOO = 1\n", "STUFF = 1\n"]):
+        path = package / 'module{}.py'.format(index)
+        path.write_text(text, encoding='utf-8')
+        paths.append(str(path))
+
+    index = trigramIndex.TrigramIndex.build(str(tmp_path))
+
+    assert index.candidatePaths(SearchQuery('(?i)Foo', SearchQuery.REGEX), paths) == paths[:1]
+
+    # The LONG S matches "S" once the case is ignored, the literal can't be looked up in the lowered index.
+    assert index.candidatePaths(SearchQuery('(?i)\u017ftuff', SearchQuery.REGEX), paths) == paths
@@ -0,0 +1,114 @@
+"""Tests of the search workers, run on the calling thread, run them from the repository root::
+
+    python -m pytest tests
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import pytest
+
+pytest.importorskip('PySide2')
+
+from wordFinder import core
+from wordFinder.utils.sentenceProcess import SearchQuery
+from wordFinder.widgets import workers
+
+
+@pytest.fixture
+def modulePaths(tmp_path, monkeypatch):
+    monkeypatch.setattr(core, 'CONFIG', core.ConfigStore(str(tmp_path / 'config.json')))
+
+    paths = []
+    for index in range(50):
+        path = tmp_path / 'module{:02d}.py'.format(index)
+        path.write_text("value = 1\nstoreConfig = {}\n".format(index), encoding='utf-8')
+        paths.append(str(path))
+
+    return paths
+
+
+class Recorder:
+    """Records the signals of a worker, the worker runs on the calling thread so they're delivered directly."""
+
+    def __init__(self, worker: workers.LocalSearchWorker) -> None:
+        self.matches = []
+        self.batches = 0
+        self.progress = []
+        self.messages = []
+        self.finished = []
+
+        worker.signals.matchesFound.connect(self.onMatchesFound)
+        worker.signals.progress.connect(lambda scannedCount, total: self.progress.append((scannedCount, total)))
+        worker.signals.message.connect(self.messages.append)
+        worker.signals.finished.connect(self.finished.append)
+
+    def onMatchesFound(self, matches: list) -> None:
+        self.matches.extend(matches)
+        self.batches += 1
+
+
+def testSearch(modulePaths):
+    worker = workers.LocalSearchWorker(SearchQuery('storeConfig'), modulePaths)
+    recorder = Recorder(worker)
+
+    worker.run()
+
+    assert [match.path for match in recorder.matches] == modulePaths
+    assert recorder.finished == [len(modulePaths)]
+    assert recorder.progress[-1] == (len(modulePaths), len(modulePaths))
+    assert recorder.messages == []
+
+
+def testCancelledBeforeRun(modulePaths):
+    worker = workers.LocalSearchWorker(SearchQuery('storeConfig'), modulePaths)
+    recorder = Recorder(worker)
+
+    worker.cancel()
+    worker.run()
+
+    assert recorder.matches == []
+    assert recorder.finished == [0]
+
+
+def testCancelDuringScan(modulePaths):
+    worker = workers.LocalSearchWorker(SearchQuery('storeConfig'), modulePaths)
+    recorder = Recorder(worker)
+
+    # A batch per module, Shiboken doesn't see a class attribute patched on the Python side.
+    worker.BATCH_INTERVAL = 0.0
+
+    # Cancelled once the first batch is on its way, like the Cancel button.
+    worker.signals.matchesFound.connect(lambda matches: worker.cancel())
+    worker.run()
+
+    assert worker.isCancelled
+    assert recorder.batches == 1
+    assert len(recorder.matches) < len(modulePaths)
+    assert recorder.finished == [len(recorder.matches)]
+
+    # A cancelled search is not cut short by its limits.
+    assert recorder.messages == []
+
+
+def testMaxMatches(modulePaths):
+    worker = workers.LocalSearchWorker(SearchQuery('storeConfig'), modulePaths, maxMatches=3)
+    recorder = Recorder(worker)
+
+    worker.run()
+
+    assert [match.path for match in recorder.matches] == modulePaths[:3]
+    assert recorder.messages == ["The search stopped after 3 matches"]
+    assert recorder.finished == [3]
+
+
+def testTimeLimit(modulePaths):
+    worker = workers.LocalSearchWorker(SearchQuery('storeConfig'), modulePaths, timeLimit=1e-9)
+    recorder = Recorder(worker)
+
+    worker.run()
+
+    assert recorder.matches == []
+    assert recorder.messages == ["The search stopped after 1e-09 seconds"]
+    assert recorder.finished == [0]